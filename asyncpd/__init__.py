@@ -16,8 +16,10 @@
 
 from .version import __version__
 from .client import APIClient
+from .pool import ClientPool
 
 __all__ = [
     "__version__",
     "APIClient",
+    "ClientPool",
 ]
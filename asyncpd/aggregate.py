@@ -0,0 +1,401 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local aggregation of raw incident analytics."""
+from __future__ import annotations
+
+import math
+import operator
+from datetime import date, datetime, time, timezone, tzinfo
+from typing import Any, Dict, Iterable, List, Literal, Optional, Sequence, Tuple
+
+from asyncpd import utils
+from asyncpd.models.analytics import (
+    AggregatedMetrics,
+    AnalyticsRequestFilters,
+    RawIncidentData,
+)
+from asyncpd.models.columnar import CATEGORICAL_FIELDS, RawIncidentColumns
+
+np = utils.optional_import("numpy")
+zoneinfo = utils.optional_import("zoneinfo")
+
+GroupBy = Literal["service", "team", "priority", "urgency"]
+AggregateUnit = Literal["day", "week", "month"]
+AggregateKey = Tuple[Optional[str], Optional[datetime]]
+
+GROUP_BY_FIELDS = {
+    "service": "service_id",
+    "team": "team_id",
+    "priority": "priority_id",
+    "urgency": "urgency",
+}
+"""Column grouped by for each `group_by` value."""
+
+_MEANS = {
+    "mean_assignment_count": "assignment_count",
+    "mean_engaged_seconds": "engaged_seconds",
+    "mean_engaged_user_count": "engaged_user_count",
+    "mean_seconds_to_engage": "seconds_to_engage",
+    "mean_seconds_to_first_ack": "seconds_to_first_ack",
+    "mean_seconds_to_mobilize": "seconds_to_mobilize",
+    "mean_seconds_to_resolve": "seconds_to_resolve",
+}
+_TOTALS = {
+    "total_business_hour_interruptions": "business_hour_interruptions",
+    "total_engaged_seconds": "engaged_seconds",
+    "total_escalation_count": "escalation_count",
+    "total_off_hour_interruptions": "off_hour_interruptions",
+    "total_sleep_hour_interruptions": "sleep_hour_interruptions",
+    "total_incidents_auto_resolved": "auto_resolved",
+    "total_interruptions": "total_interruptions",
+    "total_notifications": "total_notifications",
+    "total_snoozed_seconds": "snoozed_seconds",
+}
+# Incidents counted when the column is positive.
+_POSITIVE_COUNTS = {
+    "total_incidents_manual_escalated": "manual_escalation_count",
+    "total_incidents_reassigned": "reassignment_count",
+    "total_incidents_timeout_escalated": "timeout_escalation_count",
+}
+# Incidents counted when the column is set.
+_PRESENT_COUNTS = {"total_incidents_acknowledged": "seconds_to_first_ack"}
+
+_NAMES = {"service_id": "service_name", "team_id": "team_name"}
+
+_DAY = 86400
+# Offsets to UTC change on 15 minute boundaries in every time zone in use.
+_QUANTUM = 900
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+class LocalAggregator:
+    """Computes aggregated incident metrics from raw incident data.
+
+    Reproduces the aggregate analytics endpoints from one download of raw
+    incidents: results are AggregatedMetrics, optionally grouped by service,
+    team, priority or urgency and bucketed by day, week or month in a time
+    zone. Filtering, grouping and sums run on the column arrays, vectorized
+    with NumPy when it is installed. `up_time_pct` cannot be derived from
+    raw incidents and is left unset.
+    """
+
+    def __init__(self, data: RawIncidentColumns | Iterable[RawIncidentData]) -> None:
+        """Initialize the aggregator.
+
+        Args:
+            data (RawIncidentColumns | Iterable[RawIncidentData]): Raw
+                incidents, e.g. from `AnalyticsAPI.get_raw_incident_columns`.
+        """
+        if isinstance(data, RawIncidentColumns):
+            self.columns = data
+        else:
+            self.columns = RawIncidentColumns(
+                categorical_fields=CATEGORICAL_FIELDS + ("service_name", "team_name")
+            )
+            self.columns.append_incidents(list(data))
+        self.__buckets: Dict[tuple, Tuple[List[datetime], Any]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of incidents."""
+        return len(self.columns)
+
+    def aggregate(
+        self,
+        filters: AnalyticsRequestFilters | None = None,
+        group_by: GroupBy | None = None,
+        aggregate_unit: AggregateUnit | None = None,
+        time_zone: str | None = None,
+    ) -> Dict[AggregateKey, AggregatedMetrics]:
+        """Aggregate the incidents matching filters.
+
+        Args:
+            filters (AnalyticsRequestFilters | None): Filters, applied like
+                the API does.
+            group_by (str | None): 'service', 'team', 'priority' or
+                'urgency', or None to aggregate all incidents together.
+            aggregate_unit (str | None): 'day', 'week' or 'month' buckets
+                of the creation date, or None for a single bucket.
+            time_zone (str | None): IANA time zone of the buckets, UTC by
+                default.
+
+        Returns:
+            dict: Metrics keyed by group value (None when not grouped) and
+                bucket start (None when not bucketed).
+
+        Raises:
+            ValueError: Unknown grouping or time zone.
+        """
+        rows = self.__select(filters)
+        field = None
+        if group_by is not None:
+            if group_by not in GROUP_BY_FIELDS:
+                raise ValueError(f"cannot group by {group_by!r}")
+            field = GROUP_BY_FIELDS[group_by]
+        starts, bucket_ids = self.__bucket(aggregate_unit, time_zone)
+
+        codes = (
+            _zeros(len(self))
+            if field is None
+            else self.columns.categorical(field).codes
+        )
+        keys = _combine(_take(codes, rows), len(starts), _take(bucket_ids, rows))
+        uniques, first, inverse = _factorize(keys)
+        first = _take(rows, first)
+
+        metrics: Dict[str, List[Any]] = {}
+        for name, column in _MEANS.items():
+            sums, counts = self.__sums(column, rows, inverse, len(uniques))
+            metrics[name] = [
+                None if c == 0 else round(s / c) for s, c in zip(sums, counts)
+            ]
+        for name, column in _TOTALS.items():
+            sums, _ = self.__sums(column, rows, inverse, len(uniques))
+            metrics[name] = [round(s) for s in sums]
+        for name, column in {**_POSITIVE_COUNTS, **_PRESENT_COUNTS}.items():
+            values = _take(self.columns[column], rows)
+            flags = _positive(values) if name in _POSITIVE_COUNTS else _present(values)
+            metrics[name] = [round(s) for s in _bincount(inverse, len(uniques), flags)]
+        metrics["total_incident_count"] = [
+            round(c) for c in _bincount(inverse, len(uniques), _ones(len(inverse)))
+        ]
+
+        results = {}
+        for i, key in enumerate(uniques):
+            value, start = self.__key(field, int(key), len(starts), starts)
+            data = {name: values[i] for name, values in metrics.items()}
+            if field in _NAMES:
+                data[field] = value
+                data[_NAMES[field]] = self.__value(_NAMES[field], int(first[i]))
+            results[(value, start)] = AggregatedMetrics(range_start=start, **data)
+        return results
+
+    def __key(
+        self, field: str | None, key: int, n: int, starts: List[Any]
+    ) -> Tuple[Optional[str], Optional[datetime]]:
+        start = starts[key % n]
+        if field is None:
+            return None, start
+        return self.columns.categorical(field).categories[key // n], start
+
+    def __value(self, field: str, row: int) -> Optional[str]:
+        if field not in self.columns.fields:
+            return None
+        return self.columns.categorical(field)[row]
+
+    def __sums(
+        self, column: str, rows: Any, inverse: Any, n: int
+    ) -> Tuple[List[float], List[float]]:
+        """Return the sums and counts of the non-null values of each group."""
+        values = _take(self.columns[column], rows)
+        present = _present(values)
+        return (
+            _bincount(inverse, n, _fill_nan(values)),
+            _bincount(inverse, n, present),
+        )
+
+    def __select(self, filters: AnalyticsRequestFilters | None) -> Any:
+        """Return the indexes of the rows matching filters."""
+        mask = _trues(len(self))
+        if filters is None:
+            return _nonzero(mask)
+        created = self.columns["created_at"]
+        if filters.created_at_start is not None:
+            start = utils.to_timestamp(filters.created_at_start)
+            mask = _and(mask, _cmp(created, operator.ge, start))
+        if filters.create_at_end is not None:
+            end = utils.to_timestamp(filters.create_at_end)
+            mask = _and(mask, _cmp(created, operator.lt, end))
+        if filters.major is not None:
+            major = float(filters.major)
+            mask = _and(mask, _cmp(self.columns["major"], operator.eq, major))
+        for field, allowed in (
+            ("urgency", None if filters.urgency is None else [filters.urgency]),
+            ("team_id", filters.team_ids),
+            ("service_id", filters.service_ids),
+            ("priority_id", filters.priority_ids),
+            ("priority_name", filters.priority_names),
+        ):
+            if allowed:
+                mask = _and(mask, self.__isin(field, allowed))
+        return _nonzero(mask)
+
+    def __isin(self, field: str, allowed: Sequence[str]) -> Any:
+        column = self.columns.categorical(field)
+        wanted = set(allowed)
+        codes = [i for i, c in enumerate(column.categories) if c in wanted]
+        if np is None:
+            return [c in codes for c in column.codes]
+        return np.isin(column.codes, codes)
+
+    def __bucket(
+        self, unit: AggregateUnit | None, time_zone: str | None
+    ) -> Tuple[List[Any], Any]:
+        """Return the bucket starts and the bucket index of every row."""
+        if unit is None:
+            return [None], _zeros(len(self))
+        if unit not in ("day", "week", "month"):
+            raise ValueError(f"unknown aggregate unit {unit!r}")
+        cache_key = (unit, time_zone)
+        if cache_key not in self.__buckets:
+            zone = _zone(time_zone)
+            days, _, day_ids = _factorize(_local_days(self.columns["created_at"], zone))
+            starts, _, bucket_of_day = _factorize(
+                [_bucket_start(int(d), unit) for d in days]
+            )
+            self.__buckets[cache_key] = (
+                [
+                    datetime.combine(date.fromordinal(_EPOCH + int(d)), time(), zone)
+                    for d in starts
+                ],
+                _take(bucket_of_day, day_ids),
+            )
+        return self.__buckets[cache_key]
+
+
+def _zone(time_zone: str | None) -> tzinfo:
+    if time_zone in (None, "UTC", "Etc/UTC"):
+        return timezone.utc
+    if zoneinfo is None:
+        raise ValueError("time zones other than UTC need Python 3.9 or later")
+    try:
+        return zoneinfo.ZoneInfo(time_zone)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"unknown time zone {time_zone!r}") from e
+
+
+def _bucket_start(day: int, unit: AggregateUnit) -> int:
+    """Return the first day of the bucket of a day, counted from the epoch."""
+    if unit == "week":
+        # 1970-01-01 is a Thursday, weeks start on Mondays.
+        return day - (day + 3) % 7
+    if unit == "month":
+        return date.fromordinal(_EPOCH + day).replace(day=1).toordinal() - _EPOCH
+    return day
+
+
+def _local_days(timestamps: Any, zone: tzinfo) -> Any:
+    """Return the local dates of POSIX timestamps, as days from the epoch.
+
+    The UTC offset is looked up once per 15 minutes span holding incidents.
+    """
+    if np is None:
+        offsets: Dict[int, float] = {}
+        days = []
+        for ts in timestamps:
+            ts = 0.0 if math.isnan(ts) else ts
+            q = int(ts // _QUANTUM)
+            if q not in offsets:
+                offsets[q] = _utcoffset(q * _QUANTUM, zone)
+            days.append(int((ts + offsets[q]) // _DAY))
+        return days
+    ts = np.nan_to_num(np.asarray(timestamps, dtype=np.float64))
+    quanta, inverse = np.unique(
+        np.floor_divide(ts, _QUANTUM).astype(np.int64), return_inverse=True
+    )
+    offsets = np.array([_utcoffset(int(q) * _QUANTUM, zone) for q in quanta])
+    return np.floor_divide(ts + offsets[inverse], _DAY).astype(np.int64)
+
+
+def _utcoffset(ts: float, zone: tzinfo) -> float:
+    offset = datetime.fromtimestamp(ts, zone).utcoffset()
+    return 0.0 if offset is None else offset.total_seconds()
+
+
+# Array helpers, vectorized with NumPy when it is installed.
+
+
+def _zeros(n: int) -> Any:
+    return [0] * n if np is None else np.zeros(n, dtype=np.int64)
+
+
+def _trues(n: int) -> Any:
+    return [True] * n if np is None else np.ones(n, dtype=bool)
+
+
+def _ones(n: int) -> Any:
+    return [1.0] * n if np is None else np.ones(n)
+
+
+def _take(values: Any, indexes: Any) -> Any:
+    if np is None:
+        return [values[i] for i in indexes]
+    return np.asarray(values)[np.asarray(indexes, dtype=np.int64)]
+
+
+def _combine(major: Any, n: int, minor: Any) -> Any:
+    if np is None:
+        return [a * n + b for a, b in zip(major, minor)]
+    return major * n + minor
+
+
+def _cmp(values: Any, op: Any, x: float) -> Any:
+    if np is None:
+        return [op(v, x) for v in values]
+    return op(np.asarray(values), x)
+
+
+def _and(a: Any, b: Any) -> Any:
+    if np is None:
+        return [x and y for x, y in zip(a, b)]
+    return a & b
+
+
+def _nonzero(mask: Any) -> Any:
+    if np is None:
+        return [i for i, m in enumerate(mask) if m]
+    return np.flatnonzero(mask)
+
+
+def _present(values: Any) -> Any:
+    if np is None:
+        return [0.0 if math.isnan(v) else 1.0 for v in values]
+    return (~np.isnan(values)).astype(np.float64)
+
+
+def _positive(values: Any) -> Any:
+    if np is None:
+        return [1.0 if v > 0 else 0.0 for v in values]
+    return (values > 0).astype(np.float64)
+
+
+def _fill_nan(values: Any) -> Any:
+    if np is None:
+        return [0.0 if math.isnan(v) else v for v in values]
+    return np.nan_to_num(values)
+
+
+def _factorize(keys: Any) -> Tuple[Any, Any, Any]:
+    """Return the sorted unique keys, their first index and the key ids."""
+    if np is None:
+        uniques = sorted(set(keys))
+        ids = {k: i for i, k in enumerate(uniques)}
+        first = [0] * len(uniques)
+        for i, k in reversed(list(enumerate(keys))):
+            first[ids[k]] = i
+        return uniques, first, [ids[k] for k in keys]
+    uniques, first, inverse = np.unique(
+        np.asarray(keys, dtype=np.int64), return_index=True, return_inverse=True
+    )
+    return uniques, first, inverse.reshape(-1)
+
+
+def _bincount(ids: Any, n: int, weights: Any) -> List[float]:
+    """Return the sum of the weights of each id."""
+    if np is None:
+        sums = [0.0] * n
+        for i, w in zip(ids, weights):
+            sums[i] += w
+        return sums
+    return np.bincount(ids, weights=weights, minlength=n).tolist()
@@ -0,0 +1,106 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bulk execution of resource methods."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generic, TypeVar
+
+from asyncpd.concurrency import Items, bounded_map
+from asyncpd.models.abilities import AbilitiesAPI
+from asyncpd.models.addons import AddonsAPI
+from asyncpd.models.analytics import AnalyticsAPI
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_RESOURCES = {
+    AbilitiesAPI: "abilities",
+    AddonsAPI: "addons",
+    AnalyticsAPI: "analytics",
+}
+
+
+@dataclass
+class BulkResult(Generic[T, R]):
+    """Outcome of one item of a bulk call."""
+
+    item: T
+    result: R | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the call succeeded."""
+        return self.error is None
+
+
+def bind(fn: Callable[..., Awaitable[R]], client: Any) -> Callable[..., Awaitable[R]]:
+    """Bind an unbound resource method, e.g. `AddonsAPI.get`, to a client.
+
+    Other callables are returned unchanged.
+    """
+    for cls, name in _RESOURCES.items():
+        if getattr(cls, getattr(fn, "__name__", ""), None) is fn:
+            return getattr(getattr(client, name), fn.__name__)
+    return fn
+
+
+def _unpacked(fn: Callable[..., Awaitable[R]]) -> Callable[[Any], Awaitable[R]]:
+    def call(args: Any) -> Awaitable[R]:
+        return fn(*args)
+
+    return call
+
+
+async def bulk(
+    fn: Callable[..., Awaitable[R]],
+    items: Items[T],
+    concurrency: int = 8,
+    ordered: bool = True,
+    unpack: bool = False,
+) -> AsyncGenerator[BulkResult[T, R], None]:
+    """Call a coroutine function on many items with bounded concurrency.
+
+    Errors raised by a call are captured in its BulkResult and do not stop
+    the other calls. Closing the generator, or cancelling the task reading
+    it, cancels the calls in flight.
+
+    Args:
+        fn (Callable[..., Awaitable[R]]): Coroutine function of one item, or
+            of the elements of an item when `unpack` is set.
+        items (Iterable[T] | AsyncIterable[T]): Items to process.
+        concurrency (int): Maximum number of calls in flight.
+        ordered (bool): Yield results in input order rather than as they
+            complete.
+        unpack (bool): Call `fn(*item)`, like `itertools.starmap`, for
+            methods taking several arguments.
+
+    Yields:
+        BulkResult
+    """
+    call = _unpacked(fn) if unpack else fn
+    results = bounded_map(call, items, concurrency, ordered)
+    try:
+        async for item, task in results:
+            error = task.exception()
+            if error is None:
+                yield BulkResult(item, task.result())
+            elif isinstance(error, Exception):
+                yield BulkResult(item, error=error)
+            else:
+                raise error
+    finally:
+        await results.aclose()
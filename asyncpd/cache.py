@@ -0,0 +1,161 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""GET response cache."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Mapping, Tuple
+
+import httpx
+
+
+@dataclass
+class CacheEntry:
+    """A cached response and its freshness deadlines."""
+
+    endpoint: str
+    response: httpx.Response
+    expires_at: float
+    stale_until: float
+    size: int
+
+
+class ResponseCache:
+    """LRU cache for successful GET responses.
+
+    Entries are fresh for a TTL chosen by the longest matching endpoint
+    prefix in `ttls`, or `ttl` otherwise; a TTL of 0 disables caching for
+    that prefix. Expired entries are still served for
+    `stale_while_revalidate` seconds while the client refreshes them in the
+    background. The least recently used entries are evicted once the cache
+    holds more than `max_entries` responses or `max_bytes` of bodies.
+
+    Subclass it to plug in another storage or eviction policy.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        ttls: Mapping[str, float] | None = None,
+        stale_while_revalidate: float = 0.0,
+        max_entries: int = 1024,
+        max_bytes: int | None = None,
+    ) -> None:
+        """Initialize the response cache.
+
+        Args:
+            ttl (float): Default seconds a response stays fresh.
+            ttls (Mapping[str, float] | None): TTLs keyed by endpoint prefix.
+            stale_while_revalidate (float): Seconds an expired response is
+                still served while being refreshed.
+            max_entries (int): Maximum number of cached responses.
+            max_bytes (int | None): Maximum total size of cached bodies.
+        """
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.generation = 0
+        self.__entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self.__size = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        return len(self.__entries)
+
+    @property
+    def size(self) -> int:
+        """Return the total size of the cached bodies in bytes."""
+        return self.__size
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Return the TTL of an endpoint."""
+        prefixes = [p for p in self.ttls if endpoint.startswith(p)]
+        if not prefixes:
+            return self.ttl
+        return self.ttls[max(prefixes, key=len)]
+
+    def get(self, key: Hashable) -> Tuple[httpx.Response, bool] | None:
+        """Return a cached response and whether it is still fresh.
+
+        Returns:
+            tuple[httpx.Response, bool] | None
+                None when nothing usable is cached.
+        """
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if now >= entry.stale_until:
+            self.__remove(key)
+            return None
+        self.__entries.move_to_end(key)
+        return entry.response, now < entry.expires_at
+
+    def set(
+        self,
+        key: Hashable,
+        endpoint: str,
+        response: httpx.Response,
+        generation: int | None = None,
+    ) -> None:
+        """Cache a response.
+
+        Args:
+            key (Hashable): Request key.
+            endpoint (str): Requested endpoint.
+            response (httpx.Response): Response to cache.
+            generation (int | None): Cache generation when the request was
+                sent. Responses to requests sent before an invalidation are
+                dropped.
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0 or (generation is not None and generation != self.generation):
+            return
+        now = time.monotonic()
+        if key in self.__entries:
+            self.__remove(key)
+        entry = CacheEntry(
+            endpoint=endpoint,
+            response=response,
+            expires_at=now + ttl,
+            stale_until=now + ttl + self.stale_while_revalidate,
+            size=len(response.content),
+        )
+        self.__entries[key] = entry
+        self.__size += entry.size
+        self.__evict()
+
+    def invalidate(self, prefix: str | None = None) -> None:
+        """Drop the responses of endpoints starting with `prefix`, or all."""
+        self.generation += 1
+        for key, entry in list(self.__entries.items()):
+            if prefix is None or entry.endpoint.startswith(prefix):
+                self.__remove(key)
+
+    def __remove(self, key: Hashable) -> None:
+        entry = self.__entries.pop(key)
+        self.__size -= entry.size
+
+    def __evict(self) -> None:
+        while len(self.__entries) > self.max_entries or (
+            self.max_bytes is not None
+            and self.__size > self.max_bytes
+            and len(self.__entries) > 1
+        ):
+            self.__remove(next(iter(self.__entries)))
@@ -14,25 +14,92 @@
 
 """API Client."""
 from __future__ import annotations
-from typing import Any
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+)
 
 import httpx
 
+from asyncpd.bulk import BulkResult, bind, bulk
+from asyncpd.cache import ResponseCache
+from asyncpd.concurrency import Items
+from asyncpd.decoders import Decoder, get_decoder
 from asyncpd.models.abilities import AbilitiesAPI
 from asyncpd.models.addons import AddonsAPI
 from asyncpd.models.analytics import AnalyticsAPI
+from asyncpd.ratelimit import RateLimiter, parse_retry_after
+from asyncpd.retry import RetryPolicy
+from asyncpd.singleflight import SingleFlight
+
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=50,
+    keepalive_expiry=30.0,
+)
+"""Default connection pool limits, sized for concurrent fan-outs."""
+
+DEFAULT_TIMEOUT = httpx.Timeout(connect=5.0, read=30.0, write=30.0, pool=30.0)
+"""Default per-phase timeouts, analytics queries may take a while to answer."""
 
 
 class APIClient:
     """APIClient is the adapter for calling various PagerDuty API resources."""
 
-    def __init__(self, token: str, base_url: str | None = None) -> None:
+    def __init__(
+        self,
+        token: str,
+        base_url: str | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        limits: httpx.Limits | None = None,
+        timeout: httpx.Timeout | float | None = None,
+        http2: bool = False,
+        transport: httpx.AsyncBaseTransport | None = None,
+        coalesce: bool = True,
+        cache: ResponseCache | None = None,
+        decoder: Decoder | str | None = None,
+    ) -> None:
         """Initialize the API client.
 
         Args:
             token (str): API Token.
             base_url (str | None): Base URL.
+            rate_limiter (RateLimiter | None): Paces requests across all
+                resources, defaults to PagerDuty's documented limits.
+            retry (RetryPolicy | None): Retry policy for transient errors,
+                use RetryPolicy.disabled() to turn retries off.
+            limits (httpx.Limits | None): Connection pool size and keep-alive
+                expiry, defaults to DEFAULT_LIMITS.
+            timeout (httpx.Timeout | float | None): Connect, read, write and
+                pool timeouts, defaults to DEFAULT_TIMEOUT.
+            http2 (bool): Multiplex requests over HTTP/2 connections, requires
+                the `http2` extra (`h2` package).
+            transport (httpx.AsyncBaseTransport | None): Custom transport.
+            coalesce (bool): Share one in-flight request among concurrent
+                identical GET requests.
+            cache (ResponseCache | None): Caches successful GET responses,
+                disabled by default.
+            decoder (Decoder | str | None): Decodes JSON response bodies, or
+                the name of one of `asyncpd.decoders.DECODERS`. Defaults to
+                orjson or msgspec when installed, else the `json` module.
         """
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry = retry or RetryPolicy()
+        self.coalesce = coalesce
+        self.cache = cache
+        self.decoder = get_decoder(decoder)
+        self.__in_flight: SingleFlight[httpx.Response] = SingleFlight()
+        self.__revalidating: Dict[Hashable, asyncio.Future] = {}
+        self.__abilities = AbilitiesAPI(self)
         base = base_url or "https://api.pagerduty.com"
         self.__client: httpx.AsyncClient = httpx.AsyncClient(
             base_url=base,
@@ -40,6 +107,10 @@ class APIClient:
                 "Authorization": f"Token {token}",
                 "Accept": "application/vnd.pagerduty+json;version=2",
             },
+            limits=limits or DEFAULT_LIMITS,
+            timeout=timeout if timeout is not None else DEFAULT_TIMEOUT,
+            http2=http2,
+            transport=transport,
         )
 
     async def request(
@@ -49,23 +120,253 @@ class APIClient:
         headers: dict[str, str] | None = None,
         data: dict | None = None,
         params: list[tuple[str, Any]] | None = None,
+        idempotent: bool | None = None,
     ) -> httpx.Response:
-        """Execute an async HTTP request to PagerDutys REST API."""
+        """Execute an async HTTP request to PagerDutys REST API.
+
+        Transient failures are retried according to the client's retry
+        policy, which decides from the method and endpoint whether the
+        request is idempotent unless `idempotent` is given. Concurrent
+        identical GET requests share a single in-flight request and response
+        when coalescing is enabled, and GET responses are served from the
+        response cache when one is configured.
+        """
         if method in ("POST", "PUT") and headers is None:
             headers = {"Content-Type": "application/json"}
+        if idempotent is None:
+            idempotent = self.retry.is_idempotent(method, endpoint)
+
+        if method != "GET" or data is not None:
+            return await self.__send(
+                method, endpoint, headers, data, params, idempotent
+            )
+
+        key = request_key(method, endpoint, headers, params)
+        if self.cache is not None:
+            hit = self.cache.get(key)
+            if hit is not None:
+                res, fresh = hit
+                if not fresh:
+                    self.__revalidate(key, endpoint, headers, params, idempotent)
+                return res
+        return await self.__get(key, endpoint, headers, params, idempotent)
+
+    async def __get(
+        self,
+        key: Hashable,
+        endpoint: str,
+        headers: dict[str, str] | None,
+        params: list[tuple[str, Any]] | None,
+        idempotent: bool,
+    ) -> httpx.Response:
+        generation = None if self.cache is None else self.cache.generation
+        if self.coalesce:
+            res = await self.__in_flight.do(
+                key,
+                lambda: self.__send("GET", endpoint, headers, None, params, idempotent),
+            )
+        else:
+            res = await self.__send("GET", endpoint, headers, None, params, idempotent)
+        if self.cache is not None and res.status_code == 200:
+            self.cache.set(key, endpoint, res, generation)
+        return res
 
-        return await self.__client.request(
-            method=method, url=endpoint, data=data, headers=headers, params=params
+    def __revalidate(
+        self,
+        key: Hashable,
+        endpoint: str,
+        headers: dict[str, str] | None,
+        params: list[tuple[str, Any]] | None,
+        idempotent: bool,
+    ) -> None:
+        """Refresh a stale cache entry in the background."""
+        if key in self.__revalidating:
+            return
+        task = asyncio.ensure_future(
+            self.__get(key, endpoint, headers, params, idempotent)
+        )
+        self.__revalidating[key] = task
+
+        def done(t: asyncio.Future) -> None:
+            del self.__revalidating[key]
+            if not t.cancelled():
+                # Failed refreshes keep serving the stale entry until it ends.
+                t.exception()
+
+        task.add_done_callback(done)
+
+    def decode(self, res: httpx.Response) -> Any:
+        """Decode the JSON body of a response with the client's decoder."""
+        return self.decoder(res.content)
+
+    def invalidate(self, prefix: str | None = None) -> None:
+        """Drop cached responses of endpoints starting with `prefix`, or all.
+
+        Args:
+            prefix (str | None): Endpoint prefix, e.g. '/addons'.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(prefix)
+
+    async def __send(
+        self,
+        method: str,
+        endpoint: str,
+        headers: dict[str, str] | None,
+        data: dict | None,
+        params: list[tuple[str, Any]] | None,
+        idempotent: bool,
+        stream: bool = False,
+    ) -> httpx.Response:
+        attempt = 1
+        while True:
+            await self.rate_limiter.acquire(endpoint)
+            try:
+                if stream:
+                    res = await self.__client.send(
+                        self.build_request(method, endpoint, headers, data, params),
+                        stream=True,
+                    )
+                else:
+                    res = await self.__client.request(
+                        method=method,
+                        url=endpoint,
+                        json=data,
+                        headers=headers,
+                        params=params,
+                    )
+            except httpx.TransportError as e:
+                if not self.retry.should_retry_error(e, attempt, idempotent):
+                    raise
+                await asyncio.sleep(self.retry.backoff(attempt))
+                attempt += 1
+                continue
+
+            self.rate_limiter.observe(endpoint, res)
+            if not self.retry.should_retry_response(res, attempt, idempotent):
+                return res
+            if stream:
+                await res.aclose()
+            retry_after = parse_retry_after(res.headers.get("retry-after"))
+            await asyncio.sleep(self.retry.backoff(attempt, retry_after))
+            attempt += 1
+
+    def build_request(
+        self,
+        method: str,
+        endpoint: str,
+        headers: dict[str, str] | None = None,
+        data: dict | None = None,
+        params: list[tuple[str, Any]] | None = None,
+    ) -> httpx.Request:
+        """Build a request the way `request` and `stream` send it.
+
+        The request carries the client's base URL and headers and the JSON
+        encoded body, but is not sent.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): API endpoint.
+            headers (dict[str, str] | None): Request headers.
+            data (dict | None): JSON request body.
+            params (list[tuple[str, Any]] | None): Query parameters.
+
+        Returns:
+            httpx.Request
+        """
+        if method in ("POST", "PUT") and headers is None:
+            headers = {"Content-Type": "application/json"}
+        return self.__client.build_request(
+            method, endpoint, json=data, headers=headers, params=params
+        )
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        endpoint: str,
+        headers: dict[str, str] | None = None,
+        data: dict | None = None,
+        params: list[tuple[str, Any]] | None = None,
+        idempotent: bool | None = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """Execute a request without reading its body.
+
+        The body is read through `response.aiter_bytes()` while the context
+        is open, and the connection is released on exit. Responses are
+        retried like `request` before they are returned, but are neither
+        coalesced nor cached.
+        """
+        if method in ("POST", "PUT") and headers is None:
+            headers = {"Content-Type": "application/json"}
+        if idempotent is None:
+            idempotent = self.retry.is_idempotent(method, endpoint)
+        res = await self.__send(
+            method, endpoint, headers, data, params, idempotent, stream=True
+        )
+        try:
+            yield res
+        finally:
+            await res.aclose()
+
+    def bulk(
+        self,
+        fn: Callable[..., Awaitable[Any]],
+        items: Items[Any],
+        concurrency: int = 8,
+        ordered: bool = True,
+        unpack: bool = False,
+    ) -> AsyncGenerator[BulkResult, None]:
+        """Call a resource method on many items with bounded concurrency.
+
+        For example `client.bulk(AddonsAPI.get, ids)`: unbound resource
+        methods are bound to this client, other coroutine functions of one
+        item are called as they are. Methods taking several arguments get
+        tuples of arguments with `unpack=True`, e.g.
+        `client.bulk(AddonsAPI.update, [(id, mask), ...], unpack=True)`.
+        Per-item errors are returned in the results instead of cancelling
+        the batch; closing the returned generator cancels the calls in
+        flight.
+
+        Args:
+            fn (Callable): Resource method or coroutine function of one item.
+            items (Iterable | AsyncIterable): Items to process.
+            concurrency (int): Maximum number of calls in flight.
+            ordered (bool): Yield results in input order rather than as they
+                complete.
+            unpack (bool): Call `fn(*item)` instead of `fn(item)`.
+
+        Returns:
+            AsyncGenerator[BulkResult, None]
+        """
+        return bulk(bind(fn, self), items, concurrency, ordered, unpack)
+
+    async def prewarm(self, connections: int = 1) -> None:
+        """Open connections ahead of a burst of requests.
+
+        Sends `connections` concurrent HEAD requests so the pool holds that
+        many keep-alive connections. Over HTTP/2 a single connection is
+        opened and shared. Errors are ignored, this is a best-effort step.
+
+        Args:
+            connections (int): Number of connections to open.
+        """
+        await asyncio.gather(
+            *(self.__client.request("HEAD", "/") for _ in range(connections)),
+            return_exceptions=True,
         )
 
     async def aclose(self) -> None:
         """Closes the underlying HTTP client."""
+        await self.__abilities.stop_background_refresh()
+        for task in list(self.__revalidating.values()):
+            task.cancel()
         return await self.__client.aclose()
 
     @property
     def abilities(self) -> AbilitiesAPI:
-        """Return an instance of the AbilitiesAPI resource."""
-        return AbilitiesAPI(self)
+        """Return the AbilitiesAPI resource, which caches abilities snapshots."""
+        return self.__abilities
 
     @property
     def addons(self) -> AddonsAPI:
@@ -76,3 +377,18 @@ class APIClient:
     def analytics(self) -> AnalyticsAPI:
         """Return an instance of the AnalyticsAPI resource."""
         return AnalyticsAPI(self)
+
+
+def request_key(
+    method: str,
+    endpoint: str,
+    headers: dict[str, str] | None = None,
+    params: list[tuple[str, Any]] | None = None,
+) -> tuple:
+    """Return a hashable key identifying a request without a body."""
+    return (
+        method,
+        endpoint,
+        None if params is None else repr(params),
+        None if headers is None else tuple(sorted(headers.items())),
+    )
@@ -0,0 +1,116 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bounded concurrency helpers."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import (
+    AsyncGenerator,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+Items = Union[Iterable[T], AsyncIterable[T]]
+
+
+async def _aiter(items: Items[T]) -> AsyncGenerator[T, None]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def _start_next(
+    source: AsyncGenerator[T, None], fn: Callable[[T], Awaitable[R]]
+) -> Tuple[T, asyncio.Future] | None:
+    """Start a call on the next item, or return None when there is none."""
+    try:
+        item = await source.__anext__()
+    except StopAsyncIteration:
+        return None
+    return item, asyncio.ensure_future(fn(item))
+
+
+async def bounded_map(
+    fn: Callable[[T], Awaitable[R]],
+    items: Items[T],
+    concurrency: int = 8,
+    ordered: bool = False,
+) -> AsyncGenerator[Tuple[T, "asyncio.Future[R]"], None]:
+    """Run a coroutine function over items with at most `concurrency` running.
+
+    Items are pulled from `items`, which may be an async iterable, only as
+    slots free up, so long streams are not buffered. Each item is yielded
+    with its finished task, whose result or exception the caller reads, so
+    one failure does not stop the others. Tasks still running are cancelled
+    when the generator is closed.
+
+    Args:
+        fn (Callable[[T], Awaitable[R]]): Coroutine function to call.
+        items (Iterable[T] | AsyncIterable[T]): Items to process.
+        concurrency (int): Maximum number of calls in flight.
+        ordered (bool): Yield in input order rather than as calls complete.
+
+    Yields:
+        tuple[T, asyncio.Future[R]]
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    source = _aiter(items)
+    window: Deque[Tuple[T, asyncio.Future]] = deque()
+    running: Dict[asyncio.Future, T] = {}
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(running) < concurrency:
+                started = await _start_next(source, fn)
+                if started is None:
+                    exhausted = True
+                    break
+                running[started[1]] = started[0]
+                if ordered:
+                    window.append(started)
+            if not running:
+                return
+            if ordered:
+                item, first = window.popleft()
+                await asyncio.wait([first])
+                del running[first]
+                yield item, first
+                continue
+            done, _ = await asyncio.wait(
+                list(running), return_when=asyncio.FIRST_COMPLETED
+            )
+            for finished in done:
+                yield running.pop(finished), finished
+    finally:
+        for pending in running:
+            pending.cancel()
+        if running:
+            await asyncio.wait(list(running))
+        await source.aclose()
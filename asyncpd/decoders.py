@@ -0,0 +1,97 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""JSON decoders for response bodies."""
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict
+
+from asyncpd import utils
+
+Decoder = Callable[[bytes], Any]
+"""Decodes a JSON response body."""
+
+orjson = utils.optional_import("orjson")
+msgspec = utils.optional_import("msgspec")
+
+
+def stdlib_decoder(content: bytes) -> Any:
+    """Decode JSON with the standard library `json` module."""
+    return json.loads(content)
+
+
+def orjson_decoder(content: bytes) -> Any:
+    """Decode JSON with orjson.
+
+    Raises:
+        RuntimeError: orjson is not installed.
+    """
+    if orjson is None:
+        raise RuntimeError("orjson is not installed")
+    return orjson.loads(content)
+
+
+def msgspec_decoder(content: bytes) -> Any:
+    """Decode JSON with msgspec.
+
+    Raises:
+        RuntimeError: msgspec is not installed.
+    """
+    if msgspec is None:
+        raise RuntimeError("msgspec is not installed")
+    return msgspec.json.decode(content)
+
+
+DECODERS: Dict[str, Decoder] = {
+    "orjson": orjson_decoder,
+    "msgspec": msgspec_decoder,
+    "json": stdlib_decoder,
+}
+"""Decoders by name."""
+
+
+def default_decoder() -> Decoder:
+    """Return the fastest installed decoder.
+
+    orjson is preferred, then msgspec, falling back to the standard library.
+    """
+    if orjson is not None:
+        return orjson_decoder
+    if msgspec is not None:
+        return msgspec_decoder
+    return stdlib_decoder
+
+
+def get_decoder(decoder: Decoder | str | None = None) -> Decoder:
+    """Resolve a decoder.
+
+    Args:
+        decoder (Decoder | str | None): A decoder, the name of one in
+            DECODERS, or None for the default decoder.
+
+    Returns:
+        Decoder
+
+    Raises:
+        ValueError: Unknown decoder name.
+    """
+    if decoder is None:
+        return default_decoder()
+    if isinstance(decoder, str):
+        try:
+            return DECODERS[decoder]
+        except KeyError:
+            raise ValueError(f"unknown decoder: {decoder}") from None
+    return decoder
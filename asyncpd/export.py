@@ -0,0 +1,274 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Export raw incident analytics to NDJSON or CSV files.
+
+Usage:
+    python -m asyncpd.export --since 2023-01-01 --output incidents.csv.gz
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bz2
+import contextlib
+import csv
+import gzip
+import json
+import lzma
+import os
+import sys
+from datetime import datetime
+from typing import IO, Any, Callable, Dict, List, Literal, Optional, Sequence
+
+from asyncpd.client import APIClient
+from asyncpd.models.analytics import (
+    RAW_INCIDENT_COLUMNS,
+    AnalyticsAPI,
+    AnalyticsRequestFilters,
+)
+
+Format = Literal["ndjson", "csv"]
+Compression = Literal["gzip", "bz2", "xz"]
+
+_OPENERS: Dict[str, Callable[..., IO[str]]] = {
+    "gzip": gzip.open,
+    "bz2": bz2.open,
+    "xz": lzma.open,
+}
+
+_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".lzma": "xz"}
+
+
+def infer_compression(path: str) -> Compression | None:
+    """Return the compression implied by a file name suffix."""
+    _, ext = os.path.splitext(path)
+    return _SUFFIXES.get(ext.lower())  # type: ignore[return-value]
+
+
+def infer_format(path: str) -> Format:
+    """Return the format implied by a file name, NDJSON by default."""
+    root, ext = os.path.splitext(path)
+    if ext.lower() in _SUFFIXES:
+        _, ext = os.path.splitext(root)
+    return "csv" if ext.lower() == ".csv" else "ndjson"
+
+
+def _open(path: str, compression: Compression | None) -> IO[str]:
+    if path == "-":
+        return sys.stdout
+    if compression is None:
+        return open(path, "w", encoding="utf-8", newline="")
+    return _OPENERS[compression](path, "wt", encoding="utf-8", newline="")
+
+
+class _NDJSONWriter:
+    def __init__(self, f: IO[str]) -> None:
+        self.__f = f
+        self.__dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+    def write(self, rows: List[dict]) -> None:
+        dumps = self.__dumps
+        self.__f.write("".join([dumps(row) + "\n" for row in rows]))
+
+
+class _CSVWriter:
+    def __init__(self, f: IO[str], columns: Sequence[str]) -> None:
+        self.__writer = csv.DictWriter(f, columns, extrasaction="ignore")
+        self.__writer.writeheader()
+
+    def write(self, rows: List[dict]) -> None:
+        self.__writer.writerows(rows)
+
+
+async def export_raw_incidents(
+    analytics: AnalyticsAPI,
+    path: str,
+    filters: AnalyticsRequestFilters | None = None,
+    format: Format | None = None,
+    compression: Compression | None = None,
+    columns: Sequence[str] = RAW_INCIDENT_COLUMNS,
+    limit: int = 1000,
+    order: str = "desc",
+    order_by: str = "created_at",
+    time_zone: str | None = None,
+    batch_size: int = 1000,
+    max_pending_batches: int = 4,
+) -> int:
+    """Export raw incident data to a file with constant memory.
+
+    Rows are streamed from the API and written in batches by a worker
+    thread, so the next batch is fetched while the previous one is encoded,
+    compressed and written. At most `max_pending_batches` batches wait to
+    be written, which bounds the memory used whatever the export size.
+
+    Args:
+        analytics (AnalyticsAPI): Analytics resource of a client or pool.
+        path (str): Output file, or '-' for the standard output.
+        filters (AnalyticsRequestFilters | None): Request filters, including
+            the time range.
+        format (str | None): 'ndjson' or 'csv', inferred from `path`.
+        compression (str | None): 'gzip', 'bz2' or 'xz', inferred from
+            `path`.
+        columns (Sequence[str]): Columns of CSV exports.
+        limit (int): Page size.
+        order (str): Sort direction, 'asc' or 'desc'.
+        order_by (str): Column to sort by.
+        time_zone (str | None): Time zone for the exported timestamps.
+        batch_size (int): Rows handed to the writer at once.
+        max_pending_batches (int): Batches fetched ahead of the writer.
+
+    Returns:
+        int: Number of exported rows.
+
+    Raises:
+        httpx.HTTPStatusError
+        ValueError: Compression is requested for the standard output.
+    """
+    if path == "-" and compression is not None:
+        raise ValueError("the standard output cannot be compressed")
+    if compression is None and path != "-":
+        compression = infer_compression(path)
+    loop = asyncio.get_running_loop()
+    f = await loop.run_in_executor(None, _open, path, compression)
+    try:
+        if (format or infer_format(path)) == "csv":
+            writer: Any = _CSVWriter(f, columns)
+        else:
+            writer = _NDJSONWriter(f)
+        rows = analytics.stream_raw_incident_rows(
+            filters, limit, order, order_by, time_zone
+        )
+        return await _pipe(rows, writer, batch_size, max_pending_batches)
+    finally:
+        if f is sys.stdout:
+            f.flush()
+        else:
+            await loop.run_in_executor(None, f.close)
+
+
+async def _pipe(rows: Any, writer: Any, batch_size: int, max_pending: int) -> int:
+    """Write the batches of a row stream while the next ones are fetched."""
+    queue: asyncio.Queue[Optional[List[dict]]] = asyncio.Queue(max_pending)
+
+    async def produce() -> None:
+        batch: List[dict] = []
+        try:
+            async for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    await queue.put(batch)
+                    batch = []
+            if batch:
+                await queue.put(batch)
+        except Exception:
+            # Wake the writer up, the error is raised when awaiting us.
+            await queue.put(None)
+            raise
+        finally:
+            await rows.aclose()
+        await queue.put(None)
+
+    loop = asyncio.get_running_loop()
+    producer = asyncio.ensure_future(produce())
+    count = 0
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                break
+            await loop.run_in_executor(None, writer.write, batch)
+            count += len(batch)
+    finally:
+        if not producer.done():
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
+    await producer
+    return count
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse the command line arguments of the exporter."""
+    parser = argparse.ArgumentParser(
+        prog="python -m asyncpd.export",
+        description="Export PagerDuty raw incident analytics to NDJSON or CSV.",
+    )
+    parser.add_argument("-o", "--output", default="-", help="output file or '-'")
+    parser.add_argument("--format", choices=["ndjson", "csv"])
+    parser.add_argument("--compression", choices=["gzip", "bz2", "xz"])
+    parser.add_argument("--since", type=datetime.fromisoformat, help="ISO datetime")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="ISO datetime")
+    parser.add_argument("--service-id", action="append", default=[])
+    parser.add_argument("--team-id", action="append", default=[])
+    parser.add_argument("--priority-id", action="append", default=[])
+    parser.add_argument("--urgency", choices=["high", "low"])
+    parser.add_argument("--major", action="store_const", const=True)
+    parser.add_argument("--order", choices=["asc", "desc"], default="desc")
+    parser.add_argument("--time-zone")
+    parser.add_argument("--limit", type=int, default=1000, help="page size")
+    parser.add_argument("--base-url")
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("PAGERDUTY_API_TOKEN"),
+        help="API token, defaults to $PAGERDUTY_API_TOKEN",
+    )
+    args = parser.parse_args(argv)
+    if not args.token:
+        parser.error("an API token is required, see --token")
+    if args.output == "-" and args.compression:
+        parser.error("--compression needs an --output file")
+    return args
+
+
+def filters_from_args(args: argparse.Namespace) -> AnalyticsRequestFilters:
+    """Return the request filters given on the command line."""
+    return AnalyticsRequestFilters(
+        created_at_start=args.since,
+        create_at_end=args.until,
+        urgency=args.urgency,
+        major=args.major,
+        team_ids=args.team_id,
+        service_ids=args.service_id,
+        priority_ids=args.priority_id,
+    )
+
+
+async def _run(args: argparse.Namespace) -> int:
+    client = APIClient(args.token, base_url=args.base_url)
+    try:
+        return await export_raw_incidents(
+            client.analytics,
+            args.output,
+            filters_from_args(args),
+            format=args.format,
+            compression=args.compression,
+            limit=args.limit,
+            order=args.order,
+            time_zone=args.time_zone,
+        )
+    finally:
+        await client.aclose()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the exporter command line."""
+    args = parse_args(argv)
+    count = asyncio.run(_run(args))
+    print(f"exported {count} incidents", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local SQLite mirror of raw incident analytics."""
+from __future__ import annotations
+
+import dataclasses
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Literal, Sequence, Tuple, Union
+
+from asyncpd import utils
+from asyncpd.models.analytics import (
+    RAW_INCIDENT_COLUMNS,
+    RawIncidentData,
+    RawIncidentResponsesData,
+)
+
+INCIDENT_COLUMNS = RAW_INCIDENT_COLUMNS
+"""Columns of the incidents table."""
+
+RESPONSE_COLUMNS = ("incident_id",) + tuple(
+    f.name for f in dataclasses.fields(RawIncidentResponsesData)
+)
+"""Columns of the incident responses table."""
+
+GROUP_COLUMNS = (
+    "service_id",
+    "team_id",
+    "priority_id",
+    "priority_name",
+    "urgency",
+    "status",
+    "escalation_policy_id",
+)
+"""Columns incidents can be counted by."""
+
+_INCIDENT_DATETIMES = ("created_at", "resolved_at")
+_RESPONSE_DATETIMES = ("requested_at", "responded_at")
+_BOOLEANS = ("major", "auto_resolved")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS incidents (
+    id TEXT PRIMARY KEY,
+    {", ".join(c for c in INCIDENT_COLUMNS if c != "id")}
+);
+CREATE INDEX IF NOT EXISTS incidents_created_at ON incidents (created_at);
+CREATE INDEX IF NOT EXISTS incidents_service_id ON incidents (service_id, created_at);
+CREATE INDEX IF NOT EXISTS incidents_team_id ON incidents (team_id, created_at);
+CREATE INDEX IF NOT EXISTS incidents_priority_id ON incidents (priority_id, created_at);
+CREATE TABLE IF NOT EXISTS incident_responses (
+    {", ".join(RESPONSE_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS incident_responses_incident_id
+    ON incident_responses (incident_id, requested_at);
+"""
+
+Incident = Union[RawIncidentData, Dict[str, Any]]
+Response = Union[RawIncidentResponsesData, Dict[str, Any]]
+
+
+class IncidentMirror:
+    """Local copy of raw incidents and their responses in SQLite.
+
+    Incidents are upserted by id, so re-loading overlapping windows, e.g.
+    from IncrementalSync, keeps one up to date row per incident. Indexes on
+    `created_at`, and on `service_id`, `team_id` and `priority_id` paired
+    with `created_at`, keep the time range queries of the helpers fast.
+    Timestamps are stored as naive UTC ISO strings.
+
+    The mirror is synchronous; SQLite calls take milliseconds.
+    """
+
+    def __init__(self, path: str | os.PathLike = ":memory:") -> None:
+        """Open or create a mirror.
+
+        Args:
+            path (str | os.PathLike): Database file, in memory by default.
+        """
+        self.db = sqlite3.connect(os.fspath(path))
+        self.db.executescript(_SCHEMA)
+
+    def __enter__(self) -> "IncidentMirror":
+        """Return the mirror."""
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        """Close the mirror."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of mirrored incidents."""
+        return self.db.execute("SELECT COUNT(*) FROM incidents").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database."""
+        self.db.close()
+
+    def upsert_incidents(self, incidents: Iterable[Incident]) -> int:
+        """Insert incidents, replacing the ones already mirrored.
+
+        Args:
+            incidents (Iterable[RawIncidentData | dict]): Models or raw rows
+                as returned by the API.
+
+        Returns:
+            int: Number of upserted incidents.
+        """
+        rows = [_values(i, INCIDENT_COLUMNS, _INCIDENT_DATETIMES) for i in incidents]
+        with self.db:
+            self.db.executemany(
+                f"INSERT OR REPLACE INTO incidents ({', '.join(INCIDENT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(INCIDENT_COLUMNS))})",
+                rows,
+            )
+        return len(rows)
+
+    def replace_responses(self, incident_id: str, responses: Iterable[Response]) -> int:
+        """Replace the mirrored responses of an incident.
+
+        Args:
+            incident_id (str): Incident ID.
+            responses (Iterable[RawIncidentResponsesData | dict]): Models or
+                raw rows as returned by the API.
+
+        Returns:
+            int: Number of stored responses.
+        """
+        columns = RESPONSE_COLUMNS[1:]
+        rows = [
+            (incident_id,) + _values(r, columns, _RESPONSE_DATETIMES) for r in responses
+        ]
+        with self.db:
+            self.db.execute(
+                "DELETE FROM incident_responses WHERE incident_id = ?", (incident_id,)
+            )
+            self.db.executemany(
+                f"INSERT INTO incident_responses ({', '.join(RESPONSE_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(RESPONSE_COLUMNS))})",
+                rows,
+            )
+        return len(rows)
+
+    def get(self, incident_id: str) -> RawIncidentData | None:
+        """Return a mirrored incident, if any."""
+        rows = self.__select("WHERE id = ?", [incident_id])
+        return rows[0] if rows else None
+
+    def incidents(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        service_ids: Sequence[str] | None = None,
+        team_ids: Sequence[str] | None = None,
+        priority_ids: Sequence[str] | None = None,
+        urgency: Literal["high", "low"] | None = None,
+        order: Literal["asc", "desc"] = "asc",
+        limit: int | None = None,
+    ) -> List[RawIncidentData]:
+        """Return the mirrored incidents matching filters.
+
+        Args:
+            since (datetime | None): Created at or after.
+            until (datetime | None): Created before.
+            service_ids (Sequence[str] | None): Service IDs.
+            team_ids (Sequence[str] | None): Team IDs.
+            priority_ids (Sequence[str] | None): Priority IDs.
+            urgency (str | None): 'high' or 'low'.
+            order (str): Creation date order, 'asc' or 'desc'.
+            limit (int | None): Maximum number of incidents.
+
+        Returns:
+            list[RawIncidentData]
+        """
+        where, params = _where(
+            since,
+            until,
+            service_id=service_ids,
+            team_id=team_ids,
+            priority_id=priority_ids,
+            urgency=None if urgency is None else [urgency],
+        )
+        sql = f"{where} ORDER BY created_at {'DESC' if order == 'desc' else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.__select(sql, params)
+
+    def responses(self, incident_id: str) -> List[RawIncidentResponsesData]:
+        """Return the mirrored responses of an incident, by request time."""
+        columns = RESPONSE_COLUMNS[1:]
+        cursor = self.db.execute(
+            f"SELECT {', '.join(columns)} FROM incident_responses "
+            "WHERE incident_id = ? ORDER BY requested_at",
+            (incident_id,),
+        )
+        return [
+            RawIncidentResponsesData.from_dict(dict(zip(columns, row)))
+            for row in cursor
+        ]
+
+    def count_by(
+        self,
+        column: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> Dict[Any, int]:
+        """Count the incidents created in a time range by a column.
+
+        Args:
+            column (str): One of GROUP_COLUMNS, e.g. 'service_id'.
+            since (datetime | None): Created at or after.
+            until (datetime | None): Created before.
+
+        Returns:
+            dict: Incident counts by column value.
+
+        Raises:
+            ValueError: The column cannot be grouped by.
+        """
+        if column not in GROUP_COLUMNS:
+            raise ValueError(f"cannot count incidents by {column!r}")
+        where, params = _where(since, until)
+        cursor = self.db.execute(
+            f"SELECT {column}, COUNT(*) FROM incidents {where} GROUP BY {column}",
+            params,
+        )
+        return dict(cursor.fetchall())
+
+    def __select(self, sql: str, params: Sequence[Any]) -> List[RawIncidentData]:
+        cursor = self.db.execute(
+            f"SELECT {', '.join(INCIDENT_COLUMNS)} FROM incidents {sql}", params
+        )
+        incidents = []
+        for row in cursor:
+            data = dict(zip(INCIDENT_COLUMNS, row))
+            for name in _BOOLEANS:
+                if data[name] is not None:
+                    data[name] = bool(data[name])
+            incidents.append(RawIncidentData.from_dict(data))
+        return incidents
+
+
+def _values(
+    obj: Any, columns: Sequence[str], datetimes: Sequence[str]
+) -> Tuple[Any, ...]:
+    """Return the column values of a model or raw row."""
+    if isinstance(obj, dict):
+        data = {c: obj.get(c) for c in columns}
+    else:
+        data = {c: getattr(obj, c) for c in columns}
+    for name in datetimes:
+        data[name] = _sql_datetime(data[name])
+    return tuple(data.values())
+
+
+def _sql_datetime(value: datetime | str | None) -> str | None:
+    """Return a sortable naive UTC ISO string."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = utils.parse_pd_datetime_format(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def _where(
+    since: datetime | None,
+    until: datetime | None,
+    **values: Sequence[str] | None,
+) -> Tuple[str, List[Any]]:
+    """Return a WHERE clause for a creation time range and column values."""
+    clauses, params = [], []
+    if since is not None:
+        clauses.append("created_at >= ?")
+        params.append(_sql_datetime(since))
+    if until is not None:
+        clauses.append("created_at < ?")
+        params.append(_sql_datetime(until))
+    for column, allowed in values.items():
+        if allowed:
+            clauses.append(f"{column} IN ({', '.join('?' * len(allowed))})")
+            params.extend(allowed)
+    return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
@@ -15,7 +15,9 @@
 """Abilities resource."""
 from __future__ import annotations
 
-from typing import List, TYPE_CHECKING
+import asyncio
+import time
+from typing import Dict, FrozenSet, Iterable, List, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from asyncpd.client import APIClient
@@ -27,9 +29,18 @@ Abilities = List[str]
 class AbilitiesAPI:
     """Abilities API resource."""
 
-    def __init__(self, client: APIClient) -> None:
-        """Initialize the Abilities API resource."""
+    def __init__(self, client: APIClient, cache_ttl: float = 300.0) -> None:
+        """Initialize the Abilities API resource.
+
+        Args:
+            client (APIClient): asyncpd APIClient.
+            cache_ttl (float): Seconds a cached abilities snapshot stays fresh.
+        """
         self.__client = client
+        self.cache_ttl = cache_ttl
+        self.__snapshot: FrozenSet[str] | None = None
+        self.__loaded_at = 0.0
+        self.__refresher: asyncio.Task | None = None
 
     async def list(self) -> Abilities:
         """List the enabled abilities in your account."""
@@ -41,17 +52,97 @@ class AbilitiesAPI:
         if not res.status_code == 200:
             res.raise_for_status()
 
-        data: dict = res.json()
+        data: dict = self.__client.decode(res)
 
         return data.get("abilities", [])
 
-    async def is_enabled(self, ability: str) -> bool:
+    async def snapshot(self) -> FrozenSet[str]:
+        """Return the cached set of enabled abilities.
+
+        The abilities are listed once and reloaded when the snapshot is older
+        than `cache_ttl` seconds.
+
+        Raises:
+            httpx.HTTPStatusError
+                when unexpected HTTP error occurs.
+        """
+        if self.__snapshot is None or self.__is_stale():
+            return await self.refresh()
+        return self.__snapshot
+
+    async def refresh(self) -> FrozenSet[str]:
+        """Reload the abilities snapshot."""
+        self.__snapshot = frozenset(await self.list())
+        self.__loaded_at = time.monotonic()
+        return self.__snapshot
+
+    def invalidate(self) -> None:
+        """Drop the abilities snapshot."""
+        self.__snapshot = None
+
+    def __is_stale(self) -> bool:
+        return time.monotonic() - self.__loaded_at >= self.cache_ttl
+
+    def start_background_refresh(self, interval: float | None = None) -> None:
+        """Keep the snapshot fresh from a background task.
+
+        Errors while refreshing are ignored and the previous snapshot is kept.
+
+        Args:
+            interval (float | None): Seconds between refreshes, defaults to
+                `cache_ttl`.
+        """
+        if self.__refresher is not None and not self.__refresher.done():
+            return
+        self.__refresher = asyncio.ensure_future(
+            self.__refresh_forever(interval or self.cache_ttl)
+        )
+
+    async def stop_background_refresh(self) -> None:
+        """Stop the background refresh task."""
+        if self.__refresher is None:
+            return
+        self.__refresher.cancel()
+        try:
+            await self.__refresher
+        except asyncio.CancelledError:
+            pass
+        self.__refresher = None
+
+    async def __refresh_forever(self, interval: float) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                # Keep serving the previous snapshot until the next attempt.
+                pass
+            await asyncio.sleep(interval)
+
+    async def are_enabled(self, abilities: Iterable[str]) -> Dict[str, bool]:
+        """Indicates for each ability if it is enabled, using the snapshot.
+
+        Raises:
+            httpx.HTTPStatusError
+                when unexpected HTTP error occurs.
+        """
+        snapshot = await self.snapshot()
+        return {ability: ability in snapshot for ability in abilities}
+
+    async def is_enabled(self, ability: str, cached: bool = False) -> bool:
         """Indicates if an ability is enabled.
 
+        Args:
+            ability (str): Ability name.
+            cached (bool): Answer from the abilities snapshot instead of
+                requesting the ability.
+
         Raises:
             httpx.HTTPStatusError
                 when unexpected HTTP error occurs.
         """
+        if cached:
+            return ability in await self.snapshot()
+
         res = await self.__client.request(
             "GET",
             f"/abilities/{ability}",
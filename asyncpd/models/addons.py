@@ -17,12 +17,18 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import AsyncIterator, List, Sequence, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from asyncpd.client import APIClient
 
-from asyncpd.models.pagination import ClassicPaginationQuery
+from asyncpd import utils
+from asyncpd.models.lazy import LazyRows
+from asyncpd.models.pagination import (
+    ClassicPaginationQuery,
+    ClassicPaginationResult,
+    iter_classic_pagination,
+)
 from asyncpd.models.service import ServiceReference
 
 
@@ -46,6 +52,7 @@ class NewAddon:
         return {"type": self.type, "name": self.type.value, "src": self.src}
 
 
+@utils.slotted
 @dataclass
 class Addon:
     """PagerDuty addon data model."""
@@ -74,24 +81,29 @@ class Addon:
 
 
 @dataclass
-class PaginatedAddon:
+class PaginatedAddon(ClassicPaginationResult):
     """Data model for paginated addons."""
 
-    limit: int
-    offset: int
-    more: bool
-    total: int | None = None
-    addons: list[Addon] = field(default_factory=list)
+    addons: Sequence[Addon] = field(default_factory=list)
 
     @classmethod
-    def from_dict(cls, data: dict) -> "PaginatedAddon":
-        """Serialize paginated addon from dict-like object."""
+    def from_dict(cls, data: dict, lazy: bool = False) -> "PaginatedAddon":
+        """Serialize paginated addon from dict-like object.
+
+        Args:
+            data (dict): Decoded response body.
+            lazy (bool): Build the addons only when they are accessed.
+        """
         return PaginatedAddon(
             limit=data["limit"],
             offset=data["offset"],
             more=data["more"],
-            total=data.get("more"),
-            addons=[Addon.from_dict(d) for d in data["addons"]],
+            total=data.get("total"),
+            addons=(
+                LazyRows(data["addons"], Addon.from_dict)
+                if lazy
+                else [Addon.from_dict(d) for d in data["addons"]]
+            ),
         )
 
 
@@ -117,6 +129,7 @@ class AddonsAPI:
         filter: str | None = None,
         include: list[str] | None = None,
         service_ids: list[str] | None = None,
+        lazy: bool = False,
     ) -> PaginatedAddon:
         """List addons.
 
@@ -124,6 +137,7 @@ class AddonsAPI:
             query (ClassicPaginationQuery): Pagination query.
             filter (str): Filters addon types.
             service_ids (list[str]): Filters results for given service_ids
+            lazy (bool): Build the addons only when they are accessed.
 
         Returns:
             PaginatedAddon
@@ -167,7 +181,40 @@ class AddonsAPI:
         if res.status_code != 200:
             res.raise_for_status()
 
-        return PaginatedAddon.from_dict(res.json())
+        return PaginatedAddon.from_dict(self.__client.decode(res), lazy=lazy)
+
+    def iter_all(
+        self,
+        filter: str | None = None,
+        include: List[str] | None = None,
+        service_ids: List[str] | None = None,
+        limit: int = 25,
+        concurrency: int = 4,
+    ) -> AsyncIterator[Addon]:
+        """Iterate over all addons, fetching pages concurrently.
+
+        Args:
+            filter (str): Filters addon types.
+            include (list[str]): Additional resources to include.
+            service_ids (list[str]): Filters results for given service_ids
+            limit (int): Page size.
+            concurrency (int): Maximum number of pages fetched concurrently.
+
+        Returns:
+            AsyncIterator[Addon]
+
+        Raises:
+            httpx.HTTPStatusError
+        """
+
+        async def fetch(query: ClassicPaginationQuery) -> PaginatedAddon:
+            return await self.list(
+                query, filter=filter, include=include, service_ids=service_ids
+            )
+
+        return iter_classic_pagination(
+            fetch, lambda page: page.addons, limit=limit, concurrency=concurrency
+        )
 
     async def install_addon(
         self,
@@ -183,7 +230,9 @@ class AddonsAPI:
         if res.status_code != 201:
             res.raise_for_status()
 
-        return Addon.from_dict(res.json()["addon"])
+        self.__client.invalidate("/addons")
+
+        return Addon.from_dict(self.__client.decode(res)["addon"])
 
     async def get(self, id: str) -> Addon | None:
         """Get an addon by its id.
@@ -203,7 +252,7 @@ class AddonsAPI:
         if res.status_code != 200:
             res.raise_for_status()
 
-        return Addon.from_dict(res.json()["addon"])
+        return Addon.from_dict(self.__client.decode(res)["addon"])
 
     async def delete(self, id: str) -> None:
         """Delete an addon."""
@@ -215,6 +264,7 @@ class AddonsAPI:
         if res.status_code != 204:
             res.raise_for_status()
 
+        self.__client.invalidate("/addons")
         return None
 
     async def update(self, id: str, update_mask: AddonUpdateMask) -> Addon:
@@ -234,4 +284,5 @@ class AddonsAPI:
         if res.status_code != 200:
             res.raise_for_status()
 
-        return Addon.from_dict(res.json()["addon"])
+        self.__client.invalidate("/addons")
+        return Addon.from_dict(self.__client.decode(res)["addon"])
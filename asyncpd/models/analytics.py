@@ -15,16 +15,66 @@
 """PagerDuty Analytics API resources."""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Literal, TYPE_CHECKING
+import asyncio
+import copy
+import json
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timedelta
+from typing import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Literal,
+    Sequence,
+    TYPE_CHECKING,
+    cast,
+)
 
 from asyncpd import utils
+from asyncpd.concurrency import bounded_map
+from asyncpd.models.columnar import RawIncidentColumns
+from asyncpd.models.lazy import LazyRows
+from asyncpd.models.sharding import ShardedWalk, split_time_range
+from asyncpd.streaming import JSONArrayStream, aiter_json_array
 
 if TYPE_CHECKING:
     from asyncpd.client import APIClient
 
 
+_UTC_ZONES = (None, "UTC", "Etc/UTC")
+
+# Low-cardinality string fields that are interned to share one copy per value
+# across the rows of large analytics results.
+_RAW_INCIDENT_CATEGORICAL_FIELDS = (
+    "status",
+    "urgency",
+    "priority_id",
+    "priority_name",
+    "escalation_policy_id",
+    "escalation_policy_name",
+    "service_id",
+    "service_name",
+    "team_id",
+    "team_name",
+    "resolved_by_user_id",
+    "resolved_by_user_name",
+)
+_AGGREGATED_METRICS_CATEGORICAL_FIELDS = (
+    "service_id",
+    "service_name",
+    "team_id",
+    "team_name",
+)
+_RESPONSE_CATEGORICAL_FIELDS = (
+    "responder_id",
+    "responder_name",
+    "responder_type",
+    "response_status",
+)
+
+
 @dataclass
 class AggregateAnalyticsResponse:
     """Response wrapper from the aggregate analytics API."""
@@ -60,11 +110,18 @@ class RawAnalyticsMultipleIncidentsResponse:
     starting_after: datetime | None = None
     filters: AnalyticsRequestFilters | None = None
     ending_before: datetime | None = None
-    data: list[RawIncidentData] = field(default_factory=list)
+    data: Sequence[RawIncidentData] = field(default_factory=list)
 
     @classmethod
-    def from_dict(self, data: dict) -> "RawAnalyticsMultipleIncidentsResponse":
-        """Serialize RawAnalyticsMultipleIncidentsResponse from a dict."""
+    def from_dict(
+        self, data: dict, lazy: bool = False
+    ) -> "RawAnalyticsMultipleIncidentsResponse":
+        """Serialize RawAnalyticsMultipleIncidentsResponse from a dict.
+
+        Args:
+            data (dict): Decoded response body.
+            lazy (bool): Build the rows only when they are accessed.
+        """
         return RawAnalyticsMultipleIncidentsResponse(
             first=data["first"],
             last=data["last"],
@@ -75,10 +132,15 @@ class RawAnalyticsMultipleIncidentsResponse:
             starting_after=data["starting_after"],
             filters=AnalyticsRequestFilters.from_dict(data["filters"]),
             ending_before=data["ending_before"],
-            data=[RawIncidentData.from_dict(d) for d in data["data"]],
+            data=(
+                LazyRows(data["data"], RawIncidentData.from_dict)
+                if lazy
+                else [RawIncidentData.from_dict(d) for d in data["data"]]
+            ),
         )
 
 
+@utils.slotted
 @dataclass
 class AggregatedMetrics:
     """The Data payload for incident metrics."""
@@ -114,11 +176,14 @@ class AggregatedMetrics:
     @classmethod
     def from_dict(cls, data: dict) -> "AggregatedMetrics":
         """Convert a dictionary into an AggregatedMetrics instance."""
+        data = dict(data)
         if data["range_start"] is not None:
             data["range_start"] = datetime.fromisoformat(data["range_start"])
+        utils.intern_strings(data, _AGGREGATED_METRICS_CATEGORICAL_FIELDS)
         return AggregatedMetrics(**data)
 
 
+@utils.slotted
 @dataclass
 class RawIncidentData:
     """Represents the raw incident data."""
@@ -166,15 +231,23 @@ class RawIncidentData:
     @classmethod
     def from_dict(cls, data: dict) -> "RawIncidentData":
         """Serialize RawIncidentData from a dictionary."""
+        data = dict(data)
         if data["resolved_at"] is not None:
             data["resolved_at"] = utils.parse_pd_datetime_format(data["resolved_at"])
 
         if data["created_at"] is not None:
             data["created_at"] = utils.parse_pd_datetime_format(data["created_at"])
 
+        utils.intern_strings(data, _RAW_INCIDENT_CATEGORICAL_FIELDS)
         return RawIncidentData(**data)
 
 
+RAW_INCIDENT_COLUMNS = tuple(
+    f.name for f in fields(RawIncidentData) if f.name != "snoozed_secondS"
+)
+"""Columns of a raw incident, without the misspelled `snoozed_secondS` field."""
+
+
 @dataclass
 class AnalyticsRequestFilters:
     """User-defined filters to apply to the aggregate incident data analytics endpoint."""
@@ -190,7 +263,14 @@ class AnalyticsRequestFilters:
 
     def to_dict(self) -> dict:
         """Serialize to dict object."""
-        return {k: v for k, v in self.__dict__.items() if v is not None}
+        data = {}
+        for k, v in self.__dict__.items():
+            if v is None:
+                continue
+            if isinstance(v, datetime):
+                v = v.isoformat()
+            data["created_at_end" if k == "create_at_end" else k] = v
+        return data
 
     @classmethod
     def from_dict(cls, data: dict) -> "AnalyticsRequestFilters":
@@ -207,21 +287,75 @@ class AnalyticsRequestFilters:
         )
 
 
+@dataclass(frozen=True, eq=False)
+class AggregateQuery:
+    """One aggregated metrics request: a domain, unit, filters and time zone.
+
+    Queries compare and hash by their canonical request body, so two
+    queries asking for the same data, e.g. with filter IDs in another order
+    or 'UTC' for the default time zone, are one key of a planned batch.
+    Queries are immutable and keep a copy of their filters, so changing the
+    filters afterwards does not change a query already used as a key.
+    """
+
+    domain: Literal["all", "services", "teams"] = "all"
+    aggregate_unit: Literal["day", "week", "month"] | None = None
+    filters: AnalyticsRequestFilters | None = None
+    time_zone: str | None = None
+    _key: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Copy the filters and compute the canonical form of the request."""
+        object.__setattr__(self, "filters", copy.deepcopy(self.filters))
+        filters = {} if self.filters is None else self.filters.to_dict()
+        for k, v in filters.items():
+            if isinstance(v, list):
+                filters[k] = sorted(v)
+        key = json.dumps(
+            [
+                self.domain,
+                self.aggregate_unit,
+                filters,
+                None if self.time_zone in _UTC_ZONES else self.time_zone,
+            ],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        object.__setattr__(self, "_key", key)
+
+    def key(self) -> str:
+        """Return the canonical form of the request."""
+        return self._key
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether both queries ask for the same data."""
+        if not isinstance(other, AggregateQuery):
+            return NotImplemented
+        return self.key() == other.key()
+
+    def __hash__(self) -> int:
+        """Return the hash of the canonical request."""
+        return hash(self.key())
+
+
+@utils.slotted
 @dataclass
 class RawIncidentResponsesData:
     """Data model for raw Response Data."""
 
     requested_at: datetime
-    responder_id: str
-    responder_name: str
-    responder_type: str
-    response_status: str
+    responder_id: str | None
+    responder_name: str | None
+    responder_type: str | None
+    response_status: str | None
     time_to_respond_seconds: int | None = None
     responded_at: datetime | None = None
 
     @classmethod
     def from_dict(cls, data: dict) -> "RawIncidentResponsesData":
         """Serialize RawIncidentResponsesData from a dict object."""
+        data = dict(data)
+        utils.intern_strings(data, _RESPONSE_CATEGORICAL_FIELDS)
         return RawIncidentResponsesData(
             requested_at=utils.parse_pd_datetime_format(data["requested_at"]),
             responder_id=data["responder_id"],
@@ -243,22 +377,45 @@ class RawResponsesForSingleIncident:
     limit: int
     order: str
     order_by: str
-    responses: list[RawIncidentResponsesData] = field(default_factory=list)
+    responses: Sequence[RawIncidentResponsesData] = field(default_factory=list)
 
     @classmethod
-    def from_dict(cls, data: dict) -> "RawResponsesForSingleIncident":
-        """Serialize RawResponsesForSingleIncident from a dict object."""
+    def from_dict(
+        cls, data: dict, lazy: bool = False
+    ) -> "RawResponsesForSingleIncident":
+        """Serialize RawResponsesForSingleIncident from a dict object.
+
+        Args:
+            data (dict): Decoded response body.
+            lazy (bool): Build the responses only when they are accessed.
+        """
         return RawResponsesForSingleIncident(
             incident_id=data["incident_id"],
             limit=data["limit"],
             order=data["order"],
             order_by=data["order_by"],
-            responses=[
-                RawIncidentResponsesData.from_dict(r) for r in data["responses"]
-            ],
+            responses=(
+                LazyRows(data["responses"], RawIncidentResponsesData.from_dict)
+                if lazy
+                else [RawIncidentResponsesData.from_dict(r) for r in data["responses"]]
+            ),
         )
 
 
+@dataclass
+class IncidentResponses:
+    """An incident joined with its raw responses.
+
+    `found` is False when the incident's responses returned 404, in which
+    case `responses` is empty.
+    """
+
+    incident_id: str
+    incident: RawIncidentData | None = None
+    responses: Sequence[RawIncidentResponsesData] = field(default_factory=list)
+    found: bool = True
+
+
 class AnalyticsAPI:
     """API resource for interacting with PagerDuty Analytics API."""
 
@@ -292,7 +449,7 @@ class AnalyticsAPI:
         if res.status_code != 200:
             res.raise_for_status()
 
-        return AggregateAnalyticsResponse.from_dict(res.json())
+        return AggregateAnalyticsResponse.from_dict(self.__client.decode(res))
 
     async def get_aggregated_incident_data(
         self,
@@ -327,34 +484,383 @@ class AnalyticsAPI:
             "teams", filters, time_zone, aggregate_unit
         )
 
-    async def get_multiple_raw_incident_data(
+    async def get_aggregated_data_batch(
+        self, queries: Iterable[AggregateQuery], concurrency: int = 8
+    ) -> Dict[AggregateQuery, AggregateAnalyticsResponse]:
+        """Run many aggregated metrics queries concurrently.
+
+        Duplicate queries are requested once. Requests go through the
+        client's rate limiter, so a dashboard refresh takes about as long as
+        its slowest query instead of the sum of all of them.
+
+        Args:
+            queries (Iterable[AggregateQuery]): Wanted domain, unit, filters
+                and time zone combinations.
+            concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            dict[AggregateQuery, AggregateAnalyticsResponse]: Results by
+                query.
+
+        Raises:
+            httpx.HTTPStatusError: A query failed, the others are cancelled.
+        """
+
+        async def fetch(query: AggregateQuery) -> AggregateAnalyticsResponse:
+            return await self.__do_aggregate_data_fetch(
+                query.domain, query.filters, query.time_zone, query.aggregate_unit
+            )
+
+        planned = dict.fromkeys(queries)
+        results = bounded_map(fetch, planned, concurrency)
+        try:
+            async for query, task in results:
+                planned[query] = task.result()
+        finally:
+            await results.aclose()
+        return cast(Dict[AggregateQuery, AggregateAnalyticsResponse], planned)
+
+    async def __fetch_raw_incident_page(
         self,
         filters: AnalyticsRequestFilters | None = None,
         limit: int = 20,
         order: str | None = None,
         order_by: str | None = None,
         time_zone: str | None = None,
-    ) -> RawAnalyticsMultipleIncidentsResponse:
-        """Fetch multiple raw incident data points."""
+        starting_after: str | None = None,
+    ) -> dict:
+        """Fetch a page of raw incident data and return the decoded body."""
         res = await self.__client.request(
             "POST",
             "/analytics/raw/incidents",
             headers={
                 "X-EARLY-ACCESS": "analytics-v2",
             },
-            data={
-                "filters": None if filters is None else filters.to_dict(),
-                "limit": limit,
-                "order": order,
-                "order_by": order_by,
-                "time_zone": time_zone,
-            },
+            data=_raw_incidents_body(
+                filters, limit, order, order_by, time_zone, starting_after
+            ),
         )
 
         if res.status_code != 200:
             res.raise_for_status()
 
-        return RawAnalyticsMultipleIncidentsResponse.from_dict(res.json())
+        return self.__client.decode(res)
+
+    async def iter_raw_incident_pages(
+        self,
+        filters: AnalyticsRequestFilters | None = None,
+        limit: int = 1000,
+        order: str | None = None,
+        order_by: str | None = None,
+        time_zone: str | None = None,
+        starting_after: str | None = None,
+    ) -> AsyncGenerator[dict, None]:
+        """Follow the raw incidents cursor, prefetching one page ahead.
+
+        Yields the decoded response bodies, whose `last` value is the cursor
+        to resume after the page. At most two pages are held at a time: the
+        page being consumed and the next page being fetched.
+
+        Args:
+            filters (AnalyticsRequestFilters): Request filters.
+            limit (int): Page size.
+            order (str): Sort direction, 'asc' or 'desc'.
+            order_by (str): Column to sort by.
+            time_zone (str): Time zone for the response timestamps.
+            starting_after (str): Cursor to resume from.
+
+        Raises:
+            httpx.HTTPStatusError
+        """
+        page = await self.__fetch_raw_incident_page(
+            filters, limit, order, order_by, time_zone, starting_after
+        )
+        while True:
+            next_page: asyncio.Future[dict] | None = None
+            if page.get("more") and page.get("last"):
+                next_page = asyncio.ensure_future(
+                    self.__fetch_raw_incident_page(
+                        filters, limit, order, order_by, time_zone, page["last"]
+                    )
+                )
+            try:
+                yield page
+            except BaseException:
+                if next_page is not None:
+                    next_page.cancel()
+                raise
+            if next_page is None:
+                return
+            page = await next_page
+
+    async def get_multiple_raw_incident_data(
+        self,
+        filters: AnalyticsRequestFilters | None = None,
+        limit: int = 20,
+        order: str | None = None,
+        order_by: str | None = None,
+        time_zone: str | None = None,
+        starting_after: str | None = None,
+        lazy: bool = False,
+    ) -> RawAnalyticsMultipleIncidentsResponse:
+        """Fetch multiple raw incident data points.
+
+        Args:
+            filters (AnalyticsRequestFilters): Request filters.
+            limit (int): Page size.
+            order (str): Sort direction, 'asc' or 'desc'.
+            order_by (str): Column to sort by.
+            time_zone (str): Time zone for the response timestamps.
+            starting_after (str): Cursor, the `last` value of the previous page.
+            lazy (bool): Build the rows only when they are accessed.
+        """
+        return RawAnalyticsMultipleIncidentsResponse.from_dict(
+            await self.__fetch_raw_incident_page(
+                filters, limit, order, order_by, time_zone, starting_after
+            ),
+            lazy=lazy,
+        )
+
+    async def iter_raw_incident_data(
+        self,
+        filters: AnalyticsRequestFilters | None = None,
+        limit: int = 1000,
+        order: str | None = None,
+        order_by: str | None = None,
+        time_zone: str | None = None,
+        starting_after: str | None = None,
+    ) -> AsyncIterator[RawIncidentData]:
+        """Stream raw incident data, following the cursor across pages.
+
+        The next page is requested while the rows of the current page are
+        consumed, and rows are only built as they are yielded.
+
+        Args:
+            filters (AnalyticsRequestFilters): Request filters.
+            limit (int): Page size.
+            order (str): Sort direction, 'asc' or 'desc'.
+            order_by (str): Column to sort by.
+            time_zone (str): Time zone for the response timestamps.
+            starting_after (str): Cursor to resume from.
+
+        Returns:
+            AsyncIterator[RawIncidentData]
+
+        Raises:
+            httpx.HTTPStatusError
+        """
+        pages = self.iter_raw_incident_pages(
+            filters, limit, order, order_by, time_zone, starting_after
+        )
+        try:
+            async for page in pages:
+                for row in page["data"]:
+                    yield RawIncidentData.from_dict(row)
+        finally:
+            await pages.aclose()
+
+    async def stream_raw_incident_rows(
+        self,
+        filters: AnalyticsRequestFilters | None = None,
+        limit: int = 1000,
+        order: str | None = None,
+        order_by: str | None = None,
+        time_zone: str | None = None,
+        starting_after: str | None = None,
+    ) -> AsyncGenerator[dict, None]:
+        """Stream raw incident rows, parsing each page while it is received.
+
+        Rows are yielded as decoded JSON objects as soon as they are read
+        from the response body, so only the row being received is buffered
+        instead of the whole page. The cursor is followed across pages, the
+        next page being requested once the current body has been read.
+
+        Args:
+            filters (AnalyticsRequestFilters): Request filters.
+            limit (int): Page size.
+            order (str): Sort direction, 'asc' or 'desc'.
+            order_by (str): Column to sort by.
+            time_zone (str): Time zone for the response timestamps.
+            starting_after (str): Cursor to resume from.
+
+        Raises:
+            httpx.HTTPStatusError
+            ValueError: A response body is not valid JSON.
+        """
+        cursor = starting_after
+        while True:
+            parser = JSONArrayStream("data")
+            async with self.__client.stream(
+                "POST",
+                "/analytics/raw/incidents",
+                headers={
+                    "X-EARLY-ACCESS": "analytics-v2",
+                },
+                data=_raw_incidents_body(
+                    filters, limit, order, order_by, time_zone, cursor
+                ),
+            ) as res:
+                if res.status_code != 200:
+                    res.raise_for_status()
+                async for row in aiter_json_array(res, parser):
+                    yield row
+            page = parser.metadata
+            if not page.get("more") or not page.get("last"):
+                return
+            cursor = page["last"]
+
+    async def stream_raw_incident_data(
+        self,
+        filters: AnalyticsRequestFilters | None = None,
+        limit: int = 1000,
+        order: str | None = None,
+        order_by: str | None = None,
+        time_zone: str | None = None,
+        starting_after: str | None = None,
+    ) -> AsyncGenerator[RawIncidentData, None]:
+        """Stream raw incident data, parsing each page while it is received.
+
+        See `stream_raw_incident_rows`, which yields the same rows undecoded.
+
+        Args:
+            filters (AnalyticsRequestFilters): Request filters.
+            limit (int): Page size.
+            order (str): Sort direction, 'asc' or 'desc'.
+            order_by (str): Column to sort by.
+            time_zone (str): Time zone for the response timestamps.
+            starting_after (str): Cursor to resume from.
+
+        Raises:
+            httpx.HTTPStatusError
+            ValueError: A response body is not valid JSON.
+        """
+        rows = self.stream_raw_incident_rows(
+            filters, limit, order, order_by, time_zone, starting_after
+        )
+        try:
+            async for row in rows:
+                yield RawIncidentData.from_dict(row)
+        finally:
+            await rows.aclose()
+
+    async def get_raw_incident_columns(
+        self,
+        filters: AnalyticsRequestFilters | None = None,
+        limit: int = 1000,
+        order: str | None = None,
+        order_by: str | None = None,
+        time_zone: str | None = None,
+        starting_after: str | None = None,
+        columns: RawIncidentColumns | None = None,
+        max_pages: int | None = None,
+    ) -> RawIncidentColumns:
+        """Fetch raw incident data as column arrays.
+
+        Follows the cursor like `iter_raw_incident_data`, appending each page
+        to the columns without building RawIncidentData rows.
+
+        Args:
+            filters (AnalyticsRequestFilters): Request filters.
+            limit (int): Page size.
+            order (str): Sort direction, 'asc' or 'desc'.
+            order_by (str): Column to sort by.
+            time_zone (str): Time zone for the response timestamps.
+            starting_after (str): Cursor to resume from.
+            columns (RawIncidentColumns | None): Columns to append to.
+            max_pages (int | None): Stop after this many pages.
+
+        Returns:
+            RawIncidentColumns
+
+        Raises:
+            httpx.HTTPStatusError
+        """
+        if columns is None:
+            columns = RawIncidentColumns()
+        pages = self.iter_raw_incident_pages(
+            filters, limit, order, order_by, time_zone, starting_after
+        )
+        try:
+            count = 0
+            async for page in pages:
+                columns.append_rows(page["data"])
+                count += 1
+                if max_pages is not None and count >= max_pages:
+                    break
+        finally:
+            await pages.aclose()
+        return columns
+
+    async def iter_raw_incident_data_sharded(
+        self,
+        filters: AnalyticsRequestFilters,
+        shards: int = 4,
+        limit: int = 1000,
+        order: str = "desc",
+        order_by: str = "created_at",
+        time_zone: str | None = None,
+        split_after_pages: int | None = 4,
+        min_window: timedelta = timedelta(minutes=1),
+    ) -> AsyncIterator[RawIncidentData]:
+        """Stream raw incident data by walking time windows concurrently.
+
+        The `created_at_start`/`create_at_end` range of `filters` is split into
+        `shards` windows whose cursors are walked concurrently, and the rows
+        are merged back into `order`/`order_by`. When ordering by `created_at`
+        a window still paging after `split_after_pages` pages splits its
+        unread remainder into two new windows, so dense windows do not
+        dominate the total runtime. Windows ahead of the consumer buffer a
+        few pages each, then wait for it.
+
+        Args:
+            filters (AnalyticsRequestFilters): Request filters with a time range.
+            shards (int): Number of initial windows.
+            limit (int): Page size.
+            order (str): Sort direction, 'asc' or 'desc'.
+            order_by (str): Column to sort by.
+            time_zone (str): Time zone for the response timestamps.
+            split_after_pages (int | None): Pages read before a window splits,
+                None disables adaptive splitting.
+            min_window (timedelta): Windows smaller than this never split.
+
+        Returns:
+            AsyncIterator[RawIncidentData]
+
+        Raises:
+            ValueError
+                when the filters do not define a time range.
+            httpx.HTTPStatusError
+        """
+        if filters.created_at_start is None or filters.create_at_end is None:
+            raise ValueError("filters must define created_at_start and create_at_end")
+
+        def walk(start: datetime, end: datetime) -> AsyncGenerator[dict, None]:
+            return self.iter_raw_incident_pages(
+                replace(filters, created_at_start=start, create_at_end=end),
+                limit,
+                order,
+                order_by,
+                time_zone,
+            )
+
+        walker = ShardedWalk(
+            walk,
+            order=order,
+            order_by=order_by,
+            # Row timestamps are only comparable with the filter bounds in UTC.
+            split_after_pages=split_after_pages if time_zone in _UTC_ZONES else None,
+            min_window=min_window,
+            concurrency=shards,
+        )
+        windows = split_time_range(
+            filters.created_at_start, filters.create_at_end, shards
+        )
+        rows = walker.iter_rows(windows)
+        try:
+            async for row in rows:
+                yield RawIncidentData.from_dict(row)
+        finally:
+            await rows.aclose()
 
     async def get_single_raw_incident_data(
         self, incident_id: str
@@ -384,7 +890,7 @@ class AnalyticsAPI:
         if res.status_code != 200:
             res.raise_for_status()
 
-        return RawIncidentData.from_dict(res.json())
+        return RawIncidentData.from_dict(self.__client.decode(res))
 
     async def get_raw_responses_for_incident(
         self,
@@ -392,8 +898,17 @@ class AnalyticsAPI:
         limit: int | None = None,
         order: str = "desc",
         time_zone: str | None = None,
+        lazy: bool = False,
     ) -> RawResponsesForSingleIncident | None:
-        """Get the raw responses for a single incident."""
+        """Get the raw responses for a single incident.
+
+        Args:
+            incident_id (str): Incident ID.
+            limit (int | None): Maximum number of responses.
+            order (str): Sort direction, 'asc' or 'desc'.
+            time_zone (str | None): Time zone for the response timestamps.
+            lazy (bool): Build the responses only when they are accessed.
+        """
         res = await self.__client.request(
             "GET",
             f"/analytics/raw/incidents/{incident_id}/responses",
@@ -414,4 +929,116 @@ class AnalyticsAPI:
         if res.status_code != 200:
             res.raise_for_status()
 
-        return RawResponsesForSingleIncident.from_dict(res.json())
+        return RawResponsesForSingleIncident.from_dict(
+            self.__client.decode(res), lazy=lazy
+        )
+
+    async def iter_raw_responses_for_incidents(
+        self,
+        incidents: Iterable[RawIncidentData | str]
+        | AsyncIterable[RawIncidentData | str],
+        concurrency: int = 8,
+        limit: int | None = None,
+        order: str = "desc",
+        time_zone: str | None = None,
+    ) -> AsyncGenerator[IncidentResponses, None]:
+        """Fetch the raw responses of many incidents concurrently.
+
+        Incidents are read from `incidents`, e.g. the output of
+        `stream_raw_incident_data`, as request slots free up, and each one
+        is yielded joined with its responses as soon as they arrive, so
+        results come out of input order. Incidents whose responses return
+        404 are yielded with `found` set to False; other errors stop the
+        stream.
+
+        Args:
+            incidents (Iterable | AsyncIterable): RawIncidentData rows or
+                incident IDs.
+            concurrency (int): Maximum number of requests in flight.
+            limit (int | None): Maximum number of responses per incident.
+            order (str): Sort direction, 'asc' or 'desc'.
+            time_zone (str | None): Time zone for the response timestamps.
+
+        Raises:
+            httpx.HTTPStatusError
+        """
+
+        async def fetch(incident: RawIncidentData | str) -> IncidentResponses:
+            incident_id = incident if isinstance(incident, str) else incident.id
+            res = await self.get_raw_responses_for_incident(
+                incident_id, limit, order, time_zone
+            )
+            return IncidentResponses(
+                incident_id=incident_id,
+                incident=None if isinstance(incident, str) else incident,
+                responses=[] if res is None else res.responses,
+                found=res is not None,
+            )
+
+        results = bounded_map(fetch, incidents, concurrency)
+        try:
+            async for _, task in results:
+                yield task.result()
+        finally:
+            await results.aclose()
+
+    async def stream_raw_responses_for_incident(
+        self,
+        incident_id: str,
+        limit: int | None = None,
+        order: str = "desc",
+        time_zone: str | None = None,
+    ) -> AsyncGenerator[RawIncidentResponsesData, None]:
+        """Stream the raw responses for a single incident.
+
+        Responses are yielded as soon as they are read from the response
+        body. Nothing is yielded when the incident does not exist.
+
+        Args:
+            incident_id (str): Incident ID.
+            limit (int | None): Maximum number of responses.
+            order (str): Sort direction, 'asc' or 'desc'.
+            time_zone (str | None): Time zone for the response timestamps.
+
+        Raises:
+            httpx.HTTPStatusError
+            ValueError: The response body is not valid JSON.
+        """
+        async with self.__client.stream(
+            "GET",
+            f"/analytics/raw/incidents/{incident_id}/responses",
+            headers={
+                "X-EARLY-ACCESS": "analytics-v2",
+            },
+            data={
+                "limit": limit,
+                "order": order,
+                "order_by": "requested_at",
+                "time_zone": time_zone,
+            },
+        ) as res:
+            if res.status_code == 404:
+                return
+            if res.status_code != 200:
+                res.raise_for_status()
+            async for row in aiter_json_array(res, JSONArrayStream("responses")):
+                yield RawIncidentResponsesData.from_dict(row)
+
+
+def _raw_incidents_body(
+    filters: AnalyticsRequestFilters | None,
+    limit: int,
+    order: str | None,
+    order_by: str | None,
+    time_zone: str | None,
+    starting_after: str | None,
+) -> dict:
+    """Return the request body of the raw incidents endpoint."""
+    return {
+        "filters": None if filters is None else filters.to_dict(),
+        "limit": limit,
+        "order": order,
+        "order_by": order_by,
+        "time_zone": time_zone,
+        "starting_after": starting_after,
+    }
@@ -0,0 +1,222 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Columnar representation of raw incident analytics."""
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from asyncpd import utils
+
+np = utils.optional_import("numpy")
+
+NUMERIC_FIELDS = (
+    "assignment_count",
+    "business_hour_interruptions",
+    "engaged_seconds",
+    "engaged_user_count",
+    "escalation_count",
+    "incident_number",
+    "off_hour_interruptions",
+    "priority_order",
+    "manual_escalation_count",
+    "total_interruptions",
+    "timeout_escalation_count",
+    "reassignment_count",
+    "total_notifications",
+    "snoozed_seconds",
+    "seconds_to_engage",
+    "seconds_to_first_ack",
+    "seconds_to_mobilize",
+    "seconds_to_resolve",
+    "sleep_hour_interruptions",
+    "user_defined_effort_seconds",
+    "major",
+    "auto_resolved",
+)
+"""Raw incident fields stored as float64 columns, nulls being NaN."""
+
+TIMESTAMP_FIELDS = ("created_at", "resolved_at")
+"""Raw incident fields stored as float64 POSIX timestamps, nulls being NaN."""
+
+CATEGORICAL_FIELDS = (
+    "service_id",
+    "team_id",
+    "urgency",
+    "priority_id",
+    "priority_name",
+    "status",
+    "escalation_policy_id",
+)
+"""Raw incident fields stored as dictionary-encoded columns."""
+
+NAN = math.nan
+
+
+class CategoricalColumn:
+    """Dictionary-encoded column of low-cardinality values.
+
+    Each row stores an integer code into `categories`. Nulls are a category
+    like any other value.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty column."""
+        self.categories: List[Optional[str]] = []
+        self.__index: Dict[Optional[str], int] = {}
+        self.__codes = array("l")
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.__codes)
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        """Return the decoded value of a row."""
+        return self.categories[self.__codes[i]]
+
+    def code(self, value: Optional[str]) -> int:
+        """Return the code of a value, adding it as a category if needed."""
+        try:
+            return self.__index[value]
+        except KeyError:
+            code = self.__index[value] = len(self.categories)
+            self.categories.append(value)
+            return code
+
+    def extend(self, values: Iterable[Optional[str]]) -> None:
+        """Append values to the column."""
+        index, code = self.__index, self.code
+        self.__codes.extend([index[v] if v in index else code(v) for v in values])
+
+    @property
+    def codes(self) -> Any:
+        """Return the codes, as a NumPy array when NumPy is installed."""
+        if np is not None:
+            return np.array(self.__codes, dtype=np.int64)
+        return array("l", self.__codes)
+
+    def to_list(self) -> List[Optional[str]]:
+        """Return the decoded values."""
+        categories = self.categories
+        return [categories[c] for c in self.__codes]
+
+
+class RawIncidentColumns:
+    """Column arrays built from raw incident analytics pages.
+
+    Numeric and timestamp fields are float64 columns where nulls are NaN,
+    returned as NumPy arrays when NumPy is installed and as `array('d')`
+    otherwise. Categorical fields are dictionary-encoded. Pages are appended
+    straight from the decoded JSON, without building RawIncidentData rows.
+    """
+
+    def __init__(
+        self,
+        numeric_fields: Sequence[str] = NUMERIC_FIELDS,
+        timestamp_fields: Sequence[str] = TIMESTAMP_FIELDS,
+        categorical_fields: Sequence[str] = CATEGORICAL_FIELDS,
+    ) -> None:
+        """Initialize empty columns.
+
+        Args:
+            numeric_fields (Sequence[str]): Fields stored as float64.
+            timestamp_fields (Sequence[str]): Fields stored as timestamps.
+            categorical_fields (Sequence[str]): Fields dictionary-encoded.
+        """
+        self.ids: List[str] = []
+        self.__numeric = {f: array("d") for f in numeric_fields}
+        self.__timestamps = {f: array("d") for f in timestamp_fields}
+        self.__categorical = {f: CategoricalColumn() for f in categorical_fields}
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.ids)
+
+    @property
+    def fields(self) -> List[str]:
+        """Return the names of all columns."""
+        return [*self.__numeric, *self.__timestamps, *self.__categorical]
+
+    def append_rows(self, rows: Sequence[dict]) -> None:
+        """Append decoded raw incident rows, e.g. the `data` of a page."""
+        self.ids.extend([row["id"] for row in rows])
+        for name, column in self.__numeric.items():
+            column.extend([NAN if (v := row.get(name)) is None else v for row in rows])
+        for name, column in self.__timestamps.items():
+            parsed = utils.parse_pd_datetime_formats([row.get(name) for row in rows])
+            column.extend(
+                [NAN if dt is None else utils.to_timestamp(dt) for dt in parsed]
+            )
+        for name, categorical in self.__categorical.items():
+            categorical.extend([row.get(name) for row in rows])
+
+    def append_incidents(self, incidents: Sequence[Any]) -> None:
+        """Append RawIncidentData rows."""
+        self.ids.extend([i.id for i in incidents])
+        for name, column in self.__numeric.items():
+            column.extend(
+                [NAN if (v := getattr(i, name)) is None else v for i in incidents]
+            )
+        for name, column in self.__timestamps.items():
+            column.extend(
+                [
+                    NAN if (dt := getattr(i, name)) is None else utils.to_timestamp(dt)
+                    for i in incidents
+                ]
+            )
+        for name, categorical in self.__categorical.items():
+            categorical.extend([getattr(i, name) for i in incidents])
+
+    def extend(self, other: "RawIncidentColumns") -> None:
+        """Append the rows of other columns with the same fields."""
+        if other.fields != self.fields:
+            raise ValueError("columns must have the same fields")
+        self.ids.extend(other.ids)
+        for name, column in {**self.__numeric, **self.__timestamps}.items():
+            column.extend(other.__column(name))
+        for name, categorical in self.__categorical.items():
+            categorical.extend(other.categorical(name).to_list())
+
+    def __column(self, name: str) -> array:
+        column = self.__numeric.get(name)
+        return self.__timestamps[name] if column is None else column
+
+    def __getitem__(self, name: str) -> Any:
+        """Return a column by field name."""
+        if name in self.__categorical:
+            return self.__categorical[name]
+        column = self.__column(name)
+        if np is not None:
+            return np.array(column, dtype=np.float64)
+        return array("d", column)
+
+    def categorical(self, name: str) -> CategoricalColumn:
+        """Return a dictionary-encoded column."""
+        return self.__categorical[name]
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Return the stored fields as row dicts, nulls being None.
+
+        Timestamps are returned as POSIX timestamps.
+        """
+        rows: List[Dict[str, Any]] = [{"id": i} for i in self.ids]
+        for name, column in {**self.__numeric, **self.__timestamps}.items():
+            for row, value in zip(rows, column):
+                row[name] = None if value != value else value
+        for name, categorical in self.__categorical.items():
+            for row, category in zip(rows, categorical.to_list()):
+                row[name] = category
+        return rows
@@ -0,0 +1,81 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Lazily materialized response rows."""
+from __future__ import annotations
+
+from typing import Any, Callable, Iterator, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+_MISSING: Any = object()
+
+
+class LazyRows(Sequence[T]):
+    """Read-only sequence building row models on first access.
+
+    Keeps the decoded JSON rows and only runs `factory` on the rows that are
+    indexed or iterated. Built rows are kept, so each row is built once.
+    """
+
+    __slots__ = ("__raw", "__factory", "__rows")
+
+    def __init__(self, raw: List[dict], factory: Callable[[dict], T]) -> None:
+        """Initialize the lazy rows.
+
+        Args:
+            raw (list[dict]): Decoded JSON rows.
+            factory (Callable[[dict], T]): Builds a model from a row.
+        """
+        self.__raw = raw
+        self.__factory = factory
+        self.__rows: List[T] = [_MISSING] * len(raw)
+
+    @property
+    def raw(self) -> List[dict]:
+        """Return the decoded JSON rows."""
+        return self.__raw
+
+    @property
+    def materialized(self) -> int:
+        """Return the number of rows built so far."""
+        return sum(1 for row in self.__rows if row is not _MISSING)
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.__raw)
+
+    def __getitem__(self, i: Any) -> Any:
+        """Return the row(s) at an index or slice, building them if needed."""
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        row = self.__rows[i]
+        if row is _MISSING:
+            row = self.__rows[i] = self.__factory(self.__raw[i])
+        return row
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over the rows, building them as they are reached."""
+        for i in range(len(self.__raw)):
+            yield self[i]
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the rows with another sequence."""
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        """Return a representation that does not build the rows."""
+        return f"LazyRows({len(self)} rows, {self.materialized} built)"
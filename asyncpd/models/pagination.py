@@ -15,7 +15,10 @@
 """Base pagination models."""
 from __future__ import annotations
 
+import asyncio
+from collections import deque
 from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Deque, Iterable, TypeVar
 
 
 @dataclass
@@ -35,3 +38,69 @@ class ClassicPaginationResult:
     offset: int = 0
     more: bool = False
     total: int | None = None
+
+
+T = TypeVar("T")
+P = TypeVar("P", bound=ClassicPaginationResult)
+
+
+async def iter_classic_pagination(
+    fetch: Callable[[ClassicPaginationQuery], Awaitable[P]],
+    items: Callable[[P], Iterable[T]],
+    limit: int = 25,
+    concurrency: int = 4,
+) -> AsyncIterator[T]:
+    """Iterate over every item of a classic-paginated resource.
+
+    The first page is requested with `total=true`. When the API reports the
+    total, the remaining pages are fetched concurrently with at most
+    `concurrency` requests in flight, and items are still yielded in order.
+    When the total is unknown, pages are followed one at a time using `more`.
+
+    Args:
+        fetch (Callable): Coroutine function fetching a page for a query.
+        items (Callable): Extracts the items from a page.
+        limit (int): Page size.
+        concurrency (int): Maximum number of pages fetched concurrently.
+
+    Returns:
+        AsyncIterator of page items.
+    """
+    async for page in _iter_classic_pages(fetch, limit, concurrency):
+        for item in items(page):
+            yield item
+
+
+async def _iter_classic_pages(
+    fetch: Callable[[ClassicPaginationQuery], Awaitable[P]],
+    limit: int,
+    concurrency: int,
+) -> AsyncIterator[P]:
+    """Yield classic pagination pages in offset order."""
+    page = await fetch(ClassicPaginationQuery(limit=limit, offset=0, total=True))
+    yield page
+
+    page_size = page.limit or limit
+    if page.more and page.total is not None and concurrency > 1:
+        offsets = range(page.offset + page_size, page.total, page_size)
+        window: Deque[asyncio.Future[P]] = deque()
+        try:
+            for offset in offsets:
+                query = ClassicPaginationQuery(limit=page_size, offset=offset)
+                window.append(asyncio.ensure_future(fetch(query)))
+                if len(window) >= concurrency:
+                    page = await window.popleft()
+                    yield page
+            while window:
+                page = await window.popleft()
+                yield page
+        finally:
+            for task in window:
+                task.cancel()
+
+    # Unknown totals, or resources that grew while being paginated.
+    while page.more:
+        page = await fetch(
+            ClassicPaginationQuery(limit=page_size, offset=page.offset + page_size)
+        )
+        yield page
@@ -18,7 +18,10 @@
 
 from dataclasses import dataclass
 
+from asyncpd import utils
 
+
+@utils.slotted
 @dataclass
 class ServiceReference:
     """Reference to a service."""
@@ -0,0 +1,246 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Time-window sharding for cursor paginated resources."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, List, Set, Tuple
+
+from asyncpd import utils
+
+PageWalker = Callable[[datetime, datetime], AsyncGenerator[dict, None]]
+"""Walks the cursor of a single time window, yielding decoded pages."""
+
+
+def split_time_range(
+    start: datetime, end: datetime, n: int
+) -> list[tuple[datetime, datetime]]:
+    """Split the half-open range [start, end) into `n` equal windows.
+
+    Args:
+        start (datetime): Range start.
+        end (datetime): Range end.
+        n (int): Number of windows.
+
+    Returns:
+        list[tuple[datetime, datetime]]
+
+    Raises:
+        ValueError
+            when the range is empty or `n` is not positive.
+    """
+    if n < 1:
+        raise ValueError("n must be a positive integer")
+    if end <= start:
+        raise ValueError("end must be after start")
+    step = (end - start) / n
+    bounds = [start + step * i for i in range(n)] + [end]
+    return list(zip(bounds, bounds[1:]))
+
+
+@dataclass
+class _Window:
+    """A time window walked by its own producer task."""
+
+    start: datetime
+    end: datetime
+    queue: asyncio.Queue
+    skip_ids: Set[str] = field(default_factory=set)
+
+
+class ShardedWalk:
+    """Walks several time windows concurrently and merges their rows.
+
+    Rows are merged back into `order_by`/`order`. When ordering by
+    `created_at`, windows are disjoint and simply concatenated, which also
+    allows a window that is still paging after `split_after_pages` pages to
+    hand its unread remainder over to two new, concurrently walked windows.
+
+    Each window buffers at most `max_pending_pages` pages ahead of the
+    consumer, so fetching slows down to the pace rows are read at. Windows
+    only take one of the `concurrency` slots while fetching a page.
+    """
+
+    def __init__(
+        self,
+        walk: PageWalker,
+        order: str = "desc",
+        order_by: str = "created_at",
+        split_after_pages: int | None = None,
+        min_window: timedelta = timedelta(minutes=1),
+        concurrency: int = 4,
+        max_pending_pages: int = 4,
+    ) -> None:
+        """Initialize the sharded walk.
+
+        Args:
+            walk (PageWalker): Walks the cursor of one window.
+            order (str): Sort direction, 'asc' or 'desc'.
+            order_by (str): Row key the results are sorted by.
+            split_after_pages (int | None): Pages read before a window splits.
+            min_window (timedelta): Windows smaller than this never split.
+            concurrency (int): Maximum number of pages fetched at once.
+            max_pending_pages (int): Pages a window fetches ahead of the
+                consumer.
+        """
+        self.__walk = walk
+        self.__descending = order == "desc"
+        self.__order_by = order_by
+        self.__split_after_pages = (
+            split_after_pages if order_by == "created_at" else None
+        )
+        self.__min_window = min_window
+        self.__semaphore = asyncio.Semaphore(concurrency)
+        self.__max_pending_pages = max_pending_pages
+        self.__tasks: List[asyncio.Task] = []
+
+    async def iter_rows(
+        self, windows: list[tuple[datetime, datetime]]
+    ) -> AsyncGenerator[dict, None]:
+        """Walk the windows and yield their rows in the requested order."""
+        shards = [self.__window(start, end) for start, end in windows]
+        shards.sort(key=lambda w: w.start, reverse=self.__descending)
+        for shard in shards:
+            self.__spawn(shard)
+        try:
+            if self.__order_by == "created_at":
+                for shard in shards:
+                    async for row in self.__drain(shard):
+                        yield row
+            else:
+                async for row in self.__merge([self.__drain(s) for s in shards]):
+                    yield row
+        finally:
+            for task in self.__tasks:
+                task.cancel()
+
+    def __window(self, start: datetime, end: datetime) -> _Window:
+        return _Window(start, end, asyncio.Queue(self.__max_pending_pages))
+
+    def __spawn(self, window: _Window) -> None:
+        self.__tasks.append(asyncio.ensure_future(self.__produce(window)))
+
+    async def __produce(self, window: _Window) -> None:
+        try:
+            await self.__walk_window(window)
+        except Exception as e:
+            await window.queue.put(("error", e))
+        else:
+            await window.queue.put(("done", None))
+
+    async def __walk_window(self, window: _Window) -> None:
+        pages = self.__walk(window.start, window.end)
+        edge: Any = None
+        edge_ids: Set[str] = set()
+        try:
+            count = 0
+            while True:
+                # The slot is released while waiting for the consumer, so
+                # windows it reads first are never starved by full ones.
+                async with self.__semaphore:
+                    try:
+                        page = await pages.__anext__()
+                    except StopAsyncIteration:
+                        break
+                rows = [r for r in page["data"] if r["id"] not in window.skip_ids]
+                for row in rows:
+                    if row["created_at"] != edge:
+                        edge, edge_ids = row["created_at"], set()
+                    edge_ids.add(row["id"])
+                await window.queue.put(("rows", rows))
+                count += 1
+                if not (page.get("more") and edge is not None):
+                    continue
+                if self.__split_after_pages and count >= self.__split_after_pages:
+                    children = self.__split(window, edge, edge_ids)
+                    if children:
+                        await window.queue.put(("split", children))
+                        return
+        finally:
+            await pages.aclose()
+
+    def __split(
+        self, window: _Window, edge: str, edge_ids: Set[str]
+    ) -> list[_Window] | None:
+        """Hand the unread part of a window over to two new windows."""
+        # Row timestamps are parsed as naive UTC, aware bounds are converted
+        # to their time zone so the boundary stays the same instant.
+        boundary = utils.parse_pd_datetime_format(edge)
+        if window.start.tzinfo is not None:
+            boundary = boundary.replace(tzinfo=timezone.utc).astimezone(
+                window.start.tzinfo
+            )
+        if self.__descending:
+            start = window.start
+            end = min(boundary + timedelta(seconds=1), window.end)
+        else:
+            start, end = boundary, window.end
+        if end - start < self.__min_window:
+            return None
+        children = [self.__window(s, e) for s, e in split_time_range(start, end, 2)]
+        if self.__descending:
+            children.reverse()
+        # The first child resumes at the boundary timestamp, whose rows may
+        # already have been yielded by the parent window.
+        children[0].skip_ids = edge_ids
+        for child in children:
+            self.__spawn(child)
+        return children
+
+    async def __drain(self, window: _Window) -> AsyncIterator[dict]:
+        while True:
+            kind, value = await window.queue.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            if kind == "split":
+                for child in value:
+                    async for row in self.__drain(child):
+                        yield row
+                continue
+            for row in value:
+                yield row
+
+    async def __merge(self, streams: list[AsyncIterator[dict]]) -> AsyncIterator[dict]:
+        """Merge already sorted streams into a single sorted stream."""
+        heads: List[Tuple[Any, dict, AsyncIterator[dict]]] = []
+        for stream in streams:
+            await self.__advance(heads, stream)
+        while heads:
+            pick = max if self.__descending else min
+            head = pick(heads, key=lambda h: h[0])
+            heads.remove(head)
+            yield head[1]
+            await self.__advance(heads, head[2])
+
+    async def __advance(
+        self,
+        heads: List[Tuple[Any, dict, AsyncIterator[dict]]],
+        stream: AsyncIterator[dict],
+    ) -> None:
+        try:
+            row = await stream.__anext__()
+        except StopAsyncIteration:
+            return
+        value = row.get(self.__order_by)
+        # Null values sort last regardless of the direction.
+        if value is None:
+            key: tuple = (-1, 0) if self.__descending else (1, 0)
+        else:
+            key = (0, value)
+        heads.append((key, row, stream))
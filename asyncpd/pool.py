@@ -0,0 +1,310 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pool of API clients sharding load across API tokens."""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import zlib
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Mapping,
+    cast,
+)
+
+import httpx
+
+from asyncpd.bulk import BulkResult, bind, bulk
+from asyncpd.cache import ResponseCache
+from asyncpd.client import APIClient, request_key
+from asyncpd.concurrency import Items
+from asyncpd.models.abilities import AbilitiesAPI
+from asyncpd.models.addons import AddonsAPI
+from asyncpd.models.analytics import AnalyticsAPI
+from asyncpd.ratelimit import RateLimiter
+from asyncpd.singleflight import SingleFlight
+
+
+class ClientPool:
+    """Routes requests over several APIClients, one per API token.
+
+    Each client keeps its own connection pool and rate limiter, so the
+    available rate budget grows with the number of tokens. Requests go to
+    the least-loaded client: the one with the fewest requests in flight
+    relative to the tokens left in its bucket for the endpoint. Calls that
+    must stay on one account can be routed with a `route_key`.
+
+    The pool exposes the same resources as APIClient, e.g.
+    `await pool.addons.get("P1")`.
+    """
+
+    def __init__(
+        self,
+        clients: Mapping[str, APIClient] | Iterable[APIClient],
+        coalesce: bool = True,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            clients (Mapping[str, APIClient] | Iterable[APIClient]): Clients,
+                optionally keyed by a name used for sticky routing.
+            coalesce (bool): Share one in-flight request among identical
+                unrouted GET requests, across clients.
+        """
+        if not isinstance(clients, Mapping):
+            clients = {str(i): c for i, c in enumerate(clients)}
+        if not clients:
+            raise ValueError("a client pool needs at least one client")
+        self.__clients: Dict[str, APIClient] = dict(clients)
+        self.__names = list(self.__clients)
+        self.__in_flight = {name: 0 for name in self.__names}
+        self.__turn = itertools.count()
+        self.coalesce = coalesce
+        self.__in_flight_gets: SingleFlight[httpx.Response] = SingleFlight()
+        self.__abilities = AbilitiesAPI(cast(APIClient, self))
+
+    @classmethod
+    def from_tokens(
+        cls,
+        tokens: Mapping[str, str] | Iterable[str],
+        rate_limiter_factory: Callable[[], RateLimiter] | None = None,
+        cache_factory: Callable[[], ResponseCache] | None = None,
+        **kwargs: Any,
+    ) -> "ClientPool":
+        """Create a pool with one APIClient per token.
+
+        Rate limiters and caches hold per-token state, so each client gets
+        its own from a factory rather than sharing one instance. Other
+        arguments, e.g. `transport`, are passed as they are to every client.
+
+        Args:
+            tokens (Mapping[str, str] | Iterable[str]): API tokens, optionally
+                keyed by account name.
+            rate_limiter_factory (Callable[[], RateLimiter] | None): Creates
+                the rate limiter of each client, e.g. `RateLimiter.unlimited`.
+                Defaults to APIClient's limiter.
+            cache_factory (Callable[[], ResponseCache] | None): Creates the
+                response cache of each client, none by default.
+            **kwargs: Keyword arguments passed to every APIClient. The pool
+                coalesces requests unless `coalesce` is False.
+
+        Returns:
+            ClientPool
+
+        Raises:
+            ValueError: A `rate_limiter` or `cache` instance is given, which
+                would be shared by every token.
+        """
+        for name in ("rate_limiter", "cache"):
+            if name in kwargs:
+                raise ValueError(
+                    f"{name} would be shared by every token, "
+                    f"pass {name}_factory instead"
+                )
+
+        def client(token: str) -> APIClient:
+            return APIClient(
+                token,
+                rate_limiter=rate_limiter_factory and rate_limiter_factory(),
+                cache=cache_factory and cache_factory(),
+                **kwargs,
+            )
+
+        coalesce = kwargs.get("coalesce", True)
+        if isinstance(tokens, Mapping):
+            return cls({n: client(t) for n, t in tokens.items()}, coalesce)
+        return cls([client(t) for t in tokens], coalesce)
+
+    def __len__(self) -> int:
+        """Return the number of clients in the pool."""
+        return len(self.__clients)
+
+    def __getitem__(self, name: str) -> APIClient:
+        """Return the client registered under a name."""
+        return self.__clients[name]
+
+    def in_flight(self, name: str) -> int:
+        """Return the number of requests in flight for a client."""
+        return self.__in_flight[name]
+
+    def route(self, route_key: str) -> str:
+        """Return the name of the client a route key sticks to.
+
+        Keys naming a client route to it, other keys are hashed so that the
+        same key always routes to the same client.
+        """
+        if route_key in self.__clients:
+            return route_key
+        return self.__names[zlib.crc32(route_key.encode()) % len(self.__names)]
+
+    def client_for(self, route_key: str) -> APIClient:
+        """Return the client a route key sticks to."""
+        return self.__clients[self.route(route_key)]
+
+    def __least_loaded(self, endpoint: str) -> str:
+        turn = next(self.__turn)
+        n = len(self.__names)
+
+        def load(i: int) -> tuple:
+            name = self.__names[i]
+            tokens = self.__clients[name].rate_limiter.bucket_for(endpoint).tokens
+            in_flight = self.__in_flight[name]
+            # Rotate ties so that idle clients share the load evenly.
+            return (in_flight - tokens, in_flight, (i - turn) % n)
+
+        return self.__names[min(range(n), key=load)]
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        headers: dict[str, str] | None = None,
+        data: dict | None = None,
+        params: list[tuple[str, Any]] | None = None,
+        idempotent: bool | None = None,
+        route_key: str | None = None,
+    ) -> httpx.Response:
+        """Execute a request on the least-loaded or the sticky client.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): API endpoint.
+            headers (dict[str, str] | None): Request headers.
+            data (dict | None): JSON request body.
+            params (list[tuple[str, Any]] | None): Query parameters.
+            idempotent (bool | None): Overrides the retry policy's decision.
+            route_key (str | None): Sticky routing key.
+
+        Returns:
+            httpx.Response
+        """
+        if self.coalesce and method == "GET" and data is None and route_key is None:
+            # Identical GETs routed to different tokens are coalesced too.
+            return await self.__in_flight_gets.do(
+                request_key(method, endpoint, headers, params),
+                lambda: self.__send(
+                    self.__least_loaded(endpoint),
+                    method,
+                    endpoint,
+                    headers,
+                    params,
+                    data,
+                    idempotent,
+                ),
+            )
+        if route_key is not None:
+            name = self.route(route_key)
+        else:
+            name = self.__least_loaded(endpoint)
+        return await self.__send(
+            name, method, endpoint, headers, params, data, idempotent
+        )
+
+    async def __send(
+        self,
+        name: str,
+        method: str,
+        endpoint: str,
+        headers: dict[str, str] | None,
+        params: list[tuple[str, Any]] | None,
+        data: dict | None = None,
+        idempotent: bool | None = None,
+    ) -> httpx.Response:
+        self.__in_flight[name] += 1
+        try:
+            return await self.__clients[name].request(
+                method, endpoint, headers, data, params, idempotent=idempotent
+            )
+        finally:
+            self.__in_flight[name] -= 1
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        endpoint: str,
+        headers: dict[str, str] | None = None,
+        data: dict | None = None,
+        params: list[tuple[str, Any]] | None = None,
+        idempotent: bool | None = None,
+        route_key: str | None = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """Execute a streamed request on the least-loaded or the sticky client.
+
+        The request counts as in flight until the context exits.
+        """
+        if route_key is not None:
+            name = self.route(route_key)
+        else:
+            name = self.__least_loaded(endpoint)
+        self.__in_flight[name] += 1
+        try:
+            async with self.__clients[name].stream(
+                method, endpoint, headers, data, params, idempotent=idempotent
+            ) as res:
+                yield res
+        finally:
+            self.__in_flight[name] -= 1
+
+    def decode(self, res: httpx.Response) -> Any:
+        """Decode the JSON body of a response with the first client's decoder."""
+        return self.__clients[self.__names[0]].decode(res)
+
+    def bulk(
+        self,
+        fn: Callable[..., Awaitable[Any]],
+        items: Items[Any],
+        concurrency: int = 8,
+        ordered: bool = True,
+        unpack: bool = False,
+    ) -> AsyncGenerator[BulkResult, None]:
+        """Call a resource method on many items, spread over the pool.
+
+        See `APIClient.bulk`; unbound resource methods are bound to the
+        pool's resources, so the calls are routed like any pool request.
+        """
+        return bulk(bind(fn, self), items, concurrency, ordered, unpack)
+
+    def invalidate(self, prefix: str | None = None) -> None:
+        """Drop cached responses of every client of the pool."""
+        for client in self.__clients.values():
+            client.invalidate(prefix)
+
+    async def aclose(self) -> None:
+        """Stop the abilities refresh and close every client of the pool."""
+        await self.__abilities.stop_background_refresh()
+        await asyncio.gather(*(c.aclose() for c in self.__clients.values()))
+
+    @property
+    def abilities(self) -> AbilitiesAPI:
+        """Return the AbilitiesAPI resource routed over the pool."""
+        return self.__abilities
+
+    @property
+    def addons(self) -> AddonsAPI:
+        """Return an AddonsAPI resource routed over the pool."""
+        return AddonsAPI(cast(APIClient, self))
+
+    @property
+    def analytics(self) -> AnalyticsAPI:
+        """Return an AnalyticsAPI resource routed over the pool."""
+        return AnalyticsAPI(cast(APIClient, self))
@@ -0,0 +1,198 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Client-side rate limiting."""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+
+class TokenBucket:
+    """Asyncio token bucket.
+
+    Waiters are served in FIFO order. The refill rate can be tuned while the
+    bucket is in use, and the bucket can be paused until a deadline, e.g. when
+    the API asks to retry after some time.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """Initialize the token bucket.
+
+        Args:
+            rate (float): Tokens added per second, `math.inf` disables pacing.
+            capacity (float | None): Maximum burst size, defaults to `rate`.
+        """
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = max(1.0, capacity if capacity is not None else rate)
+        self.__tokens = self.capacity
+        self.__updated = time.monotonic()
+        self.__paused_until = 0.0
+        self.__lock: asyncio.Lock | None = None
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of tokens currently available."""
+        self.__refill()
+        return self.__tokens
+
+    def __refill(self) -> None:
+        now = time.monotonic()
+        if math.isinf(self.rate):
+            self.__tokens = self.capacity
+        else:
+            elapsed = now - self.__updated
+            self.__tokens = min(self.capacity, self.__tokens + elapsed * self.rate)
+        self.__updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        if math.isinf(self.rate) and self.__paused_until <= time.monotonic():
+            return
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+        async with self.__lock:
+            while True:
+                self.__refill()
+                now = time.monotonic()
+                if self.__paused_until > now:
+                    await asyncio.sleep(self.__paused_until - now)
+                    continue
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.__tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for the given number of seconds."""
+        self.__refill()
+        self.__tokens = 0.0
+        self.__paused_until = max(self.__paused_until, time.monotonic() + seconds)
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate, bounded by the configured base rate."""
+        self.__refill()
+        self.rate = max(min(rate, self.base_rate), 0.01)
+
+    def limit_tokens(self, tokens: float) -> None:
+        """Lower the available tokens to what the server reports as left."""
+        self.__refill()
+        self.__tokens = min(self.__tokens, tokens)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a `Retry-After` header value into seconds.
+
+    Args:
+        value (str | None): Header value, in seconds or as an HTTP date.
+
+    Returns:
+        float | None
+            None when the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RateLimiter:
+    """Rate limiter shared by all resources of an APIClient.
+
+    The REST API and the analytics early-access endpoints are paced by
+    separate token buckets. Each bucket is tuned from the `ratelimit-*` and
+    `Retry-After` response headers: the remaining budget is spread over the
+    time left in the current window, and a 429 pauses the bucket and halves
+    its rate until later responses allow it to recover.
+    """
+
+    def __init__(
+        self,
+        rest: TokenBucket | None = None,
+        analytics: TokenBucket | None = None,
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            rest (TokenBucket | None): Bucket for REST API endpoints.
+            analytics (TokenBucket | None): Bucket for analytics endpoints.
+        """
+        # PagerDuty allows 960 REST API requests per minute per token.
+        self.rest = rest or TokenBucket(rate=16, capacity=16)
+        self.analytics = analytics or TokenBucket(rate=4, capacity=4)
+
+    @classmethod
+    def unlimited(cls) -> "RateLimiter":
+        """Return a rate limiter that only honors `Retry-After`."""
+        return cls(TokenBucket(math.inf), TokenBucket(math.inf))
+
+    def bucket_for(self, endpoint: str) -> TokenBucket:
+        """Return the token bucket pacing the given endpoint."""
+        if endpoint.startswith("/analytics"):
+            return self.analytics
+        return self.rest
+
+    async def acquire(self, endpoint: str) -> None:
+        """Wait for permission to call the given endpoint."""
+        await self.bucket_for(endpoint).acquire()
+
+    def observe(self, endpoint: str, response: httpx.Response) -> None:
+        """Tune the bucket of an endpoint from a response's headers."""
+        bucket = self.bucket_for(endpoint)
+        headers = response.headers
+        retry_after = parse_retry_after(headers.get("retry-after"))
+        reset = _parse_float(headers.get("ratelimit-reset"))
+        remaining = _parse_float(headers.get("ratelimit-remaining"))
+
+        if response.status_code == 429:
+            wait = retry_after if retry_after is not None else reset
+            bucket.pause(wait if wait is not None else 1.0)
+            bucket.set_rate(bucket.rate / 2)
+            return
+
+        if retry_after is not None:
+            bucket.pause(retry_after)
+
+        if remaining is None or reset is None:
+            # Additive recovery towards the configured rate.
+            if not math.isinf(bucket.base_rate):
+                bucket.set_rate(bucket.rate + bucket.base_rate * 0.05)
+            return
+
+        bucket.limit_tokens(remaining)
+        if remaining < 1:
+            bucket.pause(reset)
+        elif reset > 0:
+            bucket.set_rate(remaining / reset)
+
+
+def _parse_float(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
@@ -0,0 +1,90 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Retry policy for transient API errors."""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import FrozenSet, Tuple
+
+import httpx
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with jitter for transient errors.
+
+    Only idempotent requests are retried on error responses or dropped
+    connections: the methods in `retry_methods`, plus POSTs to endpoints
+    starting with one of `safe_post_prefixes` (the analytics queries only
+    read data). Connection failures happen before anything is sent, so they
+    are retried for every method.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    jitter: float = 1.0
+    respect_retry_after: bool = True
+    retry_statuses: FrozenSet[int] = frozenset({429, 502, 503, 504})
+    retry_methods: FrozenSet[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+    safe_post_prefixes: Tuple[str, ...] = ("/analytics/",)
+
+    @classmethod
+    def disabled(cls) -> "RetryPolicy":
+        """Return a policy that never retries."""
+        return cls(max_attempts=1)
+
+    def is_idempotent(self, method: str, endpoint: str) -> bool:
+        """Indicates if a request can safely be sent more than once."""
+        if method in self.retry_methods:
+            return True
+        return method == "POST" and endpoint.startswith(self.safe_post_prefixes)
+
+    def should_retry_response(
+        self, response: httpx.Response, attempt: int, idempotent: bool
+    ) -> bool:
+        """Indicates if the request should be retried after this response."""
+        return (
+            idempotent
+            and attempt < self.max_attempts
+            and response.status_code in self.retry_statuses
+        )
+
+    def should_retry_error(
+        self, error: httpx.TransportError, attempt: int, idempotent: bool
+    ) -> bool:
+        """Indicates if the request should be retried after this error."""
+        if attempt >= self.max_attempts:
+            return False
+        if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+            return True
+        return idempotent
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Return the delay in seconds before the next attempt.
+
+        Args:
+            attempt (int): The attempt that just failed, starting at 1.
+            retry_after (float | None): Delay requested by the server.
+
+        Returns:
+            float
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+        if self.respect_retry_after and retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
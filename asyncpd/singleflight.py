@@ -0,0 +1,63 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Coalescing of identical in-flight calls."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Shares the result of a call among concurrent callers with the same key.
+
+    While a call for a key is in flight, later callers wait for it instead of
+    starting their own. Once it completes the key is forgotten, so results
+    are never served after the fact. Cancelling one waiter does not cancel
+    the shared call for the others.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the single-flight group."""
+        self.__calls: Dict[Hashable, asyncio.Future[T]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self.__calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn`, or join the in-flight call for `key`.
+
+        Args:
+            key (Hashable): Identifies identical calls.
+            fn (Callable[[], Awaitable[T]]): Starts the call.
+
+        Returns:
+            The result of the shared call.
+        """
+        future = self.__calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self.__calls[key] = future
+            future.add_done_callback(lambda f: self.__forget(key, f))
+        return await asyncio.shield(future)
+
+    def __forget(self, key: Hashable, future: asyncio.Future[Any]) -> None:
+        if self.__calls.get(key) is future:
+            del self.__calls[key]
+        if not future.cancelled():
+            # Mark the error as retrieved when every waiter went away.
+            future.exception()
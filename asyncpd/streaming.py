@@ -0,0 +1,184 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental parsing of JSON response bodies."""
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, AsyncGenerator, Dict, List
+
+import httpx
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = frozenset(" \t\n\r,:]}")
+
+_START, _KEY, _COLON, _VALUE, _ITEMS, _DONE = range(6)
+
+_INCOMPLETE: Any = object()
+
+
+class JSONArrayStream:
+    """Incremental parser for the array held by one key of a JSON object.
+
+    Feed it the body chunk by chunk, and it returns the array elements as
+    soon as they are complete, so only the element being received is held
+    in memory. The other keys of the object are collected in `metadata`,
+    with the streamed key mapped to an empty list.
+
+    Elements are decoded by the C scanner of the `json` module, since the
+    faster decoders cannot decode partial input.
+    """
+
+    def __init__(self, key: str) -> None:
+        """Initialize the parser.
+
+        Args:
+            key (str): Top-level key of the array to stream, e.g. 'data'.
+        """
+        self.key = key
+        self.metadata: Dict[str, Any] = {}
+        self.__decoder = json.JSONDecoder()
+        self.__text = codecs.getincrementaldecoder("utf-8")()
+        self.__buf = ""
+        self.__pos = 0
+        self.__state = _START
+        self.__current_key = ""
+
+    @property
+    def done(self) -> bool:
+        """Return whether the whole object has been parsed."""
+        return self.__state == _DONE
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Parse a chunk of the body.
+
+        Args:
+            chunk (bytes): Next bytes of the body.
+
+        Returns:
+            list: Array elements completed by this chunk.
+
+        Raises:
+            ValueError: The body is not a JSON object.
+        """
+        self.__append(self.__text.decode(chunk))
+        return self.__parse(final=False)
+
+    def close(self) -> Dict[str, Any]:
+        """Finish parsing once the whole body has been fed.
+
+        Returns:
+            dict: The other keys of the object.
+
+        Raises:
+            ValueError: The body is truncated or is not a JSON object.
+        """
+        self.__append(self.__text.decode(b"", True))
+        rows = self.__parse(final=True)
+        if rows or not self.done:
+            raise ValueError("truncated JSON body")
+        return self.metadata
+
+    def __append(self, text: str) -> None:
+        """Drop the consumed input and append new text."""
+        pos, self.__pos = self.__pos, 0
+        self.__buf = self.__buf[pos:] + text
+
+    def __parse(self, final: bool) -> List[Any]:
+        rows: List[Any] = []
+        buf = self.__buf
+        while True:
+            self.__pos = _WHITESPACE.match(buf, self.__pos).end()  # type: ignore
+            if self.__pos >= len(buf) or not self.__step(buf, rows, final):
+                return rows
+
+    def __step(self, buf: str, rows: List[Any], final: bool) -> bool:
+        """Consume one token, returning False when more input is needed."""
+        c = buf[self.__pos]
+        state = self.__state
+        if state == _DONE:
+            raise ValueError("extra data after the JSON object")
+        if state == _START:
+            self.__expect(c, "{", _KEY)
+        elif state in (_KEY, _ITEMS) and c in ",}]":
+            self.__close_or_continue(c)
+        elif state == _COLON:
+            self.__expect(c, ":", _VALUE)
+        elif state == _VALUE and c == "[" and self.__current_key == self.key:
+            self.metadata[self.key] = []
+            self.__expect(c, "[", _ITEMS)
+        else:
+            value = self.__decode(buf, final)
+            if value is _INCOMPLETE:
+                return False
+            if state == _KEY:
+                self.__current_key, self.__state = value, _COLON
+            elif state == _VALUE:
+                self.metadata[self.__current_key], self.__state = value, _KEY
+            else:
+                rows.append(value)
+        return True
+
+    def __close_or_continue(self, c: str) -> None:
+        """Consume a separator or the end of the object or streamed array."""
+        if c == ",":
+            self.__pos += 1
+        elif self.__state == _ITEMS:
+            self.__expect(c, "]", _KEY)
+        else:
+            self.__expect(c, "}", _DONE)
+
+    def __expect(self, c: str, token: str, state: int) -> None:
+        if c != token:
+            raise ValueError(f"expected {token!r} but found {c!r}")
+        self.__pos += 1
+        self.__state = state
+
+    def __decode(self, buf: str, final: bool) -> Any:
+        """Decode the value at the current position, if it is complete.
+
+        A value not followed by a delimiter may be a truncated number or
+        literal, e.g. `2` of `2.5`, so it waits for more input unless the
+        body has ended.
+        """
+        try:
+            value, end = self.__decoder.raw_decode(buf, self.__pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise ValueError(f"invalid JSON body: {e}") from e
+            return _INCOMPLETE
+        if not final and (end >= len(buf) or buf[end] not in _DELIMITERS):
+            return _INCOMPLETE
+        self.__pos = end
+        return value
+
+
+async def aiter_json_array(
+    res: httpx.Response, parser: JSONArrayStream
+) -> AsyncGenerator[Any, None]:
+    """Yield the array elements of a streamed response as they arrive.
+
+    Once the generator is exhausted, `parser.metadata` holds the other keys
+    of the body.
+
+    Args:
+        res (httpx.Response): Response opened with `APIClient.stream`.
+        parser (JSONArrayStream): Parser of the array to stream.
+    """
+    async for chunk in res.aiter_bytes():
+        for row in parser.feed(chunk):
+            yield row
+    parser.close()
@@ -0,0 +1,360 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental sync of raw incident analytics."""
+from __future__ import annotations
+
+import abc
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from typing import AsyncGenerator, Dict, List
+
+from asyncpd import utils
+from asyncpd.models.analytics import (
+    AnalyticsAPI,
+    AnalyticsRequestFilters,
+    RawIncidentData,
+)
+
+
+@dataclass
+class Watermark:
+    """Where the last sync of a stream of incidents stopped.
+
+    `created_at` is the end of the last completed sync window. While a sync
+    runs, its window and the cursor after the last processed page are kept
+    so that an interrupted sync resumes where it stopped. `fingerprints`
+    maps the ids of incidents still inside the lookback window to their
+    fingerprint and creation date, to tell changed incidents apart.
+    """
+
+    created_at: datetime | None = None
+    cursor: str | None = None
+    window_start: datetime | None = None
+    window_end: datetime | None = None
+    fingerprints: Dict[str, List[str]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        """Serialize to dict object."""
+        return {
+            "created_at": _isoformat(self.created_at),
+            "cursor": self.cursor,
+            "window_start": _isoformat(self.window_start),
+            "window_end": _isoformat(self.window_end),
+            "fingerprints": self.fingerprints,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Watermark":
+        """Serialize Watermark from a dict object."""
+        return Watermark(
+            created_at=_parse(data.get("created_at")),
+            cursor=data.get("cursor"),
+            window_start=_parse(data.get("window_start")),
+            window_end=_parse(data.get("window_end")),
+            fingerprints=data.get("fingerprints", {}),
+        )
+
+
+class CheckpointStore(abc.ABC):
+    """Persists watermarks by sync name.
+
+    Subclass it to keep watermarks elsewhere, e.g. in a shared database.
+    Methods may block, the sync calls them from a worker thread.
+    """
+
+    @abc.abstractmethod
+    def load(self, name: str) -> Watermark | None:
+        """Return the watermark saved under a name, if any."""
+
+    @abc.abstractmethod
+    def save(self, name: str, watermark: Watermark) -> None:
+        """Save a watermark under a name."""
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """Keeps watermarks in memory, for tests and one-off runs."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self.__watermarks: Dict[str, dict] = {}
+
+    def load(self, name: str) -> Watermark | None:
+        """Return the watermark saved under a name, if any."""
+        data = self.__watermarks.get(name)
+        return None if data is None else Watermark.from_dict(data)
+
+    def save(self, name: str, watermark: Watermark) -> None:
+        """Save a watermark under a name."""
+        self.__watermarks[name] = json.loads(json.dumps(watermark.to_dict()))
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Keeps watermarks in a JSON file, replaced atomically on save."""
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """Initialize the store.
+
+        Args:
+            path (str | os.PathLike): JSON file, created on first save.
+        """
+        self.path = os.fspath(path)
+
+    def __read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def load(self, name: str) -> Watermark | None:
+        """Return the watermark saved under a name, if any."""
+        data = self.__read().get(name)
+        return None if data is None else Watermark.from_dict(data)
+
+    def save(self, name: str, watermark: Watermark) -> None:
+        """Save a watermark under a name."""
+        data = self.__read()
+        data[name] = watermark.to_dict()
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Keeps watermarks in a SQLite database."""
+
+    def __init__(self, path: str | os.PathLike, table: str = "asyncpd_watermarks"):
+        """Initialize the store.
+
+        Args:
+            path (str | os.PathLike): Database file, created if needed.
+            table (str): Table holding the watermarks.
+
+        Raises:
+            ValueError: The table name is not a valid identifier.
+        """
+        if not table.isidentifier():
+            raise ValueError(f"invalid table name {table!r}")
+        self.path = os.fspath(path)
+        self.table = table
+        with closing(self.__connect()) as db, db:
+            db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(name TEXT PRIMARY KEY, watermark TEXT NOT NULL)"
+            )
+
+    def __connect(self) -> sqlite3.Connection:
+        # One connection per call, since calls come from worker threads.
+        return sqlite3.connect(self.path)
+
+    def load(self, name: str) -> Watermark | None:
+        """Return the watermark saved under a name, if any."""
+        with closing(self.__connect()) as db:
+            row = db.execute(
+                f"SELECT watermark FROM {self.table} WHERE name = ?", (name,)
+            ).fetchone()
+        return None if row is None else Watermark.from_dict(json.loads(row[0]))
+
+    def save(self, name: str, watermark: Watermark) -> None:
+        """Save a watermark under a name."""
+        with closing(self.__connect()) as db, db:
+            db.execute(
+                f"INSERT OR REPLACE INTO {self.table} (name, watermark) VALUES (?, ?)",
+                (name, json.dumps(watermark.to_dict())),
+            )
+
+
+@dataclass
+class SyncStats:
+    """Counts of the last sync run."""
+
+    fetched: int = 0
+    new: int = 0
+    changed: int = 0
+
+
+class IncrementalSync:
+    """Fetches only the raw incidents created or changed since the last run.
+
+    Each run reads the incidents created from the end of the previous run,
+    minus `lookback`, up to now, in ascending creation order. Incidents of
+    the lookback window are only yielded when they changed, e.g. were
+    resolved, since they were last seen. The watermark is checkpointed
+    every `checkpoint_every` pages and when the run is interrupted, so an
+    interrupted run resumes from the cursor of its last completed page,
+    and incidents are delivered at least once.
+
+    Timestamps are UTC; naive datetimes are taken as UTC.
+    """
+
+    def __init__(
+        self,
+        analytics: AnalyticsAPI,
+        store: CheckpointStore,
+        name: str = "raw_incidents",
+        filters: AnalyticsRequestFilters | None = None,
+        lookback: timedelta = timedelta(days=3),
+        limit: int = 1000,
+        checkpoint_every: int = 10,
+    ) -> None:
+        """Initialize the sync.
+
+        Args:
+            analytics (AnalyticsAPI): Analytics resource of a client or pool.
+            store (CheckpointStore): Persists the watermark.
+            name (str): Name of the watermark, one per filters.
+            filters (AnalyticsRequestFilters | None): Request filters, their
+                time range is set by the sync.
+            lookback (timedelta): Trailing window re-read for changes.
+            limit (int): Page size.
+            checkpoint_every (int): Pages between two checkpoints, each of
+                which rewrites the whole watermark.
+        """
+        self.analytics = analytics
+        self.store = store
+        self.name = name
+        self.filters = filters or AnalyticsRequestFilters()
+        self.lookback = lookback
+        self.limit = limit
+        self.checkpoint_every = checkpoint_every
+        self.stats = SyncStats()
+
+    async def watermark(self) -> Watermark | None:
+        """Return the saved watermark, if any."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.store.load, self.name)
+
+    async def __save(self, watermark: Watermark) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.store.save, self.name, watermark)
+
+    async def changes(
+        self, since: datetime | None = None, until: datetime | None = None
+    ) -> AsyncGenerator[RawIncidentData, None]:
+        """Yield the incidents created or changed since the last run.
+
+        Args:
+            since (datetime | None): Start of the first run, when no
+                watermark has been saved yet.
+            until (datetime | None): End of the run, defaults to now.
+
+        Raises:
+            ValueError: There is no watermark and `since` is not given.
+            httpx.HTTPStatusError
+        """
+        wm = await self.watermark() or Watermark()
+        if wm.cursor is None or wm.window_start is None or wm.window_end is None:
+            if wm.created_at is not None:
+                wm.window_start = wm.created_at - self.lookback
+            elif since is not None:
+                wm.window_start = _utc(since)
+            else:
+                raise ValueError("the first run needs a `since` datetime")
+            wm.window_end = _utc(until or datetime.now(timezone.utc))
+            wm.cursor = None
+
+        self.stats = SyncStats()
+        pages = self.analytics.iter_raw_incident_pages(
+            replace(
+                self.filters,
+                created_at_start=wm.window_start,
+                create_at_end=wm.window_end,
+            ),
+            self.limit,
+            "asc",
+            "created_at",
+            starting_after=wm.cursor,
+        )
+        unsaved = 0
+        completed = False
+        try:
+            async for page in pages:
+                seen: Dict[str, List[str]] = {}
+                for row in page["data"]:
+                    if self.__track(wm, seen, row):
+                        yield RawIncidentData.from_dict(row)
+                # Fingerprints are only recorded with the cursor of their
+                # page, so rows of an interrupted page are delivered again.
+                wm.fingerprints.update(seen)
+                wm.cursor = page.get("last") if page.get("more") else None
+                unsaved += 1
+                if wm.cursor is not None and unsaved >= self.checkpoint_every:
+                    await self.__save(wm)
+                    unsaved = 0
+            completed = True
+        finally:
+            await pages.aclose()
+            if not completed and unsaved:
+                await self.__save(wm)
+
+        wm.created_at, wm.cursor = wm.window_end, None
+        _prune(wm, wm.created_at - self.lookback)
+        await self.__save(wm)
+
+    def __track(self, wm: Watermark, seen: Dict[str, List[str]], row: dict) -> bool:
+        """Record the fingerprint of a row in `seen`, returning whether it is news."""
+        self.stats.fetched += 1
+        fp = fingerprint(row)
+        last = seen.get(row["id"]) or wm.fingerprints.get(row["id"])
+        if last is not None and last[0] == fp:
+            return False
+        if last is None:
+            self.stats.new += 1
+        else:
+            self.stats.changed += 1
+        seen[row["id"]] = [fp, row["created_at"]]
+        return True
+
+
+def fingerprint(row: dict) -> str:
+    """Return a digest of a raw incident row, changing with any field."""
+    data = json.dumps(row, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+
+def _prune(wm: Watermark, before: datetime) -> None:
+    """Forget the fingerprints of incidents created before a date."""
+    wm.fingerprints = {
+        id: seen
+        for id, seen in wm.fingerprints.items()
+        if utils.parse_pd_datetime_format(seen[1]) >= before
+    }
+
+
+def _utc(dt: datetime) -> datetime:
+    """Return a naive UTC datetime, as found in the API responses."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _isoformat(dt: datetime | None) -> str | None:
+    return None if dt is None else dt.isoformat()
+
+
+def _parse(ds: str | None) -> datetime | None:
+    return None if ds is None else datetime.fromisoformat(ds)
@@ -0,0 +1,623 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Fake PagerDuty API server for offline and load tests.
+
+FakePagerDuty is an ASGI application serving synthetic data on the endpoints
+asyncpd uses. Plug it into a client with `FakePagerDuty().client()` or
+`APIClient(token, transport=server.transport())`, or serve it over HTTP with
+any ASGI server, e.g. `uvicorn --factory asyncpd.testing:FakePagerDuty`.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import dataclasses
+import json
+import random
+import re
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Sequence, Tuple
+from urllib.parse import parse_qsl
+
+import httpx
+
+from asyncpd import utils
+from asyncpd.aggregate import LocalAggregator
+from asyncpd.client import APIClient
+from asyncpd.models.analytics import (
+    AggregatedMetrics,
+    AnalyticsRequestFilters,
+    RawIncidentData,
+)
+
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+Reply = Tuple[int, Any, Dict[str, str]]
+
+SERVICES = [(f"PS{i:05d}", f"Service {i}") for i in range(20)]
+TEAMS = [(f"PT{i:05d}", f"Team {i}") for i in range(5)]
+PRIORITIES = [("PP00001", "P1", 1), ("PP00002", "P2", 2), ("PP00003", "P3", 3)]
+USERS = [(f"PU{i:05d}", f"User {i}") for i in range(30)]
+
+_GROUP_BY = {"all": None, "services": "service", "teams": "team"}
+
+
+@dataclasses.dataclass
+class _Request:
+    method: str
+    path: str
+    params: Dict[str, str]
+    body: Any
+
+
+class FakePagerDuty:
+    """Stand-in for the PagerDuty REST API, as an ASGI application.
+
+    Serves `/abilities`, `/addons` with classic pagination and the
+    `/analytics` endpoints with cursor paging, over synthetic incidents,
+    addons and responses generated from `seed`. Aggregated metrics are
+    computed from the incidents with LocalAggregator. Timestamps are not
+    converted to the requested time zone.
+
+    Latency, random errors, scripted failures (see `fail_next`) and a
+    sliding-window rate limit answered with 429 and `Retry-After` can be
+    configured to exercise the client's retries and pacing. Every request
+    received is recorded in `requests`.
+    """
+
+    def __init__(
+        self,
+        incidents: int = 200,
+        addons: int = 60,
+        responses_per_incident: int = 3,
+        description_size: int = 48,
+        start: datetime = datetime(2023, 1, 1),
+        days: int = 30,
+        abilities: Sequence[str] = ("sso", "teams", "read_only_users"),
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        rate_limit: int | None = None,
+        rate_limit_window: float = 1.0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the server and generate its data.
+
+        Args:
+            incidents (int): Number of raw incidents.
+            addons (int): Number of addons.
+            responses_per_incident (int): Number of responses per incident.
+            description_size (int): Length of the incident descriptions, to
+                tune the payload size.
+            start (datetime): Creation date of the oldest incident, UTC.
+            days (int): Days over which the incidents are created.
+            abilities (Sequence[str]): Enabled abilities.
+            latency (float): Seconds each request takes.
+            error_rate (float): Probability of answering `error_status`.
+            error_status (int): Status of the random errors.
+            rate_limit (int | None): Requests allowed per window, unlimited
+                by default.
+            rate_limit_window (float): Window of the rate limit in seconds.
+                `Retry-After` is given with millisecond precision so short
+                windows keep tests fast.
+            seed (int): Seed of the generated data and random errors.
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.responses_per_incident = responses_per_incident
+        self.abilities = list(abilities)
+        self.requests: List[Tuple[str, str]] = []
+
+        self.__rng = random.Random(seed)
+        self.__failures: Deque[Tuple[int, float | None]] = deque()
+        self.__hits: Deque[float] = deque()
+        self.__next_addon = addons
+        self.addons: Dict[str, dict] = {
+            a["id"]: a for a in (_addon(i) for i in range(addons))
+        }
+        self.incidents = sorted(
+            (
+                _incident(self.__rng, i, start, days, description_size)
+                for i in range(incidents)
+            ),
+            key=lambda row: row["created_at"],
+        )
+        self.__by_id = {row["id"]: row for row in self.incidents}
+        self.__models = [RawIncidentData.from_dict(row) for row in self.incidents]
+        self.__aggregator = LocalAggregator(self.__models)
+        self.__routes = [
+            (method, re.compile(pattern), handler)
+            for method, pattern, handler in (
+                ("HEAD", "/", self.__ok),
+                ("GET", "/abilities", self.__list_abilities),
+                ("GET", "/abilities/([^/]+)", self.__test_ability),
+                ("GET", "/addons", self.__list_addons),
+                ("POST", "/addons", self.__install_addon),
+                ("GET", "/addons/([^/]+)", self.__get_addon),
+                ("PUT", "/addons/([^/]+)", self.__update_addon),
+                ("DELETE", "/addons/([^/]+)", self.__delete_addon),
+                (
+                    "POST",
+                    "/analytics/metrics/incidents/(all|services|teams)",
+                    self.__aggregate,
+                ),
+                ("POST", "/analytics/raw/incidents", self.__raw_incidents),
+                ("GET", "/analytics/raw/incidents/([^/]+)", self.__raw_incident),
+                (
+                    "GET",
+                    "/analytics/raw/incidents/([^/]+)/responses",
+                    self.__raw_responses,
+                ),
+            )
+        ]
+
+    def transport(self) -> httpx.ASGITransport:
+        """Return an httpx transport sending requests to this server."""
+        return httpx.ASGITransport(app=self)  # type: ignore[arg-type]
+
+    def client(self, token: str = "fake", **kwargs: Any) -> APIClient:
+        """Return an APIClient talking to this server.
+
+        Args:
+            token (str): API token.
+            **kwargs: Other APIClient arguments, e.g. `rate_limiter`.
+        """
+        return APIClient(token, transport=self.transport(), **kwargs)
+
+    def fail_next(
+        self, status: int = 500, times: int = 1, retry_after: float | None = None
+    ) -> None:
+        """Answer the next requests with an error.
+
+        Args:
+            status (int): Status of the errors.
+            times (int): Number of requests to fail.
+            retry_after (float | None): `Retry-After` of the errors.
+        """
+        self.__failures.extend([(status, retry_after)] * times)
+
+    async def __call__(self, scope: dict, receive: Receive, send: Send) -> None:
+        """Handle an ASGI connection."""
+        if scope["type"] == "lifespan":
+            await _lifespan(receive, send)
+            return
+        try:
+            request = _Request(
+                scope["method"],
+                scope["path"],
+                dict(parse_qsl(scope["query_string"].decode(), keep_blank_values=True)),
+                await _read_json(receive),
+            )
+        except ValueError:
+            status, payload, headers = _error(400, "Invalid JSON")
+        else:
+            status, payload, headers = await self.__handle(request)
+        body = b"" if payload is None else json.dumps(payload).encode()
+        headers = {"content-type": "application/json", **headers}
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def __handle(self, request: _Request) -> Reply:
+        self.requests.append((request.method, request.path))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        reply = self.__throttle() or self.__inject_failure()
+        if reply is not None:
+            return reply
+        for method, pattern, handler in self.__routes:
+            match = pattern.fullmatch(request.path)
+            if match is not None and method == request.method:
+                status, payload = handler(request, *match.groups())
+                return status, payload, self.__rate_limit_headers()
+        return _error(404, "Not Found")
+
+    def __throttle(self) -> Reply | None:
+        """Return a 429 reply once the rate limit is reached."""
+        if self.rate_limit is None:
+            return None
+        now = time.monotonic()
+        while self.__hits and self.__hits[0] <= now - self.rate_limit_window:
+            self.__hits.popleft()
+        if len(self.__hits) < self.rate_limit:
+            self.__hits.append(now)
+            return None
+        wait = self.__hits[0] + self.rate_limit_window - now
+        status, payload, _ = _error(429, "Rate Limit Exceeded")
+        return status, payload, {"retry-after": f"{wait:.3f}"}
+
+    def __rate_limit_headers(self) -> Dict[str, str]:
+        if self.rate_limit is None or not self.__hits:
+            return {}
+        reset = self.__hits[0] + self.rate_limit_window - time.monotonic()
+        return {
+            "ratelimit-limit": str(self.rate_limit),
+            "ratelimit-remaining": str(self.rate_limit - len(self.__hits)),
+            "ratelimit-reset": f"{max(reset, 0):.3f}",
+        }
+
+    def __inject_failure(self) -> Reply | None:
+        if self.__failures:
+            status, retry_after = self.__failures.popleft()
+        elif self.error_rate and self.__rng.random() < self.error_rate:
+            status, retry_after = self.error_status, None
+        else:
+            return None
+        status, payload, headers = _error(status, "Injected failure")
+        if retry_after is not None:
+            headers["retry-after"] = f"{retry_after:.3f}"
+        return status, payload, headers
+
+    def __ok(self, request: _Request) -> Tuple[int, Any]:
+        return 200, None
+
+    def __list_abilities(self, request: _Request) -> Tuple[int, Any]:
+        return 200, {"abilities": self.abilities}
+
+    def __test_ability(self, request: _Request, ability: str) -> Tuple[int, Any]:
+        return (204, None) if ability in self.abilities else (402, None)
+
+    def __list_addons(self, request: _Request) -> Tuple[int, Any]:
+        params = request.params
+        offset = int(params.get("offset") or 0)
+        limit = min(int(params.get("limit") or 25), 100)
+        addons = [
+            a
+            for a in self.addons.values()
+            if not params.get("filter") or a["type"] == params["filter"]
+        ]
+        end = offset + limit
+        return 200, {
+            "addons": addons[offset:end],
+            "limit": limit,
+            "offset": offset,
+            "more": end < len(addons),
+            "total": len(addons) if params.get("total") == "true" else None,
+        }
+
+    def __install_addon(self, request: _Request) -> Tuple[int, Any]:
+        data = request.body or {}
+        addon = _addon(self.__next_addon)
+        self.__next_addon += 1
+        addon.update({k: data[k] for k in ("type", "name", "src") if k in data})
+        addon["summary"] = addon["name"]
+        self.addons[addon["id"]] = addon
+        return 201, {"addon": addon}
+
+    def __get_addon(self, request: _Request, id: str) -> Tuple[int, Any]:
+        if id not in self.addons:
+            return 404, _error(404, "Not Found")[1]
+        return 200, {"addon": self.addons[id]}
+
+    def __update_addon(self, request: _Request, id: str) -> Tuple[int, Any]:
+        if id not in self.addons:
+            return 404, _error(404, "Not Found")[1]
+        data = (request.body or {}).get("addons") or {}
+        self.addons[id].update(
+            {k: v for k, v in data.items() if k in ("type", "name", "src")}
+        )
+        return 200, {"addon": self.addons[id]}
+
+    def __delete_addon(self, request: _Request, id: str) -> Tuple[int, Any]:
+        if self.addons.pop(id, None) is None:
+            return 404, _error(404, "Not Found")[1]
+        return 204, None
+
+    def __aggregate(self, request: _Request, domain: str) -> Tuple[int, Any]:
+        body = request.body or {}
+        filters = _filters(body.get("filters"))
+        try:
+            metrics = self.__aggregator.aggregate(
+                filters,
+                _GROUP_BY[domain],  # type: ignore[arg-type]
+                body.get("aggregate_unit"),
+                body.get("time_zone"),
+            )
+        except ValueError as e:
+            return 400, _error(400, str(e))[1]
+        rows = sorted(
+            (_metrics_row(m) for m in metrics.values()),
+            key=lambda row: row["total_incident_count"],
+            reverse=True,
+        )
+        return 200, {
+            "aggregate_unit": body.get("aggregate_unit"),
+            "data": rows,
+            "filters": self.__echo(filters),
+            "order": "desc",
+            "order_by": "total_incident_count",
+            "time_zone": body.get("time_zone") or "Etc/UTC",
+        }
+
+    def __raw_incidents(self, request: _Request) -> Tuple[int, Any]:
+        body = request.body or {}
+        filters = _filters(body.get("filters"))
+        limit = min(int(body.get("limit") or 20), 1000)
+        order = body.get("order") or "desc"
+        order_by = body.get("order_by") or "created_at"
+        start = _position(body.get("starting_after"))
+        if start is None:
+            return 400, _error(400, "Invalid cursor")[1]
+        rows = sorted(
+            (
+                row
+                for row, model in zip(self.incidents, self.__models)
+                if _matches(model, filters)
+            ),
+            key=lambda row: _sort_key(row.get(order_by)),
+            reverse=order == "desc",
+        )
+        end = min(start + limit, len(rows))
+        return 200, {
+            "data": rows[start:end],
+            "first": _cursor(start),
+            "last": _cursor(end),
+            "limit": limit,
+            "more": end < len(rows),
+            "order": order,
+            "order_by": order_by,
+            "starting_after": body.get("starting_after"),
+            "ending_before": None,
+            "filters": self.__echo(filters),
+            "time_zone": body.get("time_zone") or "Etc/UTC",
+        }
+
+    def __raw_incident(self, request: _Request, id: str) -> Tuple[int, Any]:
+        if id not in self.__by_id:
+            return 404, _error(404, "Not Found")[1]
+        return 200, self.__by_id[id]
+
+    def __raw_responses(self, request: _Request, id: str) -> Tuple[int, Any]:
+        if id not in self.__by_id:
+            return 404, _error(404, "Not Found")[1]
+        body = request.body or {}
+        order = body.get("order") or "desc"
+        responses = sorted(
+            _responses(self.__by_id[id], self.responses_per_incident),
+            key=lambda r: r["requested_at"],
+            reverse=order == "desc",
+        )
+        limit = body.get("limit") or len(responses)
+        return 200, {
+            "incident_id": id,
+            "limit": limit,
+            "order": order,
+            "order_by": "requested_at",
+            "responses": responses[:limit],
+            "time_zone": body.get("time_zone") or "Etc/UTC",
+        }
+
+    def __echo(self, filters: AnalyticsRequestFilters) -> dict:
+        """Return the applied filters, defaulting to the range of the data."""
+        data = filters.to_dict()
+        first = last = None
+        if self.__models:
+            first = self.__models[0].created_at
+            last = self.__models[-1].created_at + timedelta(seconds=1)
+        data["created_at_start"] = _pd_format(filters.created_at_start or first)
+        data["created_at_end"] = _pd_format(filters.create_at_end or last)
+        return data
+
+
+async def _lifespan(receive: Receive, send: Send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def _read_json(receive: Receive) -> Any:
+    """Return the decoded JSON body of a request, None when empty."""
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    body = b"".join(chunks)
+    return json.loads(body) if body else None
+
+
+def _error(status: int, message: str) -> Reply:
+    """Return an error reply in the PagerDuty format."""
+    return status, {"error": {"message": message, "code": status}}, {}
+
+
+def _cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(str(position).encode()).decode()
+
+
+def _position(cursor: str | None) -> int | None:
+    """Return the position of a cursor, None when it is invalid."""
+    if cursor is None:
+        return 0
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError):
+        return None
+
+
+def _sort_key(value: Any) -> tuple:
+    return (value is not None, value if value is not None else 0)
+
+
+def _parse(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _pd_format(dt: datetime | None) -> str | None:
+    if dt is None:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _filters(data: dict | None) -> AnalyticsRequestFilters:
+    data = data or {}
+    return AnalyticsRequestFilters(
+        created_at_start=_parse(data.get("created_at_start")),
+        create_at_end=_parse(data.get("created_at_end")),
+        urgency=data.get("urgency"),
+        major=data.get("major"),
+        team_ids=data.get("team_ids") or [],
+        service_ids=data.get("service_ids") or [],
+        priority_ids=data.get("priority_ids") or [],
+        priority_names=data.get("priority_names") or [],
+    )
+
+
+def _matches(incident: RawIncidentData, f: AnalyticsRequestFilters) -> bool:
+    """Return whether an incident matches filters, like the API does."""
+    created = utils.to_timestamp(incident.created_at)
+    start, end = f.created_at_start, f.create_at_end
+    if start is not None and created < utils.to_timestamp(start):
+        return False
+    if end is not None and created >= utils.to_timestamp(end):
+        return False
+    if f.major is not None and incident.major != f.major:
+        return False
+    if f.urgency is not None and incident.urgency != f.urgency:
+        return False
+    return all(
+        not allowed or value in allowed
+        for value, allowed in (
+            (incident.service_id, f.service_ids),
+            (incident.team_id, f.team_ids),
+            (incident.priority_id, f.priority_ids),
+            (incident.priority_name, f.priority_names),
+        )
+    )
+
+
+def _metrics_row(metrics: AggregatedMetrics) -> dict:
+    row = {f.name: getattr(metrics, f.name) for f in dataclasses.fields(metrics)}
+    if row["range_start"] is not None:
+        row["range_start"] = row["range_start"].isoformat()
+    return row
+
+
+def _addon(i: int) -> dict:
+    return {
+        "id": f"PA{i:05d}",
+        "type": "full_page_addon",
+        "summary": f"Status page {i}",
+        "self": f"https://api.pagerduty.com/addons/PA{i:05d}",
+        "html_url": None,
+        "name": f"Status page {i}",
+        "src": f"https://intranet.example.com/status/{i}",
+    }
+
+
+def _incident(
+    rng: random.Random, i: int, start: datetime, days: int, description_size: int
+) -> dict:
+    """Return a raw analytics incident."""
+    created_at = start + timedelta(seconds=rng.randrange(days * 86400))
+    resolved = rng.random() < 0.9
+    seconds_to_resolve = rng.randrange(60, 86400) if resolved else None
+    service_id, service_name = rng.choice(SERVICES)
+    team_id, team_name = rng.choice(TEAMS)
+    priority_id, priority_name, priority_order = rng.choice(PRIORITIES)
+    user_id, user_name = rng.choice(USERS)
+    description = f"[#{i}] Disk usage above threshold on host-{i % 500} "
+    return {
+        "id": f"Q{i:07d}",
+        "status": "resolved" if resolved else "triggered",
+        "created_at": created_at.isoformat(),
+        "resolved_at": (
+            (created_at + timedelta(seconds=seconds_to_resolve)).isoformat()
+            if seconds_to_resolve is not None
+            else None
+        ),
+        "assignment_count": rng.randrange(1, 4),
+        "business_hour_interruptions": rng.randrange(0, 3),
+        "description": description.ljust(description_size, ".")[:description_size],
+        "engaged_seconds": rng.randrange(0, 7200),
+        "engaged_user_count": rng.randrange(0, 4),
+        "escalation_count": rng.randrange(0, 3),
+        "incident_number": i,
+        "major": rng.random() < 0.02,
+        "off_hour_interruptions": rng.randrange(0, 3),
+        "priority_id": priority_id,
+        "priority_name": priority_name,
+        "priority_order": priority_order,
+        "auto_resolved": rng.random() < 0.3,
+        "urgency": rng.choice(("high", "low")),
+        "manual_escalation_count": rng.randrange(0, 2),
+        "total_interruptions": rng.randrange(0, 6),
+        "timeout_escalation_count": rng.randrange(0, 2),
+        "reassignment_count": rng.randrange(0, 2),
+        "escalation_policy_name": f"{service_name} policy",
+        "escalation_policy_id": f"PE{service_id[2:]}",
+        "service_name": service_name,
+        "service_id": service_id,
+        "total_notifications": rng.randrange(1, 10),
+        "snoozed_seconds": 0,
+        "resolved_by_user_name": user_name if resolved else None,
+        "resolved_by_user_id": user_id if resolved else None,
+        "seconds_to_engage": rng.randrange(0, 900),
+        "seconds_to_first_ack": rng.randrange(0, 900),
+        "seconds_to_mobilize": rng.randrange(0, 900),
+        "seconds_to_resolve": seconds_to_resolve,
+        "sleep_hour_interruptions": rng.randrange(0, 2),
+        "team_id": team_id,
+        "team_name": team_name,
+        "user_defined_effort_seconds": None,
+    }
+
+
+def _responses(incident: dict, n: int) -> List[dict]:
+    """Return the responses of an incident, the same on every call."""
+    rng = random.Random(incident["id"])
+    created_at = datetime.fromisoformat(incident["created_at"])
+    responses = []
+    for _ in range(n):
+        requested_at = created_at + timedelta(seconds=rng.randrange(3600))
+        responded = rng.random() < 0.7
+        delay = rng.randrange(5, 900)
+        user_id, user_name = rng.choice(USERS)
+        responses.append(
+            {
+                "requested_at": requested_at.isoformat(),
+                "responded_at": (
+                    (requested_at + timedelta(seconds=delay)).isoformat()
+                    if responded
+                    else None
+                ),
+                "responder_id": user_id,
+                "responder_name": user_name,
+                "responder_type": rng.choice(("assigned", "reassigned")),
+                "response_status": "accepted" if responded else "pending",
+                "time_to_respond_seconds": delay if responded else None,
+            }
+        )
+    return responses
@@ -0,0 +1,41 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Run the offline benchmarks.
+
+Run with `python -m benchmarks [name ...]` from the repository root, where
+names are any of `decode`, `datetime` and `memory`; all of them by default.
+"""
+
+import sys
+
+from benchmarks import bench_datetime, bench_decode, bench_memory
+
+BENCHMARKS = {
+    "decode": lambda: bench_decode.main([]),
+    "datetime": bench_datetime.main,
+    "memory": bench_memory.main,
+}
+
+
+def main(names: list) -> None:
+    for name in names or list(BENCHMARKS):
+        if name not in BENCHMARKS:
+            sys.exit(f"unknown benchmark {name!r}, choose from {', '.join(BENCHMARKS)}")
+        print(f"== {name}")
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,80 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Micro-benchmark for PagerDuty datetime parsing.
+
+Run with `python -m benchmarks.bench_datetime` from the repository root.
+"""
+
+import random
+import timeit
+from datetime import datetime, timedelta
+
+from asyncpd import utils
+
+
+def legacy_parse(ds: str) -> datetime:
+    """Parse a date string the way asyncpd 0.0.2 did."""
+    fmt = "%Y-%m-%dT%H:%M:%S"
+    if ds.endswith("Z"):
+        fmt = f"{fmt}Z"
+    return datetime.strptime(ds, fmt)
+
+
+def make_column(n: int, distinct: int) -> list:
+    start = datetime(2023, 1, 1)
+    stamps = [
+        (start + timedelta(seconds=random.randrange(90 * 86400))).isoformat()
+        for _ in range(distinct)
+    ]
+    return [random.choice(stamps) + random.choice(("", "Z")) for _ in range(n)]
+
+
+def main() -> None:
+    random.seed(0)
+    n = 10_000
+    for distinct in (n, n // 10):
+        column = make_column(n, distinct)
+
+        def cold(fn):
+            def run():
+                utils.parse_pd_datetime_format.cache_clear()
+                return fn()
+
+            return run
+
+        def scalar():
+            return [utils.parse_pd_datetime_format(ds) for ds in column]
+
+        def batch():
+            return utils.parse_pd_datetime_formats(column)
+
+        cases = {
+            "strptime (legacy)": lambda: [legacy_parse(ds) for ds in column],
+            "parse_pd_datetime_format": cold(scalar),
+            "parse_pd_datetime_format (memoized)": scalar,
+            "parse_pd_datetime_formats": cold(batch),
+        }
+        print(f"{n} timestamps, {distinct} distinct values")
+        baseline = None
+        for name, fn in cases.items():
+            best = min(timeit.repeat(fn, number=1, repeat=5))
+            baseline = baseline or best
+            print(
+                f"  {name:<36} {n / best:>12,.0f} rows/s  {baseline / best:>6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
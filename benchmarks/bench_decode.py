@@ -0,0 +1,222 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Throughput and allocation benchmark for model decoding.
+
+Decodes synthetic pages, at the page sizes the API returns, into the models
+and reports rows per second, wire bytes per row, bytes allocated per row
+while decoding and bytes held per row by the result. JSON parsing is done
+before timing, so only the model code is measured. Request building is
+measured the same way, one request per row.
+
+Run with `python -m benchmarks.bench_decode` from the repository root.
+"""
+
+import argparse
+import asyncio
+import functools
+import gc
+import json
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, List, NamedTuple, Optional
+
+import httpx
+
+from asyncpd import utils
+from asyncpd.client import APIClient
+from asyncpd.models.addons import PaginatedAddon
+from asyncpd.models.analytics import (
+    AggregatedMetrics,
+    AnalyticsRequestFilters,
+    RawIncidentData,
+    RawResponsesForSingleIncident,
+)
+
+from benchmarks import payloads
+
+
+class Case(NamedTuple):
+    """A decoding benchmark."""
+
+    name: str
+    body: bytes
+    rows: int
+    build: Callable[[Any], Any]
+
+
+class Result(NamedTuple):
+    """Measurements of a case."""
+
+    rows_per_second: float
+    wire_bytes_per_row: float
+    allocated_bytes_per_row: float
+    held_bytes_per_row: float
+
+
+def fresh(body: bytes) -> Any:
+    """Return a new decoded payload, since some models decode in place."""
+    utils.parse_pd_datetime_format.cache_clear()
+    return json.loads(body)
+
+
+def timed(case: Case, repeat: int) -> float:
+    """Return the best decoding time of a case."""
+    best = float("inf")
+    for _ in range(repeat):
+        data = fresh(case.body)
+        gc.collect()
+        start = time.perf_counter()
+        case.build(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def traced(case: Case) -> tuple:
+    """Return the bytes allocated at peak and held after decoding a case."""
+    data = fresh(case.body)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = case.build(data)
+    del data
+    gc.collect()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak - before, held - before
+
+
+def measure(case: Case, repeat: int = 5) -> Result:
+    """Measure a case."""
+    allocated, held = traced(case)
+    return Result(
+        rows_per_second=case.rows / timed(case, repeat),
+        wire_bytes_per_row=len(case.body) / case.rows,
+        allocated_bytes_per_row=allocated / case.rows,
+        held_bytes_per_row=held / case.rows,
+    )
+
+
+def rows_of(build: Callable[[dict], Any], key: str) -> Callable[[dict], List[Any]]:
+    """Return a builder of every row of a payload."""
+    return lambda data: [build(row) for row in data[key]]
+
+
+def build_requests(client: APIClient, data: List[dict]) -> List[httpx.Request]:
+    """Build a raw incidents request per set of filters, as the client does."""
+    return [
+        client.build_request(
+            "POST",
+            "/analytics/raw/incidents",
+            headers={"X-EARLY-ACCESS": "analytics-v2"},
+            data={
+                "filters": AnalyticsRequestFilters(
+                    created_at_start=datetime.fromisoformat(f["created_at_start"]),
+                    create_at_end=datetime.fromisoformat(f["created_at_end"]),
+                    service_ids=f["service_ids"],
+                ).to_dict(),
+                "limit": 1000,
+                "order": "desc",
+                "order_by": "created_at",
+                "time_zone": None,
+                "starting_after": f["cursor"],
+            },
+        )
+        for f in data
+    ]
+
+
+def cases(client: APIClient, scale: int = 1) -> List[Case]:
+    """Return the benchmark cases, with `scale` pages of each."""
+    raw = payloads.raw_incidents_page(1000 * scale)
+    stamps = [row["created_at"] for row in raw["data"]]
+    filters = [
+        {
+            "created_at_start": row["created_at"],
+            "created_at_end": row["resolved_at"] or row["created_at"],
+            "service_ids": [row["service_id"]],
+            "cursor": row["id"],
+        }
+        for row in raw["data"]
+    ]
+    return [
+        Case(
+            "RawIncidentData.from_dict",
+            payloads.encode(raw),
+            len(raw["data"]),
+            rows_of(RawIncidentData.from_dict, "data"),
+        ),
+        Case(
+            "AggregatedMetrics.from_dict",
+            payloads.encode(payloads.aggregated_page(1000 * scale)),
+            1000 * scale,
+            rows_of(AggregatedMetrics.from_dict, "data"),
+        ),
+        Case(
+            "PaginatedAddon.from_dict",
+            payloads.encode(payloads.addons_page(100)),
+            100,
+            PaginatedAddon.from_dict,
+        ),
+        Case(
+            "RawResponsesForSingleIncident",
+            payloads.encode(payloads.raw_responses_page(100)),
+            100,
+            RawResponsesForSingleIncident.from_dict,
+        ),
+        Case(
+            "parse_pd_datetime_format",
+            payloads.encode(stamps),
+            len(stamps),
+            lambda column: [utils.parse_pd_datetime_format(ds) for ds in column],
+        ),
+        Case(
+            "raw incidents request",
+            payloads.encode(filters),
+            len(filters),
+            functools.partial(build_requests, client),
+        ),
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scale", type=int, default=1, help="pages of analytics rows to decode"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per case")
+    args = parser.parse_args(argv)
+
+    print(
+        f"  {'case':<30} {'rows':>6} {'rows/s':>12} {'wire B/row':>11}"
+        f" {'alloc B/row':>12} {'held B/row':>11}"
+    )
+    client = APIClient("bench")
+    try:
+        for case in cases(client, args.scale):
+            r = measure(case, args.repeat)
+            print(
+                f"  {case.name:<30} {case.rows:>6} {r.rows_per_second:>12,.0f}"
+                f" {r.wire_bytes_per_row:>11,.0f}"
+                f" {r.allocated_bytes_per_row:>12,.0f}"
+                f" {r.held_bytes_per_row:>11,.0f}"
+            )
+    finally:
+        asyncio.run(client.aclose())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Memory benchmark for the high-volume models.
+
+Compares the bytes held per row by plain dataclasses (how the models were
+defined before they were slotted and started interning categorical strings)
+with the current models. Run with `python -m benchmarks.bench_memory` from
+the repository root.
+"""
+
+import dataclasses
+import gc
+import json
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List
+
+from asyncpd import utils
+from asyncpd.models.addons import Addon
+from asyncpd.models.analytics import AggregatedMetrics, RawIncidentData
+
+from benchmarks import payloads
+
+
+def plain(cls: type) -> type:
+    """Return a plain, unslotted dataclass with the fields of `cls`."""
+    return dataclasses.make_dataclass(
+        f"Plain{cls.__name__}",
+        [
+            (
+                f.name,
+                f.type,
+                dataclasses.field(default=f.default, default_factory=f.default_factory),
+            )
+            for f in dataclasses.fields(cls)
+        ],
+    )
+
+
+PlainRawIncidentData = plain(RawIncidentData)
+PlainAggregatedMetrics = plain(AggregatedMetrics)
+PlainAddon = plain(Addon)
+
+
+def legacy_raw_incident(data: dict) -> object:
+    for key in ("created_at", "resolved_at"):
+        if data[key] is not None:
+            data[key] = utils.parse_pd_datetime_format(data[key])
+    return PlainRawIncidentData(**data)
+
+
+def legacy_aggregated(data: dict) -> object:
+    data["range_start"] = datetime.fromisoformat(data["range_start"])
+    return PlainAggregatedMetrics(**data)
+
+
+def legacy_addon(data: dict) -> object:
+    return PlainAddon(**data)
+
+
+def bytes_per_row(body: bytes, key: str, build: Callable[[dict], object]) -> float:
+    """Measure the memory held by the rows decoded from a response body."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    rows: List[object] = [build(row) for row in json.loads(body)[key]]
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return held / len(rows)
+
+
+def main(n: int = 20_000) -> None:
+    cases = [
+        (
+            "RawIncidentData",
+            payloads.encode(payloads.raw_incidents_page(n)),
+            "data",
+            legacy_raw_incident,
+            RawIncidentData.from_dict,
+        ),
+        (
+            "AggregatedMetrics",
+            payloads.encode(payloads.aggregated_page(n)),
+            "data",
+            legacy_aggregated,
+            AggregatedMetrics.from_dict,
+        ),
+        (
+            "Addon",
+            payloads.encode(payloads.addons_page(n)),
+            "addons",
+            legacy_addon,
+            Addon.from_dict,
+        ),
+    ]
+    print(f"{n} rows per model, bytes held per row")
+    for name, body, key, legacy, current in cases:
+        utils.parse_pd_datetime_format.cache_clear()
+        before = bytes_per_row(body, key, legacy)
+        utils.parse_pd_datetime_format.cache_clear()
+        after = bytes_per_row(body, key, current)
+        print(
+            f"  {name:<18} before {before:>8,.0f}  after {after:>8,.0f}"
+            f"  ({1 - after / before:.0%} smaller)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Synthetic PagerDuty payloads shaped like real API responses."""
+
+import json
+import random
+from datetime import datetime, timedelta
+
+START = datetime(2023, 1, 1)
+SERVICES = [(f"PS{i:05d}", f"Service {i}") for i in range(40)]
+TEAMS = [(f"PT{i:05d}", f"Team {i}") for i in range(8)]
+PRIORITIES = [("PP00001", "P1", 1), ("PP00002", "P2", 2), ("PP00003", "P3", 3)]
+USERS = [(f"PU{i:05d}", f"User {i}") for i in range(60)]
+
+
+def raw_incident(rng: random.Random, i: int) -> dict:
+    """Return a raw analytics incident."""
+    created_at = START + timedelta(seconds=rng.randrange(90 * 86400))
+    resolved = rng.random() < 0.9
+    seconds_to_resolve = rng.randrange(60, 86400) if resolved else None
+    service_id, service_name = rng.choice(SERVICES)
+    team_id, team_name = rng.choice(TEAMS)
+    priority_id, priority_name, priority_order = rng.choice(PRIORITIES)
+    user_id, user_name = rng.choice(USERS)
+    return {
+        "id": f"Q{i:07d}",
+        "status": "resolved" if resolved else "triggered",
+        "created_at": created_at.isoformat(),
+        "resolved_at": (
+            (created_at + timedelta(seconds=seconds_to_resolve)).isoformat()
+            if seconds_to_resolve is not None
+            else None
+        ),
+        "assignment_count": rng.randrange(1, 4),
+        "business_hour_interruptions": rng.randrange(0, 3),
+        "description": f"[#{i}] Disk usage above threshold on host-{i % 500}",
+        "engaged_seconds": rng.randrange(0, 7200),
+        "engaged_user_count": rng.randrange(0, 4),
+        "escalation_count": rng.randrange(0, 3),
+        "incident_number": i,
+        "major": rng.random() < 0.02,
+        "off_hour_interruptions": rng.randrange(0, 3),
+        "priority_id": priority_id,
+        "priority_name": priority_name,
+        "priority_order": priority_order,
+        "auto_resolved": rng.random() < 0.3,
+        "urgency": rng.choice(("high", "low")),
+        "manual_escalation_count": rng.randrange(0, 2),
+        "total_interruptions": rng.randrange(0, 6),
+        "timeout_escalation_count": rng.randrange(0, 2),
+        "reassignment_count": rng.randrange(0, 2),
+        "escalation_policy_name": f"{service_name} policy",
+        "escalation_policy_id": f"PE{service_id[2:]}",
+        "service_name": service_name,
+        "service_id": service_id,
+        "total_notifications": rng.randrange(1, 10),
+        "snoozed_seconds": 0,
+        "resolved_by_user_name": user_name if resolved else None,
+        "resolved_by_user_id": user_id if resolved else None,
+        "seconds_to_engage": rng.randrange(0, 900),
+        "seconds_to_first_ack": rng.randrange(0, 900),
+        "seconds_to_mobilize": rng.randrange(0, 900),
+        "seconds_to_resolve": seconds_to_resolve,
+        "sleep_hour_interruptions": rng.randrange(0, 2),
+        "team_id": team_id,
+        "team_name": team_name,
+        "user_defined_effort_seconds": None,
+    }
+
+
+def raw_incidents_page(n: int, seed: int = 0) -> dict:
+    """Return a `/analytics/raw/incidents` response with `n` incidents."""
+    rng = random.Random(seed)
+    return {
+        "data": [raw_incident(rng, i) for i in range(n)],
+        "ending_before": None,
+        "filters": {
+            "created_at_start": START.isoformat() + "Z",
+            "created_at_end": (START + timedelta(days=90)).isoformat() + "Z",
+        },
+        "first": "Zmlyc3Q=",
+        "last": "bGFzdA==",
+        "limit": n,
+        "more": True,
+        "order": "desc",
+        "order_by": "created_at",
+        "starting_after": None,
+        "time_zone": "Etc/UTC",
+    }
+
+
+def aggregated_metrics(rng: random.Random, i: int) -> dict:
+    """Return an aggregated metrics row."""
+    service_id, service_name = SERVICES[i % len(SERVICES)]
+    team_id, team_name = rng.choice(TEAMS)
+    row = {
+        "mean_assignment_count": rng.randrange(1, 4),
+        "mean_engaged_seconds": rng.randrange(0, 3600),
+        "mean_engaged_user_count": rng.randrange(0, 4),
+        "mean_seconds_to_engage": rng.randrange(0, 900),
+        "mean_seconds_to_first_ack": rng.randrange(0, 900),
+        "mean_seconds_to_mobilize": rng.randrange(0, 900),
+        "mean_seconds_to_resolve": rng.randrange(60, 86400),
+        "range_start": (START + timedelta(days=i // len(SERVICES))).isoformat(),
+        "service_id": service_id,
+        "service_name": service_name,
+        "team_id": team_id,
+        "team_name": team_name,
+        "up_time_pct": round(rng.uniform(95, 100), 2),
+    }
+    for key in (
+        "total_business_hour_interruptions",
+        "total_engaged_seconds",
+        "total_escalation_count",
+        "total_incident_count",
+        "total_off_hour_interruptions",
+        "total_sleep_hour_interruptions",
+        "total_incidents_acknowledged",
+        "total_incidents_auto_resolved",
+        "total_incidents_manual_escalated",
+        "total_incidents_reassigned",
+        "total_incidents_timeout_escalated",
+        "total_interruptions",
+        "total_notifications",
+        "total_snoozed_seconds",
+    ):
+        row[key] = rng.randrange(0, 500)
+    return row
+
+
+def aggregated_page(n: int, seed: int = 0) -> dict:
+    """Return an aggregated metrics response with `n` rows."""
+    rng = random.Random(seed)
+    return {
+        "aggregate_unit": "day",
+        "data": [aggregated_metrics(rng, i) for i in range(n)],
+        "filters": {
+            "created_at_start": START.isoformat() + "Z",
+            "created_at_end": (START + timedelta(days=90)).isoformat() + "Z",
+        },
+        "order": "desc",
+        "order_by": "total_incident_count",
+        "time_zone": "Etc/UTC",
+    }
+
+
+def addon(i: int) -> dict:
+    """Return an addon."""
+    return {
+        "id": f"PA{i:05d}",
+        "type": "full_page_addon",
+        "summary": f"Status page {i}",
+        "self": f"https://api.pagerduty.com/addons/PA{i:05d}",
+        "html_url": None,
+        "name": f"Status page {i}",
+        "src": f"https://intranet.example.com/status/{i}",
+    }
+
+
+def addons_page(n: int, offset: int = 0) -> dict:
+    """Return a `/addons` response with `n` addons."""
+    return {
+        "addons": [addon(offset + i) for i in range(n)],
+        "limit": n,
+        "offset": offset,
+        "more": True,
+        "total": None,
+    }
+
+
+def raw_responses_page(n: int, seed: int = 0) -> dict:
+    """Return a raw responses response for an incident with `n` responses."""
+    rng = random.Random(seed)
+    responses = []
+    for _ in range(n):
+        requested_at = START + timedelta(seconds=rng.randrange(86400))
+        responded = rng.random() < 0.7
+        delay = rng.randrange(5, 900)
+        user_id, user_name = rng.choice(USERS)
+        responses.append(
+            {
+                "requested_at": requested_at.isoformat(),
+                "responded_at": (
+                    (requested_at + timedelta(seconds=delay)).isoformat()
+                    if responded
+                    else None
+                ),
+                "responder_id": user_id,
+                "responder_name": user_name,
+                "responder_type": rng.choice(("assigned", "reassigned")),
+                "response_status": "accepted" if responded else "pending",
+                "time_to_respond_seconds": delay if responded else None,
+            }
+        )
+    return {
+        "incident_id": "Q0000001",
+        "limit": n,
+        "order": "asc",
+        "order_by": "requested_at",
+        "responses": responses,
+        "time_zone": "Etc/UTC",
+    }
+
+
+def encode(payload: dict) -> bytes:
+    """Encode a payload the way it arrives over the wire."""
+    return json.dumps(payload).encode()
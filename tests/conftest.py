@@ -15,10 +15,16 @@
 
 """Test fixtures."""
 
+import inspect
 import os
+from typing import Any, Callable, List
+
+import httpx
 import pytest
 
+from asyncpd import ClientPool
 from asyncpd.client import APIClient
+from asyncpd.ratelimit import RateLimiter
 
 
 @pytest.fixture
@@ -29,3 +35,64 @@ async def client():
     )
     yield _client
     await _client.aclose()
+
+
+def _recording_transport(
+    handler: Callable[[httpx.Request], Any], sent: List[httpx.Request]
+) -> httpx.MockTransport:
+    async def record(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        res = handler(request)
+        return await res if inspect.isawaitable(res) else res
+
+    return httpx.MockTransport(record)
+
+
+@pytest.fixture
+def sent() -> List[httpx.Request]:
+    """Requests received by the handlers of `mock_client` and `mock_pool`."""
+    return []
+
+
+@pytest.fixture
+async def mock_client(sent):
+    """Factory of offline APIClients, closed after the test.
+
+    `mock_client(handler, **kwargs)` serves requests with `handler`, sync or
+    async, and rate limiting is off unless a `rate_limiter` is given.
+    """
+    clients: List[APIClient] = []
+
+    def make(handler=None, **kwargs) -> APIClient:
+        if handler is not None:
+            kwargs["transport"] = _recording_transport(handler, sent)
+        kwargs.setdefault("rate_limiter", RateLimiter.unlimited())
+        clients.append(APIClient("test", **kwargs))
+        return clients[-1]
+
+    yield make
+    for c in clients:
+        await c.aclose()
+
+
+@pytest.fixture
+async def mock_pool(sent):
+    """Factory of offline ClientPools, closed after the test.
+
+    `mock_pool(tokens, handler, **kwargs)` works like `mock_client`, with
+    one unlimited rate limiter per token by default.
+    """
+    pools: List[ClientPool] = []
+
+    def make(tokens, handler, **kwargs) -> ClientPool:
+        kwargs.setdefault("rate_limiter_factory", RateLimiter.unlimited)
+        pools.append(
+            ClientPool.from_tokens(
+                tokens, transport=_recording_transport(handler, sent), **kwargs
+            )
+        )
+        return pools[-1]
+
+    yield make
+    for p in pools:
+        await p.aclose()
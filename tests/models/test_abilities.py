@@ -16,6 +16,7 @@
 """Tests for httpx adapter client."""
 
 
+import asyncio
 from unittest import mock
 
 import httpx
@@ -81,3 +82,37 @@ async def test_abilities_is_enabled_no_auth(client: APIClient) -> None:
 async def test_abilities_is_enabled_false(client: APIClient) -> None:
     with mock.patch.object(client, "request", mock_enabled_false):
         assert await client.abilities.is_enabled("sso") is False
+
+
+async def test_abilities_snapshot_is_cached(client: APIClient) -> None:
+    with mock.patch.object(
+        client, "request", side_effect=mock_list_abilities
+    ) as request:
+        assert client.abilities is client.abilities
+        assert await client.abilities.is_enabled("sso", cached=True) is True
+        assert await client.abilities.is_enabled("teams", cached=True) is False
+        assert await client.abilities.are_enabled(["sso", "teams"]) == {
+            "sso": True,
+            "teams": False,
+        }
+        assert request.await_count == 1
+
+        client.abilities.cache_ttl = 0
+        await client.abilities.snapshot()
+        assert request.await_count == 2
+
+        client.abilities.cache_ttl = 300
+        client.abilities.invalidate()
+        await client.abilities.snapshot()
+        assert request.await_count == 3
+
+
+async def test_abilities_background_refresh(client: APIClient) -> None:
+    with mock.patch.object(
+        client, "request", side_effect=mock_list_abilities
+    ) as request:
+        client.abilities.start_background_refresh(interval=0.01)
+        await asyncio.sleep(0.035)
+        await client.abilities.stop_background_refresh()
+        assert request.await_count >= 2
+        assert "sso" in await client.abilities.snapshot()
@@ -16,6 +16,7 @@
 """Tests for httpx adapter client."""
 
 
+from functools import partial
 from unittest import mock
 
 import httpx
@@ -23,6 +24,7 @@ import pytest
 
 from asyncpd.client import APIClient
 from asyncpd.models import addons
+from asyncpd.models.lazy import LazyRows
 
 from tests.models.test_helpers import mock_invalid_auth, mock_not_found
 
@@ -160,3 +162,55 @@ async def test_update_addon(client: APIClient):
             ),
         )
         assert addon is not None
+
+
+async def mock_paginated_addons(
+    *args, total: int, report_total: bool = True, **kwargs
+) -> httpx.Response:
+    params = dict(kwargs["params"])
+    offset, limit = params["offset"], params["limit"]
+    ids = range(offset, min(offset + limit, total))
+    return httpx.Response(
+        status_code=200,
+        json={
+            "addons": [
+                {"id": f"P{i}", "type": "full_page_addon", "src": "https://x"}
+                for i in ids
+            ],
+            "limit": limit,
+            "offset": offset,
+            "more": offset + limit < total,
+            "total": total if report_total else None,
+        },
+    )
+
+
+def sent_params(request: mock.AsyncMock) -> list:
+    return [dict(call.kwargs["params"]) for call in request.call_args_list]
+
+
+async def test_iter_all_addons(client: APIClient):
+    with mock.patch.object(
+        client, "request", side_effect=partial(mock_paginated_addons, total=53)
+    ) as request:
+        ids = [a.id async for a in client.addons.iter_all(limit=10, concurrency=3)]
+    assert ids == [f"P{i}" for i in range(53)]
+    assert sent_params(request)[0]["total"] is True
+    assert request.await_count == 6
+
+
+async def test_iter_all_addons_without_total(client: APIClient):
+    mock_request = partial(mock_paginated_addons, total=21, report_total=False)
+    with mock.patch.object(client, "request", side_effect=mock_request) as request:
+        ids = [a.id async for a in client.addons.iter_all(limit=10)]
+    assert ids == [f"P{i}" for i in range(21)]
+    assert [p["offset"] for p in sent_params(request)] == [0, 10, 20]
+
+
+async def test_list_addons_lazy(client: APIClient) -> None:
+    with mock.patch.object(client, "request", mock_list_addons):
+        res = await client.addons.list(lazy=True)
+    assert isinstance(res.addons, LazyRows)
+    assert res.addons.materialized == 0
+    assert res.addons[0].id == "PKX7619"
+    assert res.addons[:1] == [res.addons[0]]
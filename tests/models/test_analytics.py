@@ -14,7 +14,13 @@
 
 """Analytics API tests."""
 
+import asyncio
+import dataclasses
+import json
 import logging
+from datetime import datetime
+from functools import partial
+from typing import Optional
 from unittest import mock
 
 import httpx
@@ -22,6 +28,8 @@ import pytest
 
 from asyncpd.client import APIClient
 from asyncpd.models import analytics
+from asyncpd.models.lazy import LazyRows
+from asyncpd.ratelimit import RateLimiter
 
 from tests.models.test_helpers import mock_invalid_auth, mock_not_found
 
@@ -325,3 +333,256 @@ async def test_get_raw_responses_for_incident(client: APIClient):
 async def test_get_raw_responses_for_incident_returns_none(client: APIClient):
     with mock.patch.object(client, "request", mock_not_found):
         assert await client.analytics.get_raw_responses_for_incident("test") is None
+
+
+async def mock_raw_incident_pages(
+    *args, pages: int, rows_per_page: int = 2, **kwargs
+) -> httpx.Response:
+    cursor = kwargs["data"]["starting_after"]
+    index = 0 if cursor is None else int(cursor)
+    payload = (await mock_get_raw_data_response()).json()
+    row = payload["data"][0]
+    payload["data"] = [{**row, "id": f"P{index}-{i}"} for i in range(rows_per_page)]
+    payload["last"] = str(index + 1)
+    payload["more"] = index + 1 < pages
+    return httpx.Response(status_code=200, json=payload)
+
+
+def sent_bodies(request: mock.AsyncMock) -> list:
+    return [call.kwargs["data"] for call in request.call_args_list]
+
+
+async def test_get_multiple_raw_data_with_cursor(client: APIClient):
+    with mock.patch.object(
+        client, "request", side_effect=partial(mock_raw_incident_pages, pages=3)
+    ) as request:
+        res = await client.analytics.get_multiple_raw_incident_data(
+            starting_after="1"
+        )
+    assert sent_bodies(request)[0]["starting_after"] == "1"
+    assert res.data[0].id == "P1-0"
+
+
+async def test_iter_raw_incident_data_follows_cursor(client: APIClient):
+    with mock.patch.object(
+        client, "request", side_effect=partial(mock_raw_incident_pages, pages=3)
+    ) as request:
+        ids = [r.id async for r in client.analytics.iter_raw_incident_data()]
+    assert ids == ["P0-0", "P0-1", "P1-0", "P1-1", "P2-0", "P2-1"]
+    assert [b["starting_after"] for b in sent_bodies(request)] == [None, "1", "2"]
+
+
+async def test_iter_raw_incident_data_prefetches_next_page(client: APIClient):
+    with mock.patch.object(
+        client, "request", side_effect=partial(mock_raw_incident_pages, pages=3)
+    ) as request:
+        rows = client.analytics.iter_raw_incident_data()
+        first = await rows.__anext__()
+        await asyncio.sleep(0)
+        assert first.id == "P0-0"
+        assert request.await_count == 2
+        await rows.aclose()
+    assert request.await_count == 2
+
+
+async def test_iter_raw_incident_data_sharded(client: APIClient):
+    filters = analytics.AnalyticsRequestFilters(
+        created_at_start=datetime(2021, 1, 1),
+        create_at_end=datetime(2021, 1, 31),
+    )
+    with mock.patch.object(
+        client, "request", side_effect=partial(mock_raw_incident_pages, pages=1)
+    ) as request:
+        rows = [
+            r
+            async for r in client.analytics.iter_raw_incident_data_sharded(
+                filters, shards=3
+            )
+        ]
+    assert len(rows) == 6
+    assert request.await_count == 3
+    first = sent_bodies(request)[0]
+    assert first["filters"]["created_at_end"] == "2021-01-31T00:00:00"
+
+
+async def test_iter_raw_incident_data_sharded_requires_range(client: APIClient):
+    with pytest.raises(ValueError):
+        async for _ in client.analytics.iter_raw_incident_data_sharded(
+            analytics.AnalyticsRequestFilters()
+        ):
+            pass
+
+
+async def test_get_multiple_raw_data_lazy(client: APIClient):
+    with mock.patch.object(client, "request", mock_get_raw_data_response):
+        eager = await client.analytics.get_multiple_raw_incident_data()
+        res = await client.analytics.get_multiple_raw_incident_data(lazy=True)
+    assert isinstance(res.data, LazyRows)
+    assert res.data.materialized == 0
+    assert res.data[0] == eager.data[0]
+    assert res.data.materialized == 1
+    assert res.data[0] is res.data[0]
+    assert list(res.data) == eager.data
+    assert res.data == eager.data
+
+
+async def test_get_raw_responses_for_incident_lazy(client: APIClient):
+    with mock.patch.object(client, "request", mock_raw_responses_for_incident):
+        res = await client.analytics.get_raw_responses_for_incident("1", lazy=True)
+    assert res is not None
+    assert isinstance(res.responses, LazyRows)
+    assert len(res.responses) == len(res.responses.raw)
+    assert res.responses.materialized == 0
+
+
+async def mock_streamed_raw_incident_pages(
+    request: httpx.Request,
+    pages: int,
+    rows_per_page: int = 3,
+    sent_chunks: Optional[list] = None,
+) -> httpx.Response:
+    res = await mock_raw_incident_pages(
+        data=json.loads(request.content), pages=pages, rows_per_page=rows_per_page
+    )
+    body = res.content
+
+    async def chunks():
+        for i in range(0, len(body), 64):
+            if sent_chunks is not None:
+                sent_chunks.append(i)
+            yield body[i : i + 64]
+
+    return httpx.Response(200, content=chunks())
+
+
+async def test_stream_raw_incident_data(mock_client):
+    sent_chunks: list[int] = []
+    client = mock_client(
+        partial(mock_streamed_raw_incident_pages, pages=3, sent_chunks=sent_chunks)
+    )
+    rows = client.analytics.stream_raw_incident_data(limit=3)
+    first = await rows.__anext__()
+    chunks_before_first_row = len(sent_chunks)
+    ids = [first.id] + [row.id async for row in rows]
+    assert ids == [f"P{p}-{i}" for p in range(3) for i in range(3)]
+    assert chunks_before_first_row < len(sent_chunks) / 3
+
+
+async def test_stream_raw_responses_for_incident(mock_client):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/missing/responses"):
+            return httpx.Response(404)
+        return await mock_raw_responses_for_incident()
+
+    client = mock_client(handler)
+    responses = [
+        r async for r in client.analytics.stream_raw_responses_for_incident("P1")
+    ]
+    missing = [
+        r async for r in client.analytics.stream_raw_responses_for_incident("missing")
+    ]
+    assert [r.responder_id for r in responses] == ["PCY5X6I", "PG7TXJ8"]
+    assert missing == []
+
+
+async def test_iter_raw_responses_for_incidents(client: APIClient):
+    async def mock_responses(method, endpoint, *args, **kwargs) -> httpx.Response:
+        if "missing" in endpoint:
+            return await mock_not_found()
+        await asyncio.sleep(0.01 if "slow" in endpoint else 0)
+        return await mock_raw_responses_for_incident()
+
+    incident = analytics.RawIncidentData.from_dict(
+        (await mock_get_raw_data_response()).json()["data"][0]
+    )
+    with mock.patch.object(client, "request", mock_responses):
+        results = [
+            r
+            async for r in client.analytics.iter_raw_responses_for_incidents(
+                ["slow", "missing", incident], concurrency=2
+            )
+        ]
+    by_id = {r.incident_id: r for r in results}
+    assert [r.incident_id for r in results][-1] == "slow"
+    assert not by_id["missing"].found and by_id["missing"].responses == []
+    assert by_id[incident.id].incident is incident
+    assert len(by_id["slow"].responses) == 2
+
+
+def test_aggregate_query_canonical_key():
+    a = analytics.AggregateQuery(
+        "services",
+        "week",
+        analytics.AnalyticsRequestFilters(service_ids=["P2", "P1"]),
+        "UTC",
+    )
+    b = analytics.AggregateQuery(
+        "services", "week", analytics.AnalyticsRequestFilters(service_ids=["P1", "P2"])
+    )
+    assert a == b and hash(a) == hash(b)
+    assert a != analytics.AggregateQuery("services", "month", a.filters)
+    assert a != analytics.AggregateQuery("teams", "week", a.filters)
+
+
+def test_aggregate_query_is_immutable():
+    filters = analytics.AnalyticsRequestFilters(service_ids=["P1"])
+    query = analytics.AggregateQuery("services", filters=filters)
+    planned = {query: None}
+    filters.service_ids.append("P2")
+    assert query in planned
+    assert query.filters.service_ids == ["P1"]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        query.domain = "teams"
+
+
+async def test_get_aggregated_data_batch():
+    sent = []
+    in_flight, peak = 0, 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        sent.append((request.url.path, json.loads(request.content)))
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        res = await mock_get_aggregate_incident_data()
+        return httpx.Response(200, content=res.content)
+
+    client = APIClient(
+        "test",
+        transport=httpx.MockTransport(handler),
+        rate_limiter=RateLimiter.unlimited(),
+    )
+    queries = [
+        analytics.AggregateQuery(domain, unit, time_zone=time_zone)
+        for domain in ["all", "services", "teams"]
+        for unit in ["day", "week"]
+        for time_zone in [None, "UTC", "America/New_York"]
+    ]
+    results = await client.analytics.get_aggregated_data_batch(queries)
+    assert len(results) == len(sent) == 12
+    assert peak == 8
+    assert results[queries[0]].data[0].total_incident_count == 1
+    assert {path for path, _ in sent} == {
+        "/analytics/metrics/incidents/all",
+        "/analytics/metrics/incidents/services",
+        "/analytics/metrics/incidents/teams",
+    }
+    await client.aclose()
+
+
+def test_raw_incident_responses_data_null_responder():
+    res = analytics.RawIncidentResponsesData.from_dict(
+        {
+            "requested_at": "2023-01-01T00:00:00",
+            "responded_at": None,
+            "responder_id": None,
+            "responder_name": None,
+            "responder_type": None,
+            "response_status": None,
+            "time_to_respond_seconds": None,
+        }
+    )
+    assert res.responder_id is None
+    assert res.response_status is None
@@ -0,0 +1,118 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Columnar raw incident tests."""
+
+import math
+from array import array
+from functools import partial
+from unittest import mock
+
+import pytest
+
+from asyncpd.client import APIClient
+from asyncpd.models import columnar
+
+from tests.models.test_analytics import mock_raw_incident_pages
+
+ROWS = [
+    {
+        "id": "P1",
+        "created_at": "2021-01-08T15:36:37",
+        "resolved_at": None,
+        "seconds_to_resolve": None,
+        "engaged_seconds": 10,
+        "major": True,
+        "service_id": "PS1",
+        "urgency": "high",
+    },
+    {
+        "id": "P2",
+        "created_at": "2021-01-08T15:36:38Z",
+        "resolved_at": "2021-01-08T15:39:52",
+        "seconds_to_resolve": 195,
+        "engaged_seconds": 0,
+        "major": None,
+        "service_id": "PS1",
+        "urgency": "low",
+    },
+]
+
+
+def test_categorical_column():
+    column = columnar.CategoricalColumn()
+    column.extend(["a", "b", None, "a"])
+    assert column.categories == ["a", "b", None]
+    assert list(column.codes) == [0, 1, 2, 0]
+    assert column[3] == "a"
+    assert column.to_list() == ["a", "b", None, "a"]
+
+
+def test_raw_incident_columns_without_numpy():
+    with mock.patch.object(columnar, "np", None):
+        columns = columnar.RawIncidentColumns()
+        columns.append_rows(ROWS)
+        seconds = columns["seconds_to_resolve"]
+        assert isinstance(seconds, array)
+        assert math.isnan(seconds[0]) and seconds[1] == 195
+        assert columns["created_at"][1] - columns["created_at"][0] == 1
+        assert columns["major"][0] == 1.0
+        assert columns["urgency"].to_list() == ["high", "low"]
+        assert columns.categorical("service_id").categories == ["PS1"]
+
+
+def test_raw_incident_columns_with_numpy():
+    np = pytest.importorskip("numpy")
+    columns = columnar.RawIncidentColumns()
+    columns.append_rows(ROWS)
+    columns.append_rows(ROWS)
+    assert len(columns) == 4
+    assert np.nansum(columns["seconds_to_resolve"]) == 390
+    assert columns["service_id"].codes.tolist() == [0, 0, 0, 0]
+
+
+def test_raw_incident_columns_extend_and_to_rows():
+    columns = columnar.RawIncidentColumns(
+        numeric_fields=["engaged_seconds"],
+        timestamp_fields=[],
+        categorical_fields=["urgency"],
+    )
+    columns.append_rows(ROWS)
+    other = columnar.RawIncidentColumns(
+        numeric_fields=["engaged_seconds"],
+        timestamp_fields=[],
+        categorical_fields=["urgency"],
+    )
+    other.extend(columns)
+    assert other.to_rows() == [
+        {"id": "P1", "engaged_seconds": 10, "urgency": "high"},
+        {"id": "P2", "engaged_seconds": 0, "urgency": "low"},
+    ]
+    with pytest.raises(ValueError):
+        other.extend(columnar.RawIncidentColumns())
+
+
+async def test_get_raw_incident_columns(client: APIClient):
+    with mock.patch.object(
+        client, "request", side_effect=partial(mock_raw_incident_pages, pages=3)
+    ):
+        columns = await client.analytics.get_raw_incident_columns()
+        assert len(columns) == 6
+        assert columns.ids[-1] == "P2-1"
+
+        more = await client.analytics.get_raw_incident_columns(
+            columns=columns, max_pages=1
+        )
+        assert more is columns
+        assert len(columns) == 8
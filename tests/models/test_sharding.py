@@ -0,0 +1,161 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Time-window sharding tests."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from unittest import mock
+
+import pytest
+
+from asyncpd.models.analytics import AnalyticsRequestFilters
+from asyncpd.models.sharding import ShardedWalk, split_time_range
+from asyncpd.ratelimit import RateLimiter
+from asyncpd.testing import FakePagerDuty
+
+START = datetime(2021, 1, 1)
+
+
+def walk_table(
+    start: datetime,
+    end: datetime,
+    order: str = "asc",
+    *,
+    timestamps: list,
+    page_size: int = 2,
+):
+    """Walk an in-memory incident table the way the raw incidents cursor does."""
+    rows = [
+        {"id": f"P{i}", "created_at": ts.isoformat(), "n": i % 3}
+        for i, ts in enumerate(timestamps)
+        if start <= ts < end
+    ]
+    rows.sort(key=lambda r: r["created_at"], reverse=order == "desc")
+
+    async def pages():
+        for i in range(0, max(len(rows), 1), page_size):
+            yield {
+                "data": rows[i : i + page_size],
+                "more": i + page_size < len(rows),
+            }
+
+    return pages()
+
+
+def test_split_time_range():
+    windows = split_time_range(START, START + timedelta(days=4), 4)
+    assert len(windows) == 4
+    assert windows[0] == (START, START + timedelta(days=1))
+    assert windows[-1][1] == START + timedelta(days=4)
+    with pytest.raises(ValueError):
+        split_time_range(START, START, 2)
+
+
+async def test_sharded_walk_concatenates_windows_in_order():
+    timestamps = [START + timedelta(hours=7 * i) for i in range(20)]
+    walk = mock.Mock(side_effect=partial(walk_table, timestamps=timestamps))
+    walker = ShardedWalk(walk, order="asc", concurrency=4)
+    windows = split_time_range(START, START + timedelta(days=10), 4)
+    rows = [r async for r in walker.iter_rows(windows)]
+    assert [r["id"] for r in rows] == [f"P{i}" for i in range(20)]
+    assert walk.call_count == 4
+
+
+async def test_sharded_walk_splits_dense_windows():
+    timestamps = [START + timedelta(minutes=10 * i) for i in range(40)]
+    timestamps += [START + timedelta(days=5)]
+    walk = mock.Mock(side_effect=partial(walk_table, timestamps=timestamps))
+    walker = ShardedWalk(walk, order="asc", split_after_pages=2, concurrency=2)
+    windows = split_time_range(START, START + timedelta(days=6), 2)
+    rows = [r async for r in walker.iter_rows(windows)]
+    assert [r["id"] for r in rows] == [f"P{i}" for i in range(41)]
+    assert walk.call_count > 2
+
+
+async def test_sharded_walk_splits_descending():
+    timestamps = [START + timedelta(minutes=10 * i) for i in range(30)]
+    walk = mock.Mock(
+        side_effect=partial(walk_table, order="desc", timestamps=timestamps)
+    )
+    walker = ShardedWalk(walk, order="desc", split_after_pages=1, concurrency=2)
+    windows = split_time_range(START, START + timedelta(days=1), 2)
+    rows = [r async for r in walker.iter_rows(windows)]
+    assert [r["id"] for r in rows] == [f"P{i}" for i in reversed(range(30))]
+    assert walk.call_count > 2
+
+
+async def test_sharded_walk_merges_other_columns():
+    timestamps = [START + timedelta(hours=i) for i in range(12)]
+
+    def sorted_walk(start, end):
+        async def pages():
+            walk = walk_table(start, end, timestamps=timestamps, page_size=100)
+            async for page in walk:
+                page["data"].sort(key=lambda r: r["n"])
+                yield page
+
+        return pages()
+
+    walker = ShardedWalk(sorted_walk, order="asc", order_by="n", concurrency=3)
+    windows = split_time_range(START, START + timedelta(hours=12), 3)
+    rows = [r async for r in walker.iter_rows(windows)]
+    assert [r["n"] for r in rows] == sorted(r["n"] for r in rows)
+    assert len(rows) == 12
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_sharded_walk_splits_with_aware_bounds(order):
+    server = FakePagerDuty(incidents=400)
+    client = server.client(rate_limiter=RateLimiter.unlimited())
+    est = timezone(timedelta(hours=-5))
+    filters = AnalyticsRequestFilters(
+        created_at_start=datetime(2022, 12, 31, 19, tzinfo=est),
+        create_at_end=datetime(2023, 1, 31, 19, tzinfo=est),
+    )
+    ids = [
+        row.id
+        async for row in client.analytics.iter_raw_incident_data_sharded(
+            filters, shards=2, limit=10, order=order, split_after_pages=2
+        )
+    ]
+    await client.aclose()
+    assert len(ids) == len(set(ids))
+    assert set(ids) == {row["id"] for row in server.incidents}
+
+
+async def test_sharded_walk_bounds_pages_ahead():
+    timestamps = [START + timedelta(hours=i) for i in range(40)]
+    fetched = 0
+
+    def counting_walk(start, end):
+        async def pages():
+            nonlocal fetched
+            async for page in walk_table(
+                start, end, timestamps=timestamps, page_size=1
+            ):
+                fetched += 1
+                yield page
+
+        return pages()
+
+    walker = ShardedWalk(counting_walk, order="asc", max_pending_pages=2)
+    windows = split_time_range(START, START + timedelta(hours=40), 2)
+    rows = walker.iter_rows(windows)
+    assert (await rows.__anext__())["id"] == "P0"
+    await asyncio.sleep(0.01)
+    await rows.aclose()
+    # Each window holds its queue plus the page waiting to be queued.
+    assert fetched <= 2 * (2 + 2)
@@ -0,0 +1,150 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local aggregation tests."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from asyncpd import aggregate
+from asyncpd.models import columnar
+from asyncpd.models.analytics import AnalyticsRequestFilters, RawIncidentData
+
+from tests.models.test_analytics import mock_get_raw_data_response
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        if aggregate.np is None:
+            pytest.skip("numpy is not installed")
+    else:
+        monkeypatch.setattr(aggregate, "np", None)
+        monkeypatch.setattr(columnar, "np", None)
+    return request.param
+
+
+@pytest.fixture
+async def incidents() -> list:
+    row = (await mock_get_raw_data_response()).json()["data"][0]
+
+    def incident(id: str, created_at: str, **fields) -> RawIncidentData:
+        return RawIncidentData.from_dict(
+            {
+                **row,
+                "id": id,
+                "created_at": created_at,
+                "seconds_to_first_ack": 5,
+                **fields,
+            }
+        )
+
+    return [
+        # 23:30 on March 11th in New York, before the DST change.
+        incident("P1", "2023-03-12T04:30:00", service_id="S1", seconds_to_resolve=10),
+        # 23:30 on March 12th in New York, after the DST change.
+        incident("P2", "2023-03-13T03:30:00", service_id="S1", seconds_to_resolve=30),
+        incident(
+            "P3",
+            "2023-03-13T12:00:00",
+            service_id="S2",
+            service_name="Other",
+            seconds_to_resolve=None,
+            seconds_to_first_ack=None,
+            reassignment_count=2,
+            urgency="low",
+        ),
+        incident("P4", "2023-04-01T12:00:00", service_id="S2", service_name="Other"),
+    ]
+
+
+def test_aggregate_all(backend, incidents):
+    result = aggregate.LocalAggregator(incidents).aggregate()
+    assert list(result) == [(None, None)]
+    metrics = result[(None, None)]
+    base = incidents[3]
+    assert metrics.total_incident_count == 4
+    assert metrics.mean_seconds_to_resolve == round((10 + 30 + 195) / 3)
+    assert metrics.total_incidents_reassigned == 1 + 3 * (base.reassignment_count > 0)
+    assert metrics.total_incidents_acknowledged == 3
+    assert metrics.total_engaged_seconds == 4 * base.engaged_seconds
+    assert metrics.up_time_pct is None
+
+
+def test_aggregate_by_service(backend, incidents):
+    result = aggregate.LocalAggregator(incidents).aggregate(group_by="service")
+    assert {k: m.total_incident_count for k, m in result.items()} == {
+        ("S1", None): 2,
+        ("S2", None): 2,
+    }
+    assert result[("S2", None)].service_name == "Other"
+    assert result[("S1", None)].service_id == "S1"
+
+
+def test_aggregate_filters(backend, incidents):
+    agg = aggregate.LocalAggregator(incidents)
+    filters = AnalyticsRequestFilters(
+        created_at_start=datetime(2023, 3, 13, tzinfo=timezone.utc),
+        create_at_end=datetime(2023, 4, 1),
+        service_ids=["S2"],
+    )
+    assert agg.aggregate(filters)[(None, None)].total_incident_count == 1
+    urgency = agg.aggregate(AnalyticsRequestFilters(urgency="low"), "urgency")
+    assert list(urgency) == [("low", None)]
+    assert agg.aggregate(AnalyticsRequestFilters(service_ids=["missing"])) == {}
+
+
+@pytest.mark.parametrize(
+    "unit, time_zone, expected",
+    [
+        ("day", None, {(2023, 3, 12): 1, (2023, 3, 13): 2, (2023, 4, 1): 1}),
+        (
+            "day",
+            "America/New_York",
+            {(2023, 3, 11): 1, (2023, 3, 12): 1, (2023, 3, 13): 1, (2023, 4, 1): 1},
+        ),
+        (
+            "week",
+            "America/New_York",
+            {(2023, 3, 6): 2, (2023, 3, 13): 1, (2023, 3, 27): 1},
+        ),
+        ("month", None, {(2023, 3, 1): 3, (2023, 4, 1): 1}),
+    ],
+)
+def test_aggregate_buckets(backend, incidents, unit, time_zone, expected):
+    result = aggregate.LocalAggregator(incidents).aggregate(
+        aggregate_unit=unit, time_zone=time_zone
+    )
+    counts = {
+        (start.year, start.month, start.day): m.total_incident_count
+        for (_, start), m in result.items()
+    }
+    assert counts == expected
+    assert all(m.range_start.utcoffset() is not None for m in result.values())
+
+
+def test_aggregate_columns(backend, incidents):
+    columns = columnar.RawIncidentColumns()
+    columns.append_incidents(incidents)
+    result = aggregate.LocalAggregator(columns).aggregate(group_by="team")
+    assert sum(m.total_incident_count for m in result.values()) == 4
+
+
+def test_aggregate_rejects_bad_arguments(incidents):
+    agg = aggregate.LocalAggregator(incidents)
+    with pytest.raises(ValueError):
+        agg.aggregate(group_by="region")
+    with pytest.raises(ValueError):
+        agg.aggregate(aggregate_unit="day", time_zone="Not/AZone")
@@ -0,0 +1,103 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bulk executor tests."""
+
+import asyncio
+import json
+
+import httpx
+
+from asyncpd.models.addons import Addon, AddonsAPI, AddonType, AddonUpdateMask
+
+DELAYS = {"P1": 0.05, "P2": 0.01, "SLOW1": 10, "SLOW2": 10}
+
+
+async def mock_addon_by_id(request: httpx.Request) -> httpx.Response:
+    id = request.url.path.rsplit("/", 1)[-1]
+    await asyncio.sleep(DELAYS.get(id, 0))
+    if id == "missing":
+        return httpx.Response(404)
+    if id == "broken":
+        return httpx.Response(500)
+    addon = {"id": id, "type": "full_page_addon", "src": "https://x"}
+    if request.method == "PUT":
+        addon.update(json.loads(request.content)["addons"])
+    return httpx.Response(200, json={"addon": addon})
+
+
+async def test_bulk_ordered_collects_errors(mock_client):
+    client = mock_client(mock_addon_by_id)
+    results = [
+        r async for r in client.bulk(AddonsAPI.get, ["P1", "missing", "broken", "P2"])
+    ]
+    assert [r.item for r in results] == ["P1", "missing", "broken", "P2"]
+    assert [r.ok for r in results] == [True, True, False, True]
+    assert isinstance(results[0].result, Addon)
+    assert results[1].result is None
+    assert isinstance(results[2].error, httpx.HTTPStatusError)
+
+
+async def test_bulk_as_completed(mock_client):
+    client = mock_client(mock_addon_by_id)
+    results = [
+        r.item
+        async for r in client.bulk(AddonsAPI.get, ["P1", "P2"], 2, ordered=False)
+    ]
+    assert results == ["P2", "P1"]
+
+
+async def test_bulk_bound_method_and_concurrency(mock_client):
+    client = mock_client(mock_addon_by_id)
+    running, peak = 0, 0
+
+    async def get(id: str):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            return await client.addons.get(id)
+        finally:
+            running -= 1
+
+    ids = [f"P{i}" for i in range(10)]
+    results = [r async for r in client.bulk(get, ids, concurrency=3)]
+    assert [r.result.id for r in results] == ids
+    assert peak == 3
+
+
+async def test_bulk_unpacks_argument_tuples(mock_client, sent):
+    client = mock_client(mock_addon_by_id)
+    updates = [
+        (id, AddonUpdateMask(f"addon {id}", "https://y", AddonType.FULL_PAGE_ADDON))
+        for id in ("P3", "P4")
+    ]
+    results = [r async for r in client.bulk(AddonsAPI.update, updates, unpack=True)]
+    assert [r.item for r in results] == updates
+    assert [r.result.name for r in results] == ["addon P3", "addon P4"]
+    assert {r.method for r in sent} == {"PUT"}
+
+
+async def test_bulk_cancels_in_flight_calls_on_close(mock_client):
+    client = mock_client(mock_addon_by_id)
+    results = client.bulk(AddonsAPI.get, ["P0", "SLOW1", "SLOW2"], concurrency=3)
+    first = await results.__anext__()
+    assert first.item == "P0"
+    await asyncio.wait_for(results.aclose(), 1)
+
+
+async def test_pool_bulk(mock_pool):
+    pool = mock_pool(["a", "b"], mock_addon_by_id)
+    results = [r async for r in pool.bulk(AddonsAPI.get, ["P1", "P2", "P3"])]
+    assert [r.result.id for r in results] == ["P1", "P2", "P3"]
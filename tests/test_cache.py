@@ -0,0 +1,92 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Response cache tests."""
+
+import asyncio
+
+import httpx
+
+from asyncpd.cache import ResponseCache
+from asyncpd.models import addons
+
+ADDON = {"id": "P1", "type": "full_page_addon", "src": "https://x"}
+
+
+def test_cache_ttl_prefixes():
+    cache = ResponseCache(ttl=10, ttls={"/addons": 5, "/addons/P1": 0})
+    assert cache.ttl_for("/abilities") == 10
+    assert cache.ttl_for("/addons/P2") == 5
+    assert cache.ttl_for("/addons/P1") == 0
+
+    cache.set("k", "/addons/P1", httpx.Response(200))
+    assert cache.get("k") is None
+
+
+def test_cache_lru_eviction():
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.set("a", "/a", httpx.Response(200, content=b"1234"))
+    cache.set("b", "/b", httpx.Response(200, content=b"1234"))
+    assert cache.get("a") is not None
+    cache.set("c", "/c", httpx.Response(200, content=b"1234"))
+    assert cache.get("b") is None
+    assert len(cache) == 2
+    cache.set("d", "/d", httpx.Response(200, content=b"123456789"))
+    assert len(cache) == 1
+    assert cache.size == 9
+
+
+def test_cache_invalidation_drops_in_flight_responses():
+    cache = ResponseCache()
+    cache.set("a", "/addons", httpx.Response(200))
+    generation = cache.generation
+    cache.invalidate("/addons")
+    assert cache.get("a") is None
+    cache.set("a", "/addons", httpx.Response(200), generation)
+    assert cache.get("a") is None
+
+
+def numbered_addon(number: int) -> httpx.Response:
+    return httpx.Response(200, json={"addon": {**ADDON, "name": str(number)}})
+
+
+async def test_client_serves_cached_responses(mock_client, sent):
+    client = mock_client(
+        lambda request: numbered_addon(len(sent)), cache=ResponseCache(ttl=60)
+    )
+    first = await client.addons.get("P1")
+    second = await client.addons.get("P1")
+    assert first == second
+    assert len(sent) == 1
+
+    await client.addons.update(
+        "P1", addons.AddonUpdateMask("n", "https://x", addons.AddonType.FULL_PAGE_ADDON)
+    )
+    third = await client.addons.get("P1")
+    assert third is not None and third.name == "3"
+
+
+async def test_client_stale_while_revalidate(mock_client, sent):
+    client = mock_client(
+        lambda request: numbered_addon(len(sent)),
+        cache=ResponseCache(ttl=0.01, stale_while_revalidate=60),
+    )
+    await client.addons.get("P1")
+    await asyncio.sleep(0.02)
+    stale = await client.addons.get("P1")
+    assert stale is not None and stale.name == "1"
+    await asyncio.sleep(0.01)
+    fresh = await client.addons.get("P1")
+    assert fresh is not None and fresh.name == "2"
+    assert len(sent) == 2
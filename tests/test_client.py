@@ -16,7 +16,11 @@
 """Tests for httpx adapter client."""
 
 
+import asyncio
 import os
+
+import httpx
+
 from asyncpd.client import APIClient
 from asyncpd.models.abilities import AbilitiesAPI
 from asyncpd.models.addons import AddonsAPI
@@ -44,3 +48,61 @@ async def test_client_api_resource_properties():
     assert isinstance(client.abilities, AbilitiesAPI)
     assert isinstance(client.addons, AddonsAPI)
     assert isinstance(client.analytics, AnalyticsAPI)
+
+
+async def test_client_custom_transport_and_pool():
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"abilities": ["sso"]})
+
+    client = APIClient(
+        "test",
+        transport=httpx.MockTransport(handler),
+        limits=httpx.Limits(max_connections=4, keepalive_expiry=10),
+        timeout=httpx.Timeout(2.0, read=10.0),
+    )
+    assert await client.abilities.list() == ["sso"]
+    assert seen[0].headers["Authorization"] == "Token test"
+    assert seen[0].extensions["timeout"]["read"] == 10.0
+
+    await client.prewarm(3)
+    assert [r.method for r in seen[1:]] == ["HEAD"] * 3
+    await client.aclose()
+
+
+async def test_client_coalesces_identical_gets():
+    seen: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"abilities": ["sso"]})
+
+    client = APIClient("test", transport=httpx.MockTransport(handler))
+    results = await asyncio.gather(
+        *(client.abilities.list() for _ in range(10)),
+        client.request("GET", "/abilities", params=[("x", 1)]),
+    )
+    assert results[:10] == [["sso"]] * 10
+    assert len(seen) == 2
+
+    await client.abilities.list()
+    assert len(seen) == 3
+
+    client.coalesce = False
+    await asyncio.gather(*(client.abilities.list() for _ in range(3)))
+    assert len(seen) == 6
+    await client.aclose()
+
+
+async def test_client_build_request_matches_sent_request(mock_client, sent):
+    client = mock_client(lambda request: httpx.Response(200))
+    data = {"filters": {"service_ids": ["P1"]}, "limit": 10}
+    built = client.build_request("POST", "/analytics/raw/incidents", data=data)
+    await client.request("POST", "/analytics/raw/incidents", data=data)
+    assert built.url == sent[0].url
+    assert built.read() == sent[0].read()
+    assert built.headers["Content-Type"] == sent[0].headers["Content-Type"]
+    assert built.headers["Authorization"] == "Token test"
@@ -0,0 +1,79 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bounded concurrency helpers tests."""
+
+import asyncio
+
+import pytest
+
+from asyncpd.concurrency import bounded_map
+
+
+class Probe:
+    def __init__(self) -> None:
+        self.running = 0
+        self.peak = 0
+        self.cancelled = 0
+
+    async def __call__(self, delay: float) -> float:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.running -= 1
+        if delay < 0:
+            raise ValueError(delay)
+        return delay
+
+
+async def delays():
+    for delay in [0.03, 0.01, -0.001, 0.02, 0.0]:
+        yield delay
+
+
+async def test_bounded_map_as_completed():
+    probe = Probe()
+    results = [(item, task) async for item, task in bounded_map(probe, delays(), 2)]
+    assert probe.peak == 2
+    assert sorted(item for item, _ in results) == [-0.001, 0.0, 0.01, 0.02, 0.03]
+    assert [item for item, _ in results][:2] == [0.01, -0.001]
+    errors = [task.exception() for _, task in results if task.exception()]
+    assert [str(e) for e in errors] == ["-0.001"]
+
+
+async def test_bounded_map_ordered():
+    probe = Probe()
+    results = [r async for r in bounded_map(probe, delays(), 3, ordered=True)]
+    assert [item for item, _ in results] == [0.03, 0.01, -0.001, 0.02, 0.0]
+    assert isinstance(results[2][1].exception(), ValueError)
+    assert probe.peak == 3
+
+
+async def test_bounded_map_cancels_on_close():
+    probe = Probe()
+    results = bounded_map(probe, [0.0, 10, 10], 3)
+    item, _ = await results.__anext__()
+    await results.aclose()
+    assert item == 0.0
+    assert probe.cancelled == 2 and probe.running == 0
+
+
+async def test_bounded_map_rejects_zero_concurrency():
+    with pytest.raises(ValueError):
+        [x async for x in bounded_map(Probe(), [1], 0)]
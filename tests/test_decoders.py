@@ -0,0 +1,66 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""JSON decoders tests."""
+
+import httpx
+import pytest
+
+from asyncpd import decoders
+from asyncpd.client import APIClient
+
+BODY = b'{"addon": {"id": "P1", "name": "Status \\u00e9"}, "more": false}'
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_decoders_agree(name: str):
+    if name != "json" and getattr(decoders, name) is None:
+        pytest.skip(f"{name} is not installed")
+    assert decoders.get_decoder(name)(BODY) == decoders.stdlib_decoder(BODY)
+
+
+def test_get_decoder():
+    assert decoders.get_decoder() is decoders.default_decoder()
+    assert decoders.get_decoder(decoders.stdlib_decoder) is decoders.stdlib_decoder
+    with pytest.raises(ValueError):
+        decoders.get_decoder("yaml")
+
+
+async def test_client_decodes_with_decoder():
+    calls = []
+
+    def decoder(content: bytes) -> dict:
+        calls.append(content)
+        return decoders.stdlib_decoder(content)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={
+                "addon": {
+                    "id": "P1",
+                    "type": "full_page_addon",
+                    "summary": "Status",
+                    "self": "https://api.pagerduty.com/addons/P1",
+                    "name": "Status",
+                    "src": "https://example.com",
+                }
+            },
+        )
+
+    client = APIClient("x", transport=httpx.MockTransport(handler), decoder=decoder)
+    addon = await client.addons.get("P1")
+    await client.aclose()
+    assert addon is not None and addon.id == "P1"
+    assert len(calls) == 1
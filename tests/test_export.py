@@ -0,0 +1,120 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Raw incident exporter tests."""
+
+import asyncio
+import csv
+import gzip
+import json
+from datetime import datetime
+from functools import partial
+
+import httpx
+import pytest
+
+from asyncpd import export, mirror
+from asyncpd.client import APIClient
+
+from tests.models.test_analytics import mock_streamed_raw_incident_pages
+
+
+@pytest.fixture
+def stream_client(mock_client) -> APIClient:
+    return mock_client(
+        partial(mock_streamed_raw_incident_pages, pages=3, rows_per_page=5)
+    )
+
+
+def test_infer_format_and_compression():
+    assert export.infer_format("incidents.csv.gz") == "csv"
+    assert export.infer_format("incidents.jsonl") == "ndjson"
+    assert export.infer_compression("incidents.csv.gz") == "gzip"
+    assert export.infer_compression("incidents.ndjson.xz") == "xz"
+    assert export.infer_compression("incidents.csv") is None
+
+
+async def test_export_ndjson_gzip(stream_client: APIClient, tmp_path):
+    path = str(tmp_path / "incidents.ndjson.gz")
+    count = await export.export_raw_incidents(
+        stream_client.analytics, path, batch_size=4, max_pending_batches=1
+    )
+    with gzip.open(path, "rt") as f:
+        rows = [json.loads(line) for line in f]
+    assert count == 15
+    assert [r["id"] for r in rows] == [f"P{p}-{i}" for p in range(3) for i in range(5)]
+
+
+async def test_export_csv(stream_client: APIClient, tmp_path):
+    path = str(tmp_path / "incidents.csv")
+    count = await export.export_raw_incidents(stream_client.analytics, path)
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert count == len(rows) == 15
+    assert list(rows[0]) == list(export.RAW_INCIDENT_COLUMNS)
+
+
+async def test_export_raises_api_errors(mock_client, tmp_path):
+    client = mock_client(lambda request: httpx.Response(400))
+    with pytest.raises(httpx.HTTPStatusError):
+        await export.export_raw_incidents(client.analytics, str(tmp_path / "x.csv"))
+
+
+def test_export_and_mirror_share_columns():
+    assert mirror.INCIDENT_COLUMNS == export.RAW_INCIDENT_COLUMNS
+    assert "snoozed_seconds" in export.RAW_INCIDENT_COLUMNS
+    assert "snoozed_secondS" not in export.RAW_INCIDENT_COLUMNS
+
+
+def test_parse_args():
+    args = export.parse_args(
+        ["--token", "t", "--since", "2023-01-01", "--service-id", "S1", "--major"]
+    )
+    filters = export.filters_from_args(args)
+    assert filters.created_at_start == datetime(2023, 1, 1)
+    assert filters.service_ids == ["S1"]
+    assert filters.major is True
+    assert args.output == "-"
+
+
+def test_parse_args_rejects_compressed_stdout():
+    with pytest.raises(SystemExit):
+        export.parse_args(["--token", "t", "--compression", "gzip"])
+    args = export.parse_args(["--token", "t", "-o", "x.gz", "--compression", "gzip"])
+    assert args.compression == "gzip"
+
+
+async def test_export_writer_error_stops_the_stream(stream_client: APIClient):
+    closed = False
+
+    async def rows():
+        nonlocal closed
+        try:
+            for i in range(100):
+                yield {"id": i}
+                await asyncio.sleep(0)
+        finally:
+            closed = True
+
+    class BrokenWriter:
+        def write(self, rows):
+            raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        await export._pipe(rows(), BrokenWriter(), batch_size=1, max_pending=1)
+    assert closed
+    pending = asyncio.all_tasks() - {asyncio.current_task()}
+    assert all(task.done() for task in pending)
+    with pytest.raises(ValueError):
+        await export.export_raw_incidents(stream_client.analytics, "-", compression="xz")
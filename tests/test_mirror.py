@@ -0,0 +1,87 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incident mirror tests."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from asyncpd.mirror import IncidentMirror
+from asyncpd.models.analytics import RawIncidentData, RawIncidentResponsesData
+
+from tests.models.test_analytics import (
+    mock_get_raw_data_response,
+    mock_raw_responses_for_incident,
+)
+
+T0 = datetime(2023, 1, 1)
+
+
+@pytest.fixture
+async def rows() -> list:
+    row = (await mock_get_raw_data_response()).json()["data"][0]
+    return [
+        {
+            **row,
+            "id": f"P{i}",
+            "created_at": (T0 + timedelta(hours=i)).isoformat(),
+            "service_id": f"S{i % 2}",
+            "priority_id": None if i % 3 else "PRIO",
+        }
+        for i in range(6)
+    ]
+
+
+def test_mirror_round_trips_models(rows: list):
+    incidents = [RawIncidentData.from_dict(r) for r in rows]
+    with IncidentMirror() as mirror:
+        assert mirror.upsert_incidents(incidents) == 6
+        assert mirror.get("P1") == incidents[1]
+        assert mirror.get("missing") is None
+
+
+def test_mirror_upserts_by_id(rows: list):
+    with IncidentMirror() as mirror:
+        mirror.upsert_incidents(rows)
+        mirror.upsert_incidents([{**rows[0], "status": "triggered"}])
+        assert len(mirror) == 6
+        assert mirror.get("P0").status == "triggered"
+
+
+def test_mirror_queries(rows: list, tmp_path):
+    with IncidentMirror(tmp_path / "mirror.db") as mirror:
+        mirror.upsert_incidents(rows)
+    with IncidentMirror(tmp_path / "mirror.db") as mirror:
+        since = datetime(2023, 1, 1, 1, tzinfo=timezone.utc)
+        found = mirror.incidents(since=since, service_ids=["S1"], order="desc")
+        assert [i.id for i in found] == ["P5", "P3", "P1"]
+        assert [i.id for i in mirror.incidents(limit=2)] == ["P0", "P1"]
+        assert [i.id for i in mirror.incidents(priority_ids=["PRIO"])] == ["P0", "P3"]
+        assert mirror.count_by("service_id", until=T0 + timedelta(hours=3)) == {
+            "S0": 2,
+            "S1": 1,
+        }
+        with pytest.raises(ValueError):
+            mirror.count_by("id; DROP TABLE incidents")
+
+
+async def test_mirror_responses():
+    body = (await mock_raw_responses_for_incident()).json()
+    responses = [RawIncidentResponsesData.from_dict(r) for r in body["responses"]]
+    with IncidentMirror() as mirror:
+        assert mirror.replace_responses("P1", body["responses"]) == 2
+        assert mirror.replace_responses("P1", responses) == 2
+        assert mirror.responses("P1") == responses
+        assert mirror.responses("P2") == []
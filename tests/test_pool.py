@@ -0,0 +1,96 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Client pool tests."""
+
+import asyncio
+from collections import Counter
+
+import httpx
+import pytest
+
+from asyncpd import ClientPool
+from asyncpd.cache import ResponseCache
+from asyncpd.ratelimit import RateLimiter
+from asyncpd.retry import RetryPolicy
+
+
+async def mock_pool_response(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(0.01)
+    return httpx.Response(200, json={"abilities": ["sso"]})
+
+
+def tokens_of(sent) -> Counter:
+    return Counter(r.headers["Authorization"] for r in sent)
+
+
+async def test_pool_spreads_load_across_tokens(mock_pool, sent):
+    pool = mock_pool(["a", "b", "c"], mock_pool_response, coalesce=False)
+    await asyncio.gather(*(pool.abilities.list() for _ in range(30)))
+    assert tokens_of(sent) == {"Token a": 10, "Token b": 10, "Token c": 10}
+    assert all(pool.in_flight(str(i)) == 0 for i in range(3))
+
+
+async def test_pool_sticky_routing(mock_pool, sent):
+    pool = mock_pool({"prod": "a", "staging": "b"}, mock_pool_response)
+    for _ in range(5):
+        await pool.request("GET", "/abilities", route_key="staging")
+        await pool.request("GET", "/abilities", route_key="incident-P1")
+    assert tokens_of(sent)["Token b"] >= 5
+    assert pool.route("incident-P1") == pool.route("incident-P1")
+    assert pool.client_for("prod") is pool["prod"]
+
+
+def test_pool_requires_clients():
+    with pytest.raises(ValueError):
+        ClientPool([])
+
+
+async def test_pool_coalesces_identical_gets(mock_pool, sent):
+    pool = mock_pool(["a", "b"], mock_pool_response)
+    await asyncio.gather(*(pool.abilities.list() for _ in range(10)))
+    assert len(sent) == 1
+
+
+async def test_pool_coalesced_gets_keep_idempotent(mock_pool, sent):
+    pool = mock_pool(
+        ["a", "b"], lambda request: httpx.Response(503), retry=RetryPolicy(base_delay=0)
+    )
+    res = await pool.request("GET", "/abilities", idempotent=False)
+    assert res.status_code == 503
+    assert len(sent) == 1
+    await pool.request("GET", "/abilities")
+    assert len(sent) == 1 + pool["0"].retry.max_attempts
+
+
+async def test_pool_close_stops_abilities_refresh(mock_pool):
+    pool = mock_pool(["a", "b"], mock_pool_response)
+    pool.abilities.start_background_refresh(interval=0.01)
+    await asyncio.sleep(0.02)
+    await pool.aclose()
+    pending = asyncio.all_tasks() - {asyncio.current_task()}
+    assert all(task.done() for task in pending)
+
+
+async def test_pool_clients_do_not_share_state():
+    pool = ClientPool.from_tokens(
+        ["a", "b"], rate_limiter_factory=RateLimiter, cache_factory=ResponseCache
+    )
+    assert pool["0"].rate_limiter is not pool["1"].rate_limiter
+    assert pool["0"].cache is not pool["1"].cache
+    await pool.aclose()
+    with pytest.raises(ValueError):
+        ClientPool.from_tokens(["a", "b"], rate_limiter=RateLimiter())
+    with pytest.raises(ValueError):
+        ClientPool.from_tokens(["a", "b"], cache=ResponseCache())
@@ -0,0 +1,83 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Rate limiter tests."""
+
+import asyncio
+import math
+import time
+from unittest import mock
+
+import httpx
+
+from asyncpd.client import APIClient
+from asyncpd.ratelimit import RateLimiter, TokenBucket, parse_retry_after
+
+
+async def test_token_bucket_paces_requests():
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+    assert time.monotonic() - start >= 0.09
+
+
+async def test_token_bucket_pause():
+    bucket = TokenBucket(rate=math.inf)
+    bucket.pause(0.05)
+    start = time.monotonic()
+    await bucket.acquire()
+    assert time.monotonic() - start >= 0.04
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_rate_limiter_buckets():
+    limiter = RateLimiter()
+    assert limiter.bucket_for("/analytics/raw/incidents") is limiter.analytics
+    assert limiter.bucket_for("/addons") is limiter.rest
+
+
+def test_rate_limiter_observes_headers():
+    limiter = RateLimiter()
+    limiter.observe(
+        "/addons",
+        httpx.Response(
+            200, headers={"ratelimit-remaining": "10", "ratelimit-reset": "5"}
+        ),
+    )
+    assert limiter.rest.rate == 2
+    assert limiter.rest.tokens < 11
+
+    limiter.observe("/analytics/raw/incidents", httpx.Response(429))
+    assert limiter.analytics.rate == 2
+    assert limiter.analytics.tokens < 1
+
+
+async def test_client_requests_are_rate_limited():
+    limiter = RateLimiter(rest=TokenBucket(rate=50, capacity=1))
+    client = APIClient("test", rate_limiter=limiter, coalesce=False)
+
+    async def mock_send(*args, **kwargs) -> httpx.Response:
+        return httpx.Response(200, json={"abilities": []})
+
+    with mock.patch.object(httpx.AsyncClient, "request", mock_send):
+        start = time.monotonic()
+        await asyncio.gather(*(client.abilities.list() for _ in range(4)))
+        assert time.monotonic() - start >= 0.05
+    await client.aclose()
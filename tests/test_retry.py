@@ -0,0 +1,74 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Retry policy tests."""
+
+from unittest import mock
+
+import httpx
+import pytest
+
+from asyncpd.retry import RetryPolicy
+
+
+def abilities_response(status: int) -> httpx.Response:
+    return httpx.Response(status, json={"abilities": ["sso"]})
+
+
+def test_retry_policy_idempotency():
+    policy = RetryPolicy()
+    assert policy.is_idempotent("GET", "/addons")
+    assert policy.is_idempotent("POST", "/analytics/raw/incidents")
+    assert not policy.is_idempotent("POST", "/addons")
+    assert not policy.is_idempotent("DELETE", "/addons/P1")
+
+
+def test_retry_policy_backoff():
+    policy = RetryPolicy(base_delay=1, max_delay=4, jitter=0)
+    assert [policy.backoff(a) for a in (1, 2, 3, 4)] == [1, 2, 4, 4]
+    assert policy.backoff(1, retry_after=10) == 10
+    assert 0 <= RetryPolicy(base_delay=1).backoff(3) <= 4
+
+
+async def test_client_retries_transient_errors(mock_client, sent):
+    handler = mock.Mock(
+        side_effect=[
+            abilities_response(503),
+            httpx.ReadError("reset"),
+            abilities_response(200),
+        ]
+    )
+    client = mock_client(handler, retry=RetryPolicy(base_delay=0))
+    assert await client.abilities.list() == ["sso"]
+    assert len(sent) == 3
+
+
+async def test_client_gives_up_after_max_attempts(mock_client, sent):
+    handler = mock.Mock(side_effect=[abilities_response(502) for _ in range(3)])
+    client = mock_client(handler, retry=RetryPolicy(base_delay=0))
+    res = await client.request("GET", "/abilities")
+    assert res.status_code == 502
+    assert len(sent) == 3
+
+
+async def test_client_does_not_retry_unsafe_requests(mock_client, sent):
+    handler = mock.Mock(
+        side_effect=[abilities_response(503), httpx.ReadError("reset")]
+    )
+    client = mock_client(handler, retry=RetryPolicy(base_delay=0))
+    res = await client.request("POST", "/addons", data={})
+    assert res.status_code == 503
+    with pytest.raises(httpx.ReadError):
+        await client.request("DELETE", "/addons/P1")
+    assert [r.method for r in sent] == ["POST", "DELETE"]
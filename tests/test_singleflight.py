@@ -0,0 +1,59 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Single-flight tests."""
+
+import asyncio
+
+import pytest
+
+from asyncpd.singleflight import SingleFlight
+
+
+async def test_single_flight_shares_results_and_errors():
+    group: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    async def work() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if calls > 1:
+            raise RuntimeError("boom")
+        return 42
+
+    assert await asyncio.gather(*(group.do("k", work) for _ in range(5))) == [42] * 5
+    assert len(group) == 0
+
+    results = await asyncio.gather(
+        *(group.do("k", work) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert calls == 2
+
+
+async def test_single_flight_waiter_cancellation():
+    group: SingleFlight[int] = SingleFlight()
+
+    async def work() -> int:
+        await asyncio.sleep(0.02)
+        return 1
+
+    first = asyncio.ensure_future(group.do("k", work))
+    second = asyncio.ensure_future(group.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == 1
+    with pytest.raises(asyncio.CancelledError):
+        await first
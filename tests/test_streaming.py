@@ -0,0 +1,84 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming JSON parser tests."""
+
+import json
+
+import httpx
+import pytest
+
+from asyncpd.client import APIClient
+from asyncpd.ratelimit import RateLimiter
+from asyncpd.streaming import JSONArrayStream
+
+BODY = {
+    "limit": 1000,
+    "filters": {"data": [1]},
+    "data": [{"id": i, "name": "é" * i} for i in range(20)] + [1, 2.5, None, -1e-5],
+    "more": True,
+    "last": "abc",
+}
+
+
+def feed_in_chunks(body: bytes, size: int) -> tuple:
+    parser = JSONArrayStream("data")
+    rows = []
+    for i in range(0, len(body), size):
+        rows.extend(parser.feed(body[i : i + size]))
+    return rows, parser.close()
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64, 100000])
+def test_json_array_stream(size: int):
+    body = json.dumps(BODY, ensure_ascii=False, indent=2).encode()
+    rows, metadata = feed_in_chunks(body, size)
+    assert rows == BODY["data"]
+    assert metadata == {**BODY, "data": []}
+
+
+def test_json_array_stream_yields_rows_before_the_end():
+    parser = JSONArrayStream("data")
+    assert parser.feed(b'{"data": [{"id": 1}, {"id"') == [{"id": 1}]
+    assert parser.feed(b': 2}], "more": false}') == [{"id": 2}]
+    assert parser.close() == {"data": [], "more": False}
+
+
+@pytest.mark.parametrize(
+    "body", [b'{"data": [{"id": 1}', b'[{"id": 1}]', b'{"data": []} {}', b""]
+)
+def test_json_array_stream_rejects_invalid_bodies(body: bytes):
+    with pytest.raises(ValueError):
+        feed_in_chunks(body, 4)
+
+
+async def test_client_stream_releases_connection():
+    async def chunks():
+        yield b'{"data": ['
+        yield b'{"id": 1}]}'
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=chunks())
+
+    client = APIClient(
+        "x",
+        transport=httpx.MockTransport(handler),
+        rate_limiter=RateLimiter.unlimited(),
+    )
+    async with client.stream("GET", "/things") as res:
+        assert not res.is_closed
+        body = b"".join([chunk async for chunk in res.aiter_bytes()])
+    await client.aclose()
+    assert res.is_closed
+    assert json.loads(body) == {"data": [{"id": 1}]}
@@ -0,0 +1,173 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental sync tests."""
+
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import httpx
+import pytest
+
+from asyncpd import sync
+from asyncpd.client import APIClient
+
+from tests.models.test_analytics import mock_get_raw_data_response
+
+
+class FakeIncidents:
+    """Serves raw incident pages filtered by creation date, in ascending order."""
+
+    def __init__(self) -> None:
+        self.rows: dict = {}
+        self.requests: list = []
+
+    async def add(self, id: str, created_at: datetime, **fields) -> None:
+        row = (await mock_get_raw_data_response()).json()["data"][0]
+        self.rows[id] = {
+            **row,
+            "id": id,
+            "created_at": created_at.isoformat(),
+            **fields,
+        }
+
+    async def request(self, *args, **kwargs) -> httpx.Response:
+        body = kwargs["data"]
+        self.requests.append(body)
+        start = datetime.fromisoformat(body["filters"]["created_at_start"])
+        end = datetime.fromisoformat(body["filters"]["created_at_end"])
+        rows = sorted(
+            (
+                r
+                for r in self.rows.values()
+                if start <= datetime.fromisoformat(r["created_at"]) < end
+            ),
+            key=lambda r: r["created_at"],
+        )
+        offset = int(body["starting_after"] or 0)
+        page = rows[offset : offset + body["limit"]]
+        more = offset + body["limit"] < len(rows)
+        return httpx.Response(
+            200,
+            json={
+                "data": page,
+                "more": more,
+                "last": str(offset + len(page)),
+                "limit": body["limit"],
+            },
+        )
+
+
+T0 = datetime(2023, 1, 1)
+
+
+@pytest.fixture
+async def incidents(client: APIClient):
+    fake = FakeIncidents()
+    for i in range(5):
+        await fake.add(f"P{i}", T0 + timedelta(hours=i))
+    with mock.patch.object(client, "request", fake.request):
+        yield fake
+
+
+@pytest.mark.parametrize(
+    "make_store",
+    [
+        lambda tmp_path: sync.MemoryCheckpointStore(),
+        lambda tmp_path: sync.FileCheckpointStore(tmp_path / "watermarks.json"),
+        lambda tmp_path: sync.SQLiteCheckpointStore(tmp_path / "watermarks.db"),
+    ],
+)
+def test_checkpoint_stores(make_store, tmp_path):
+    store = make_store(tmp_path)
+    assert store.load("a") is None
+    wm = sync.Watermark(
+        created_at=T0, cursor="3", fingerprints={"P1": ["x", T0.isoformat()]}
+    )
+    store.save("a", wm)
+    store.save("b", sync.Watermark())
+    assert store.load("a") == wm
+    assert store.load("b") == sync.Watermark()
+
+
+async def test_incremental_sync(client: APIClient, incidents: FakeIncidents):
+    job = sync.IncrementalSync(
+        client.analytics,
+        sync.MemoryCheckpointStore(),
+        lookback=timedelta(hours=2),
+        limit=2,
+    )
+    with pytest.raises(ValueError):
+        [i async for i in job.changes()]
+
+    first = [i.id async for i in job.changes(since=T0, until=T0 + timedelta(hours=5))]
+    assert first == ["P0", "P1", "P2", "P3", "P4"]
+    assert (await job.watermark()).created_at == T0 + timedelta(hours=5)
+
+    await incidents.add("P4", T0 + timedelta(hours=4), status="resolved", major=True)
+    await incidents.add("P5", T0 + timedelta(hours=5, minutes=30))
+    incidents.requests.clear()
+    second = [i.id async for i in job.changes(until=T0 + timedelta(hours=6))]
+    assert second == ["P4", "P5"]
+    assert job.stats == sync.SyncStats(fetched=3, new=1, changed=1)
+    assert incidents.requests[0]["filters"]["created_at_start"] == (
+        T0 + timedelta(hours=3)
+    ).isoformat()
+
+
+async def test_incremental_sync_resumes_from_cursor(
+    client: APIClient, incidents: FakeIncidents
+):
+    store = sync.MemoryCheckpointStore()
+    job = sync.IncrementalSync(client.analytics, store, limit=2)
+    until = datetime(2023, 1, 1, 5, tzinfo=timezone.utc)
+    rows = job.changes(since=T0, until=until)
+    seen = [(await rows.__anext__()).id for _ in range(3)]
+    await rows.aclose()
+    assert seen == ["P0", "P1", "P2"]
+    assert (await job.watermark()).cursor == "2"
+
+    resumed = [i.id async for i in job.changes()]
+    assert resumed == ["P2", "P3", "P4"]
+    assert (await job.watermark()).created_at == T0 + timedelta(hours=5)
+
+
+def test_checkpoint_store_is_abstract(tmp_path):
+    class LoadOnly(sync.CheckpointStore):
+        def load(self, name):
+            return None
+
+    with pytest.raises(TypeError):
+        LoadOnly()
+    with pytest.raises(ValueError):
+        sync.SQLiteCheckpointStore(tmp_path / "watermarks.db", table="x; DROP")
+
+
+async def test_incremental_sync_checkpoint_interval(
+    client: APIClient, incidents: FakeIncidents
+):
+    class CountingStore(sync.MemoryCheckpointStore):
+        saves = 0
+
+        def save(self, name, watermark):
+            self.saves += 1
+            super().save(name, watermark)
+
+    store = CountingStore()
+    job = sync.IncrementalSync(client.analytics, store, limit=1, checkpoint_every=2)
+    until = T0 + timedelta(hours=5)
+    rows = [i.id async for i in job.changes(since=T0, until=until)]
+    assert len(rows) == 5
+    # Two interval checkpoints over five pages, then the final one.
+    assert store.saves == 3
@@ -0,0 +1,146 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Fake PagerDuty server tests."""
+
+import asyncio
+import time
+from datetime import datetime
+
+import httpx
+import pytest
+
+from asyncpd.models.analytics import AggregateQuery, AnalyticsRequestFilters
+from asyncpd.ratelimit import RateLimiter
+from asyncpd.retry import RetryPolicy
+from asyncpd.testing import FakePagerDuty
+
+
+def fast_retries() -> RetryPolicy:
+    return RetryPolicy(max_attempts=5, base_delay=0.001, jitter=0)
+
+
+async def test_fake_abilities_and_addons():
+    server = FakePagerDuty(addons=60)
+    client = server.client(rate_limiter=RateLimiter.unlimited())
+    assert await client.abilities.list() == ["sso", "teams", "read_only_users"]
+    assert await client.abilities.is_enabled("sso")
+    assert not await client.abilities.is_enabled("pagerduty_labs")
+
+    addons = [a async for a in client.addons.iter_all(limit=25)]
+    assert len(addons) == 60
+    assert len({a.id for a in addons}) == 60
+
+    await client.addons.delete("PA00001")
+    assert await client.addons.get("PA00001") is None
+    assert (await client.addons.get("PA00002")).id == "PA00002"
+    await client.aclose()
+
+
+async def test_fake_raw_incidents_cursor_paging():
+    server = FakePagerDuty(incidents=250)
+    client = server.client(rate_limiter=RateLimiter.unlimited())
+    filters = AnalyticsRequestFilters(
+        created_at_start=datetime(2023, 1, 5),
+        create_at_end=datetime(2023, 1, 20),
+        urgency="high",
+    )
+    incidents = [
+        i async for i in client.analytics.iter_raw_incident_data(filters, limit=20)
+    ]
+    expected = [
+        row
+        for row in server.incidents
+        if "2023-01-05" <= row["created_at"] < "2023-01-20"
+        and row["urgency"] == "high"
+    ]
+    assert len(incidents) == len(expected) > 20
+    assert len({i.id for i in incidents}) == len(expected)
+    created = [i.created_at for i in incidents]
+    assert created == sorted(created, reverse=True)
+
+    streamed = [
+        i async for i in client.analytics.stream_raw_incident_data(filters, limit=20)
+    ]
+    assert [i.id for i in streamed] == [i.id for i in incidents]
+
+    first = incidents[0]
+    assert await client.analytics.get_single_raw_incident_data(first.id) == first
+    responses = await client.analytics.get_raw_responses_for_incident(first.id)
+    assert len(responses.responses) == 3
+    assert await client.analytics.get_raw_responses_for_incident("missing") is None
+    await client.aclose()
+
+
+async def test_fake_aggregated_metrics():
+    server = FakePagerDuty(incidents=100)
+    client = server.client(rate_limiter=RateLimiter.unlimited())
+    results = await client.analytics.get_aggregated_data_batch(
+        [
+            AggregateQuery("all"),
+            AggregateQuery("services", "week"),
+            AggregateQuery("teams", "day", time_zone="America/New_York"),
+        ]
+    )
+    for res in results.values():
+        assert sum(m.total_incident_count for m in res.data) == 100
+    services = results[AggregateQuery("services", "week")].data
+    assert all(m.service_id and m.range_start for m in services)
+    await client.aclose()
+
+
+async def test_fake_rate_limit_retry_after():
+    server = FakePagerDuty(rate_limit=3, rate_limit_window=0.05)
+    async with httpx.AsyncClient(
+        transport=server.transport(), base_url="https://api.pagerduty.com"
+    ) as http:
+        res = await asyncio.gather(*(http.get("/abilities") for _ in range(5)))
+    assert [r.status_code for r in res] == [200, 200, 200, 429, 429]
+    assert res[2].headers["ratelimit-remaining"] == "0"
+    assert 0 < float(res[3].headers["retry-after"]) <= 0.05
+
+    client = server.client(rate_limiter=RateLimiter.unlimited(), retry=fast_retries())
+    ids = [f"PA{i:05d}" for i in range(8)]
+    results = await asyncio.gather(*(client.addons.get(id) for id in ids))
+    assert [r.id for r in results] == ids
+    await client.aclose()
+
+
+async def test_fake_error_injection():
+    server = FakePagerDuty()
+    client = server.client(rate_limiter=RateLimiter.unlimited(), retry=fast_retries())
+    server.fail_next(503, times=2, retry_after=0.01)
+    assert await client.abilities.list() == server.abilities
+    assert len(server.requests) == 3
+
+    server.fail_next(500)
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.abilities.list()
+
+    flaky = FakePagerDuty(error_rate=1.0, error_status=502)
+    flaky_client = flaky.client(retry=RetryPolicy.disabled())
+    with pytest.raises(httpx.HTTPStatusError) as e:
+        await flaky_client.abilities.list()
+    assert e.value.response.status_code == 502
+    await client.aclose()
+    await flaky_client.aclose()
+
+
+async def test_fake_latency_overlaps():
+    server = FakePagerDuty(latency=0.05)
+    client = server.client(rate_limiter=RateLimiter.unlimited())
+    start = time.perf_counter()
+    await asyncio.gather(*(client.addons.get(f"PA{i:05d}") for i in range(10)))
+    assert time.perf_counter() - start < 0.4
+    await client.aclose()
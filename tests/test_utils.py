@@ -0,0 +1,86 @@
+# Copyright 2023 Bradley Bonitatibus
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utilities tests."""
+
+import pickle
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+from asyncpd import utils
+from asyncpd.models.addons import Addon
+from asyncpd.models.analytics import AggregatedMetrics, RawIncidentData
+from asyncpd.models.service import ServiceReference
+
+
+def test_parse_pd_datetime_format():
+    expected = datetime(2021, 1, 8, 15, 36, 37)
+    assert utils.parse_pd_datetime_format("2021-01-08T15:36:37") == expected
+    assert utils.parse_pd_datetime_format("2021-01-08T15:36:37Z") == expected
+    assert utils.parse_pd_datetime_format("2021-01-08T15:36:37Z").tzinfo is None
+
+
+def test_parse_pd_datetime_format_offsets_are_naive_utc():
+    expected = datetime(2021, 1, 8, 15, 36, 37)
+    for ds in ("2021-01-08T10:36:37-05:00", "2021-01-08T15:36:37+00:00"):
+        parsed = utils.parse_pd_datetime_format(ds)
+        assert parsed == expected and parsed.tzinfo is None
+    assert utils.parse_pd_datetime_formats(["2021-01-08T17:36:37+02:00"]) == [
+        expected
+    ]
+
+
+def test_to_timestamp():
+    assert utils.to_timestamp(datetime(1970, 1, 2)) == 86400
+    assert utils.to_timestamp(datetime(1970, 1, 2, tzinfo=timezone.utc)) == 86400
+
+
+def test_parse_pd_datetime_formats():
+    parsed = utils.parse_pd_datetime_formats(
+        ["2021-01-08T15:36:37", None, "2021-01-08T15:36:37Z"]
+    )
+    assert parsed == [
+        datetime(2021, 1, 8, 15, 36, 37),
+        None,
+        datetime(2021, 1, 8, 15, 36, 37),
+    ]
+
+
+@utils.slotted
+@dataclass
+class Row:
+    id: str
+    tags: list = field(default_factory=list)
+    name: Optional[str] = None
+
+
+def test_slotted_dataclass():
+    row = Row("P1")
+    assert row == Row("P1", [], None)
+    assert Row.__slots__ == ("id", "tags", "name")
+    assert not hasattr(row, "__dict__")
+    assert pickle.loads(pickle.dumps(row)) == row
+
+
+def test_models_are_slotted():
+    for cls in (RawIncidentData, AggregatedMetrics, Addon, ServiceReference):
+        assert "__slots__" in cls.__dict__
+
+
+def test_intern_strings():
+    a, b = {"k": "".join(["ab", "c"])}, {"k": "".join(["a", "bc"])}
+    utils.intern_strings(a, ["k", "missing"])
+    utils.intern_strings(b, ["k"])
+    assert a["k"] is b["k"]